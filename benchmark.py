@@ -0,0 +1,389 @@
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Headless benchmarks for every game loop. Kivy runs on SDL's offscreen video
+# driver with the mock GL backend, and a HeadlessWindow stands in for
+# kivy.core.window.Window, so the real widgets run with scripted input.
+#
+#   python benchmark.py                       run everything and print a table
+#   python benchmark.py --save baseline.json  store the results as a baseline
+#   python benchmark.py --compare baseline.json
+#                                             fail (exit 1) on regressions
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
+os.environ.setdefault('KCFG_GRAPHICS_MAXFPS', '0')  # Clock.tick() must never sleep
+
+# Allowed slowdown before --compare reports a regression (0.25 = 25 %)
+DEFAULT_THRESHOLD = 0.25
+
+
+class HeadlessWindow:
+    """Just enough of kivy's Window for the games to run without a display."""
+
+    def __init__(self, width=800, height=600):
+        self.size = (width, height)
+        self.clearcolor = (0, 0, 0, 1)
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def bind(self, **kwargs):
+        pass
+
+    def unbind(self, **kwargs):
+        pass
+
+    def add_widget(self, widget, *args, **kwargs):
+        pass
+
+    def remove_widget(self, widget, *args, **kwargs):
+        pass
+
+
+class ScriptedTouch:
+    """Just enough of a kivy touch for the card table."""
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+        self.pos = (x, y)
+
+
+def install_window(window):
+    """Point every game module at the headless window."""
+    import brick_game
+    import lifecycle
+    import pong_game
+    import Ptrial
+    import snake_game
+    import solitairetest
+    for module in (Ptrial, pong_game, brick_game, snake_game, lifecycle, solitairetest):
+        module.Window = window
+
+
+def drive(game, step):
+    """Take a game off the Kivy clock and return a tick() that runs step() then the clock.
+
+    The clock still has to tick so animations started by the game run and finish.
+    """
+    from kivy.clock import Clock
+    game.lifecycle.pause()
+
+    def tick():
+        step()
+        Clock.tick()
+    return tick
+
+
+SCENARIOS = {}
+
+
+def scenario(name, ticks):
+    """Register a benchmark. The function sets up a game and returns a tick() callable."""
+    def register(setup):
+        SCENARIOS[name] = (setup, ticks)
+        return setup
+    return register
+
+
+@scenario('pong_sim', ticks=20000)
+def pong_sim():
+    from pong_sim import PongSim
+    sim = PongSim(800, 600, rng=random.Random(1))
+    return lambda: sim.step(move_right=sim.ball_x > sim.player_x + 50)
+
+
+@scenario('pong_max_speed', ticks=5000)
+def pong_max_speed():
+    from pong_game import PongGame
+    game = PongGame()
+    sim = game.sim
+
+    def step():
+        # Keep the ball near its top speed and the paddle under it; never let the match end
+        if abs(sim.ball_dy) < 60:
+            sim.ball_dx *= 4
+            sim.ball_dy *= 4
+        sim.move_player_to(sim.ball_x)
+        sim.player_score = sim.ai_score = 0
+        game.update(1 / 30)
+    return drive(game, step)
+
+
+@scenario('brick_full_wall', ticks=3000)
+def brick_full_wall():
+    import brick_game
+    game = brick_game.BrickBreakGame()
+    game.brick_rows, game.brick_cols = 100, 200
+    game.brick_width = brick_game.Window.width / game.brick_cols
+    game.brick_height = 3
+    game.build_bricks()
+
+    def step():
+        game.paddle_x = game.balls.x[0] - game.paddle_width / 2
+        if game.brick_grid.remaining < 100:
+            game.build_bricks()
+        game.update(1 / 60)
+    return drive(game, step)
+
+
+@scenario('brick_multiball', ticks=1000)
+def brick_multiball():
+    from brick_game import BrickBreakGame
+    # 40 balls against a dense wall, with the paddle as wide as the window so none are lost
+    game = BrickBreakGame(seed=1)
+    game.lifecycle.pause()
+    game.brick_rows, game.brick_cols = 20, 40
+    game.brick_width = 800 / game.brick_cols
+    game.build_bricks()
+    game.paddle_width, game.paddle_x = 800, 0
+    rng = random.Random(1)
+
+    def step():
+        while len(game.balls) < 40:
+            game.balls.add(rng.uniform(0, 780), rng.uniform(100, 300), rng.uniform(-5, 5), rng.uniform(3, 6))
+        if game.brick_grid.remaining < 200:
+            game.build_bricks()
+        game.update(1 / 60)
+    return drive(game, step)
+
+
+@scenario('brick_level_load', ticks=2000)
+def brick_level_load():
+    import tempfile
+    import levelpack
+    from brick_game import BrickBreakGame
+    # A pack of 2000 random 20 x 40 levels; every tick loads a random one into the game
+    path = os.path.join(tempfile.mkdtemp(), 'levels.pplp')
+    rng = random.Random(1)
+    levelpack.write_pack(path, (levelpack.random_level(rng, 20, 40) for _ in range(2000)))
+    game = BrickBreakGame(seed=1, level_pack=path)
+    game.lifecycle.pause()
+
+    def tick():
+        game.level = rng.randrange(len(game.level_pack))
+        game.build_bricks()
+        game.brick_wall.flush()
+    return tick
+
+
+@scenario('snake_1000_segments', ticks=5000)
+def snake_long():
+    from snake_autopilot import hamiltonian_cycle
+    from snake_board import SnakeBoard
+    from snake_game import SnakeGame
+    game = SnakeGame()
+    cycle = [game.board.cell_xy(cell) for cell in hamiltonian_cycle(game.board.cols, game.board.rows)]
+    length = min(1000, len(cycle) - 50)
+    game.board = SnakeBoard(game.board.cols, game.board.rows, body=reversed(cycle[:length]), rng=random.Random(1))
+    game.build_snake()
+    direction_of = {(1, 0): 'RIGHT', (-1, 0): 'LEFT', (0, 1): 'UP', (0, -1): 'DOWN'}
+    position = [length - 1]
+
+    def step():
+        i = position[0]
+        here, there = cycle[i % len(cycle)], cycle[(i + 1) % len(cycle)]
+        game.snake_direction = direction_of[(there[0] - here[0], there[1] - here[1])]
+        game.update(1 / 11)
+        position[0] = i + 1
+        if game.game_over or len(game.board) > length + 40:
+            # Keep the snake at about the target length
+            game.game_over = False
+            game.board.grow_pending = 0
+    return drive(game, step)
+
+
+@scenario('snake_autopilot', ticks=20000)
+def snake_autopilot():
+    from snake_autopilot import Autopilot
+    from snake_board import SnakeBoard
+    # Planning cost alone, on a 120 x 120 board; the board starts over when it is full
+    rng = random.Random(1)
+    pilot = Autopilot(SnakeBoard(120, 120, body=[(4, 4), (3, 4), (2, 4)], rng=rng))
+
+    def tick():
+        board = pilot.board
+        if board.move(pilot.next_direction()) == 'dead' or board.food is None:
+            pilot.reset(SnakeBoard(120, 120, body=[(4, 4), (3, 4), (2, 4)], rng=rng))
+    return tick
+
+
+@scenario('solitaire_model', ticks=2000)
+def solitaire_model():
+    import solitairetest
+    random.seed(1)
+
+    def tick():
+        game = solitairetest.Solitaire()
+        game.state_key()
+        for pile in game.tableau:
+            for foundation in game.foundation:
+                game.can_move_to_foundation(pile[-1], foundation)
+    return tick
+
+
+@scenario('solitaire_drag', ticks=2000)
+def solitaire_drag():
+    import solitairetest
+    random.seed(1)
+    table = solitairetest.SolitaireWidget(size=(800, 600))
+    # Turn the last pile face up so the drag lifts a run of seven cards
+    pile = table.game.tableau[6]
+    for card in pile:
+        if not card.is_face_up:
+            table.game.flip_card(card, 6)
+    x, y = table.slot_pos(6, 0)
+    x, y = x + 10, y + table.card_size[1] - 5  # On the strip of the bottom card that shows
+
+    def tick():
+        # Touch dispatch, ten drag frames, then let go where the cards started
+        table.on_touch_down(ScriptedTouch(x, y))
+        for step in range(10):
+            table.on_touch_move(ScriptedTouch(x - 8 * step, y - 12 * step))
+        table.dragged.dragging = False
+        table.end_drag()
+        table.clear_targets()
+    return tick
+
+
+@scenario('solitaire_solver', ticks=2000)
+def solitaire_solver():
+    import solitaire_solver
+    state = solitaire_solver.deal_state(random.Random(3))
+    result = solitaire_solver.solve(state, max_nodes=2000, time_limit=60)
+    line = result.moves or []
+    position = [0, state]
+
+    def tick():
+        # Expand one node of a real search: generate moves and apply the first
+        current = position[1]
+        moves = solitaire_solver.legal_moves(current)
+        solitaire_solver.canonical_key(current)
+        if position[0] < len(line):
+            position[1] = solitaire_solver.apply_move(current, line[position[0]])
+            position[0] += 1
+        elif moves:
+            solitaire_solver.apply_move(current, moves[0])
+    return tick
+
+
+def run_scenario(name, ticks=None):
+    """Time one scenario: throughput, latency percentiles and memory per tick."""
+    setup, default_ticks = SCENARIOS[name]
+    ticks = ticks or default_ticks
+    tick = setup()
+    for _ in range(min(200, ticks // 10)):
+        tick()  # Warm up caches and lazily built state
+
+    timings = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for _ in range(ticks):
+        t0 = clock()
+        tick()
+        timings.append(clock() - t0)
+    elapsed = (clock() - start) / 1e9
+
+    # Blocks still alive after a long sample, counted without tracemalloc (its own
+    # bookkeeping would show up as leaks) and with garbage collected at both ends
+    sample = max(ticks // 2, 1000)
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(sample):
+        tick()
+    gc.collect()
+    blocks_after = sys.getallocatedblocks()
+
+    # Bytes retained and the transient peak under tracemalloc, after a warm-up
+    # so the first traces it takes are not counted
+    tracemalloc.start()
+    for _ in range(min(200, sample // 10)):
+        tick()
+    gc.collect()
+    tracemalloc.reset_peak()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    for _ in range(sample // 10):
+        tick()
+    memory_after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    pick = lambda q: timings[min(int(q * ticks), ticks - 1)] / 1000
+    return {
+        'ticks': ticks,
+        'ticks_per_sec': ticks / elapsed,
+        'p50_us': pick(0.50),
+        'p95_us': pick(0.95),
+        'p99_us': pick(0.99),
+        'max_us': timings[-1] / 1000,
+        'retained_blocks_per_tick': (blocks_after - blocks_before) / sample,
+        'retained_bytes_per_tick': (memory_after - memory_before) / (sample // 10),
+        'peak_kib': (peak - memory_before) / 1024,
+    }
+
+
+def compare(results, baseline):
+    """Return a list of regression messages against a saved baseline.
+
+    Only throughput and p95 latency are compared; the memory figures are for
+    reading, and too small and noisy to fail a run on.
+    """
+    problems = []
+    for name, result in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+        threshold = base.get('threshold', baseline.get('threshold', DEFAULT_THRESHOLD))
+        if result['ticks_per_sec'] < base['ticks_per_sec'] * (1 - threshold):
+            problems.append(f"{name}: {result['ticks_per_sec']:.0f} ticks/s, baseline {base['ticks_per_sec']:.0f}")
+        if result['p95_us'] > base['p95_us'] * (1 + threshold):
+            problems.append(f"{name}: p95 {result['p95_us']:.1f} us, baseline {base['p95_us']:.1f} us")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game loops without a display.")
+    parser.add_argument('scenarios', nargs='*', help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument('--ticks', type=int, help="override the tick count of every scenario")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown stored with --save (fraction)")
+    args = parser.parse_args()
+
+    install_window(HeadlessWindow())
+    results = {}
+    print(f"{'scenario':<22} {'ticks/s':>10} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'blocks/tick':>12}")
+    for name in args.scenarios or SCENARIOS:
+        result = results[name] = run_scenario(name, args.ticks)
+        print(f"{name:<22} {result['ticks_per_sec']:>10.0f} {result['p50_us']:>9.1f} {result['p95_us']:>9.1f} "
+              f"{result['p99_us']:>9.1f} {result['retained_blocks_per_tick']:>12.2f}")
+
+    if args.save:
+        for result in results.values():
+            result['threshold'] = args.threshold
+        with open(args.save, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'threshold': args.threshold, 'scenarios': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            problems = compare(results, json.load(f))
+        for problem in problems:
+            print("REGRESSION", problem)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
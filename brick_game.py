@@ -0,0 +1,529 @@
+import random
+
+from kivy.app import App
+from kivy.core.window import Window
+from kivy.graphics import Color, InstructionGroup, Mesh, Rectangle
+from kivy.graphics.texture import Texture
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.widget import Widget
+
+from brick_grid import BrickGrid
+from collision import move_ball, wall_boxes
+from frame_stats import FrameStats, FrameStatsOverlay
+from levelpack import LevelPack
+from lifecycle import Lifecycle
+from particles import QUAD_INDICES, Balls, Particles, quad_vertices
+from replay import InputRecorder, new_seed
+from timestep import FixedTimestep
+from tween import Tweens
+
+# Brick Break. Loaded on demand through games.py.
+
+# Colour of each brick type (0-15) a level pack can use; type 0 is the default wall
+BRICK_COLORS = [
+    (1, 0, 0), (1, 0.5, 0), (1, 1, 0), (0, 0.8, 0), (0, 0.8, 0.8), (0, 0.4, 1), (0.5, 0, 1), (1, 0, 1),
+    (1, 0.6, 0.6), (1, 0.8, 0.5), (1, 1, 0.6), (0.6, 1, 0.6), (0.6, 1, 1), (0.6, 0.8, 1), (0.8, 0.6, 1),
+    (0.7, 0.7, 0.7),
+]
+
+
+class BrickWallMesh:
+    """Draws every brick of a BrickGrid as quads in a handful of Meshes.
+
+    A destroyed brick has its quad collapsed in the vertex list; the change is
+    uploaded once per frame by flush() instead of removing canvas instructions.
+    Brick colours come from a 16x1 palette texture: every vertex of a quad
+    points at its brick type's texel, so one mesh draws all the types.
+    """
+
+    # Mesh indices are 16-bit, so each mesh holds at most 65536 / 4 quads
+    bricks_per_mesh = 16384
+
+    # Vertex and index lists of full walls by geometry, so starting or
+    # restarting a game with a wall that was laid out before is just a copy
+    full_walls = {}
+    max_full_walls = 4
+
+    # Palette textures by their colours, shared by every wall that uses them
+    palettes = {}
+
+    def __init__(self, grid, colors):
+        self.grid = grid
+        self.texture = self.palette(colors)
+        self.group = InstructionGroup()
+        self.group.add(Color(1, 1, 1))
+        self.meshes = []
+        self.vertices = []
+        self.dirty = set()
+
+        for vertices, indices in self.layout(grid):
+            mesh = Mesh(vertices=vertices, indices=indices, mode='triangles', texture=self.texture)
+            self.vertices.append(vertices)
+            self.meshes.append(mesh)
+            self.group.add(mesh)
+
+    @classmethod
+    def palette(cls, colors):
+        """Return a 16x1 texture with one texel per brick type."""
+        key = tuple(map(tuple, colors))
+        texture = cls.palettes.get(key)
+        if texture is None:
+            pixels = bytearray(16 * 3)
+            for i, color in enumerate(key[:16]):
+                pixels[i * 3:i * 3 + 3] = bytes(int(c * 255) for c in color[:3])
+            texture = Texture.create(size=(16, 1), colorfmt='rgb')
+            texture.mag_filter = texture.min_filter = 'nearest'
+            texture.blit_buffer(bytes(pixels), colorfmt='rgb', bufferfmt='ubyte')
+            cls.palettes[key] = texture
+        return texture
+
+    @classmethod
+    def layout(cls, grid):
+        """Return (vertices, indices) for each mesh needed to draw the live bricks of grid.
+
+        The vertex lists are always fresh copies because hide() edits them.
+        """
+        count = grid.rows * grid.cols
+        # Only plain walls (every brick standing, all type 0) are worth caching
+        full = grid.remaining == count and grid.types.count(0) == count
+        key = (grid.rows, grid.cols, grid.brick_width, grid.brick_height, grid.top)
+        chunks = cls.full_walls.get(key) if full else None
+        if chunks is None:
+            chunks = []
+            for first in range(0, count, cls.bricks_per_mesh):
+                last = min(first + cls.bricks_per_mesh, count)
+                vertices = []
+                indices = []
+                for i in range(first, last):
+                    row, col = divmod(i, grid.cols)
+                    if grid.alive[i]:
+                        x, y, w, h = grid.brick_rect(row, col)
+                    else:
+                        x, y, w, h = 0, 0, 0, 0
+                    u = (grid.types[i] + 0.5) / 16  # Centre of the type's palette texel
+                    vertices.extend((x, y, u, 0.5, x + w, y, u, 0.5, x + w, y + h, u, 0.5, x, y + h, u, 0.5))
+                    k = (i - first) * 4
+                    indices.extend((k, k + 1, k + 2, k + 2, k + 3, k))
+                chunks.append((vertices, indices))
+            if full:
+                if len(cls.full_walls) >= cls.max_full_walls:
+                    cls.full_walls.clear()
+                cls.full_walls[key] = chunks
+        return [(list(vertices), indices) for vertices, indices in chunks]
+
+    def hide(self, row, col):
+        """Collapse the brick's quad so it no longer draws."""
+        chunk, i = divmod(self.grid.index(row, col), self.bricks_per_mesh)
+        vertices = self.vertices[chunk]
+        start = i * 16
+        for j in range(start, start + 16, 4):
+            vertices[j] = vertices[j + 1] = 0
+        self.dirty.add(chunk)
+
+    def flush(self):
+        """Upload the vertex lists of any meshes changed since the last flush."""
+        for chunk in self.dirty:
+            self.meshes[chunk].vertices = self.vertices[chunk]
+        self.dirty.clear()
+
+
+class BrickBreakGame(Widget):
+    # Default wall layout; prewarm() builds it before the game starts
+    brick_rows = 5
+    brick_cols = 10
+    brick_height = 20
+
+    # Knocking out a brick of this type splits the ball that hit it into three
+    multi_ball_type = 1
+    # Debris particles thrown out by each brick that is knocked out
+    debris_per_brick = 24
+
+    # Round alpha texture the ball quads are drawn with, made on first use
+    ball_texture = None
+
+    @classmethod
+    def prewarm(cls):
+        """Idle-time setup run by games.Prewarmer, one step per yield."""
+        grid = BrickGrid(cls.brick_rows, cls.brick_cols, Window.width / cls.brick_cols, cls.brick_height,
+                         top=Window.height)
+        BrickWallMesh.layout(grid)
+        yield
+        cls.disc_texture()
+        yield
+
+    @classmethod
+    def disc_texture(cls, size=32):
+        """Return the white disc texture balls are drawn with."""
+        if cls.ball_texture is None:
+            pixels = bytearray(size * size * 4)
+            radius = size / 2
+            for row in range(size):
+                for col in range(size):
+                    if (col + 0.5 - radius) ** 2 + (row + 0.5 - radius) ** 2 <= radius ** 2:
+                        i = (row * size + col) * 4
+                        pixels[i:i + 4] = b'\xff\xff\xff\xff'
+            texture = Texture.create(size=(size, size), colorfmt='rgba')
+            texture.blit_buffer(bytes(pixels), colorfmt='rgba', bufferfmt='ubyte')
+            cls.ball_texture = texture
+        return cls.ball_texture
+
+    def __init__(self, seed=None, level_pack=None, level=0, scores=None, **kwargs):
+        super().__init__(**kwargs)
+        # Finished runs go to the score store (scores.ScoreStore); without one they aren't kept
+        self.scores = scores
+        # Levels come from a level pack file if one is given, otherwise every level is the default wall
+        self.level_pack = LevelPack(level_pack) if level_pack is not None else None
+        self.level = level
+        # Everything random comes from a seeded RNG, so a recorded session replays exactly
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.input_log = InputRecorder('brick_break', self.seed, Window.size)
+        # Clock events, window bindings and popups go through the lifecycle so they can't leak
+        self.lifecycle = Lifecycle(self)
+        self.ball_size = 20
+        # Every ball in play lives in one set of arrays; there is one until a multi-ball brick splits it
+        self.balls = Balls(self.ball_size)
+        self.balls.add(Window.width / 2, 100, self.rng.randint(-5, 5) or 1, 5)
+        self.contact_ball = 0  # Index of the ball move_ball is sweeping, for on_ball_contact
+        # Brick debris; purely visual, so it has its own RNG and never disturbs a replay
+        self.particles = Particles(seed=self.seed)
+        # Brick destruction effects: pooled tweens stepped by update(), drawn as one mesh
+        self.effects = Tweens(capacity=1024, fields=('x', 'y', 'width', 'height', 'u'))
+        self.paddle_width = 100
+        self.paddle_height = 20
+        self.paddle_x = Window.width / 2 - self.paddle_width / 2
+        self.paddle_y = 20
+        self.brick_width = Window.width / self.brick_cols
+        self.ball_speed_multiplier = 1.05
+        self.score = 0
+        self.game_over = False
+
+        # Ball velocities are in pixels per 1/144 s (the old tick rate). Physics
+        # runs at a fixed rate and swept collision lets that rate be low without
+        # missing hits; the canvas is redrawn at the display rate, interpolated.
+        self.physics_rate = 60.0
+        self.display_rate = 60.0
+        self.speed_scale = 144.0
+
+        # Lives
+        self.lives = 3
+        self.lives_label = Label(text=f"Lives: {self.lives}", font_size=24, size_hint=(0.2, 0.1), pos_hint={'x': 0, 'y': 0.95})
+        self.add_widget(self.lives_label)
+
+        with self.canvas:
+            # Create paddle
+            Color(1, 1, 1)
+            self.paddle = Rectangle(pos=(self.paddle_x, self.paddle_y), size=(self.paddle_width, self.paddle_height))
+
+        # Balls and debris are one mesh each, drawn over the wall (build_bricks replaces the wall's instructions)
+        with self.canvas.after:
+            Color(1, 1, 1)
+            self.effect_mesh = Mesh(mode='triangles', texture=BrickWallMesh.palette(BRICK_COLORS))
+            self.ball_mesh = Mesh(mode='triangles', texture=self.disc_texture())
+            self.particle_mesh = Mesh(mode='triangles', texture=BrickWallMesh.palette(BRICK_COLORS))
+
+        # Create bricks
+        self.brick_colors = BRICK_COLORS
+        self.brick_wall = None
+        self.build_bricks()
+
+        # Binds Keyboard inputs
+        self.lifecycle.bind_window(on_key_down=self.on_key_down, on_key_up=self.on_key_up)
+
+        # Arena walls for move_ball, rebuilt only when the window changes size
+        self.walls = wall_boxes(Window.width, Window.height, bottom=False)
+        self.lifecycle.bind_window(on_resize=self.on_window_resize)
+
+        # Frame timing, shown with F3
+        self.frame_stats = FrameStats('brick_break', self.display_rate, phases=('physics', 'game', 'render'))
+        self.stats_overlay = FrameStatsOverlay(self.frame_stats, size=(460, 140),
+                                               pos=(Window.width - 470, Window.height - 150))
+        self.add_widget(self.stats_overlay)
+        self.lifecycle.bind_window(on_key_down=self.stats_overlay.on_key_down)
+
+        # Schedule the update method
+        self.timestep = FixedTimestep(self.physics_step, self.physics_rate)
+        self.lifecycle.add_interval(self.update, 1.0 / self.display_rate)
+        self.lifecycle.start()
+
+    def update(self, dt):
+        self.input_log.tick(dt)
+        stats = self.frame_stats
+        stats.begin_frame(dt)
+        alpha = self.timestep.advance(dt)  # Runs physics_step, which marks 'physics' and 'game'
+
+        # Update effects, balls, debris, paddle and brick wall
+        self.draw_effects(dt)
+        self.draw_mesh(self.ball_mesh, self.balls.vertices(alpha, dt), len(self.balls))
+        self.particles.step(dt)
+        self.draw_mesh(self.particle_mesh, self.particles.vertices(), len(self.particles))
+        self.paddle.pos = (self.paddle_x, self.paddle_y)
+        self.brick_wall.flush()
+        stats.mark('render')
+        stats.end_frame()
+        self.stats_overlay.frame_done()
+
+    @staticmethod
+    def draw_mesh(mesh, vertices, quads):
+        # Float32 and uint16 buffers go to the mesh without a Python list in between (Kivy can't take empty ones)
+        if quads:
+            mesh.vertices = memoryview(vertices)
+            mesh.indices = memoryview(QUAD_INDICES[:quads * 6])
+        elif mesh.indices:
+            mesh.vertices = []
+            mesh.indices = []
+
+    def draw_effects(self, dt):
+        effects = self.effects
+        effects.step(dt)
+        slots = effects.running()
+        scale = effects.value[slots]
+        vertices = quad_vertices(effects.x[slots], effects.y[slots], effects.width[slots] * scale,
+                                 effects.height[slots] * scale, effects.u[slots])
+        self.draw_mesh(self.effect_mesh, vertices, len(slots))
+
+    def physics_step(self, interval):
+        """Advance the balls and the game rules by one fixed step."""
+        if self.game_over:
+            return
+        stats = self.frame_stats
+        balls = self.balls
+        balls.snapshot()
+        # Sweep each ball along this step's path; walls, paddle and bricks are handled in on_ball_contact.
+        # Balls go one at a time because the bricks one knocks out are gone for the next.
+        scale = interval * self.speed_scale
+        for i in range(len(balls)):
+            self.contact_ball = i
+            x, y, dx, dy, contacts = move_ball(
+                float(balls.x[i]), float(balls.y[i]), self.ball_size, float(balls.dx[i]) * scale,
+                float(balls.dy[i]) * scale, self.ball_obstacles, self.on_ball_contact)
+            balls.x[i] = x
+            balls.y[i] = y
+            if contacts:
+                balls.dx[i] = dx / scale
+                balls.dy[i] = dy / scale
+        stats.mark('physics')
+
+        # Check if all bricks are removed
+        if not self.brick_grid.remaining:
+            self.reset_game("You Win!")
+            self.next_level()
+
+        # Balls out of bounds are gone; losing the last one costs a life
+        out = balls.y <= 0
+        if out.all():
+            self.lives -= 1  # Decrease life
+            self.lives_label.text = f"Lives: {self.lives}"  # Update label
+
+            if self.lives <= 0:
+                self.reset_game("Game Over!")
+            else:
+                self.reset_ball()
+        elif out.any():
+            balls.keep(~out)
+        stats.mark('game')
+
+    def on_window_resize(self, window, width, height):
+        """Rebuild the arena walls for the new window size."""
+        self.walls = wall_boxes(width, height, bottom=False)
+
+    def ball_obstacles(self, x, y, dx, dy):
+        """Broad phase for move_ball: walls, the paddle and live bricks near the ball's path."""
+        obstacles = list(self.walls)
+        obstacles.append(((self.paddle_x, self.paddle_y, self.paddle_width, self.paddle_height), 'paddle'))
+        grid = self.brick_grid
+        for cell in grid.cells_in_box(min(x, x + dx), min(y, y + dy),
+                                      abs(dx) + self.ball_size, abs(dy) + self.ball_size):
+            obstacles.append((grid.brick_rect(*cell), cell))
+        return obstacles
+
+    def on_ball_contact(self, tag, nx, ny, dx, dy):
+        """React to the ball hitting something; move_ball has already reflected it."""
+        if tag == 'wall':
+            self.animate_ball_bounce(self.contact_ball)  # Animate the bounce on wall collision
+        elif tag == 'paddle':
+            self.animate_ball_bounce(self.contact_ball)  # Animate the bounce on paddle collision
+            return dx * self.ball_speed_multiplier, dy * self.ball_speed_multiplier
+        else:
+            self.hit_brick(*tag)
+            self.score += 1
+        return None
+
+    def build_bricks(self):
+        """Lay out the current level's wall, replacing any bricks that are left over."""
+        if self.brick_wall is not None:
+            self.canvas.remove(self.brick_wall.group)
+
+        if self.level_pack is not None:
+            # The level's cells go straight from the mapped file into the grid
+            self.brick_grid = self.level_pack.grid(self.level % len(self.level_pack),
+                                                   lambda cols: Window.width / cols, self.brick_height,
+                                                   top=Window.height)
+        else:
+            self.brick_grid = BrickGrid(self.brick_rows, self.brick_cols, self.brick_width, self.brick_height,
+                                        top=Window.height)
+        self.brick_wall = BrickWallMesh(self.brick_grid, self.brick_colors)
+        self.canvas.add(self.brick_wall.group)
+
+    def next_level(self):
+        """Move on to the next level of the pack (or a fresh default wall)."""
+        self.level += 1
+        self.build_bricks()
+        self.reset_ball()
+
+    def hit_brick(self, row, col):
+        """Take a hit point off a brick; once it is knocked out, collapse its quad in the wall mesh."""
+        grid = self.brick_grid
+        if grid.hit(row, col):
+            self.brick_wall.hide(row, col)
+            self.animate_brick_destruction(row, col)  # Animate brick destruction
+            brick_type = grid.types[grid.index(row, col)]
+            self.particles.spawn(*grid.brick_rect(row, col), self.debris_per_brick, (brick_type + 0.5) / 16)
+            if brick_type == self.multi_ball_type:
+                self.split_ball(self.contact_ball)
+
+    def split_ball(self, i):
+        """Add two balls leaving ball i's position at 30 degrees either side of its path."""
+        balls = self.balls
+        x, y, dx, dy = balls.x[i], balls.y[i], balls.dx[i], balls.dy[i]
+        for sin in (0.5, -0.5):
+            cos = 0.75 ** 0.5
+            balls.add(x, y, dx * cos - dy * sin, dx * sin + dy * cos)
+
+    def reset_ball(self):
+        """Reset to a single ball above the paddle and continue the game."""
+        self.balls.clear()
+        self.balls.add(Window.width / 2, self.paddle_y + self.paddle_height + 10, self.rng.randint(-5, 5) or 1, 5)
+
+    def reset_game(self, message):
+        """Reset the game or show a Game Over screen if lives are 0."""
+        if self.scores is not None:
+            self.scores.record('brick_break', self.score)
+        if message == "Game Over!":
+            self.show_game_over_popup()
+        else:
+            # Code to reset the game state if needed
+            self.lives = 3  # Reset lives
+            self.score = 0  # Reset score
+            self.lives_label.text = f"Lives: {self.lives}"
+
+    def on_touch_move(self, touch):
+        """Move the paddle based on player's touch."""
+        self.input_log.touch_move(touch)
+        if touch.y < Window.height / 3:
+            self.paddle_x = touch.x - self.paddle_width / 2
+            self.paddle_x = max(0, min(Window.width - self.paddle_width, self.paddle_x))
+            self.paddle.pos = (self.paddle_x, self.paddle_y)
+
+                # Clamp the paddle position to the window bounds
+        self.paddle_x = max(0, min(Window.width - self.paddle_width, self.paddle_x))
+        self.paddle.pos = (self.paddle_x, self.paddle_y)
+    
+    def on_key_down(self, instance, keyboard, keycode, text, modifiers):
+        
+    # Use the first item in the keycode tuple (or just keycode if it's an integer)
+        if isinstance(keycode, (list, tuple)):
+            keycode = keycode[0]  # Get the first item if it's a list/tuple
+        self.input_log.key_down(keyboard, keycode)
+
+        if keycode == 80:  # Left arrow key code (typically)
+            self.move_left = True
+        elif keycode == 79:  # Right arrow key code (typically)
+            self.move_right = True
+
+            
+
+    def on_key_up(self, instance, keyboard, keycode):
+       
+    # Use the first item in the keycode tuple (or just keycode if it's an integer)
+        if isinstance(keycode, (list, tuple)):
+            keycode = keycode[0]  # Get the first item if it's a list/tuple
+        self.input_log.key_up(keyboard, keycode)
+
+        if keycode == 80:  # Left arrow key code (typically)
+            self.move_left = False
+        elif keycode == 79:  # Right arrow key code (typically)
+            self.move_right = False
+
+    def animate_ball_bounce(self, i):
+        """Animate a brief bounce effect for ball i."""
+        self.balls.start_bounce(i)  # Balls.vertices() grows and shrinks it
+
+    def animate_brick_destruction(self, row, col):
+        """Animate a brief destruction effect for the brick."""
+        # The wall mesh has already dropped the brick, so a stand-in shrinks to nothing and back, then is gone
+        grid = self.brick_grid
+        x, y, w, h = grid.brick_rect(row, col)
+        u = (grid.types[grid.index(row, col)] + 0.5) / 16  # The brick type's palette texel
+        self.effects.start(1.0, 0.0, 0.2, yoyo=True, x=x, y=y, width=w, height=h, u=u)
+
+    def show_game_over_popup(self):
+        """Show the game-over popup when lives are 0."""
+        # Stops the game from running in the background
+        self.game_over = True
+        self.lifecycle.pause()
+        self.lifecycle.popup('game_over', self.build_game_over_popup).open()
+
+    def build_game_over_popup(self):
+        layout = BoxLayout(orientation='vertical', padding=10)
+        label = Label(text="Game Over", font_size=24)
+        restart_button = Button(text="Restart", size_hint=(1, 0.2))
+        close_button = Button(text="Close", size_hint=(1, 0.2))
+
+        layout.add_widget(label)
+        layout.add_widget(restart_button)
+        layout.add_widget(close_button)
+
+        popup = Popup(title="Game Over", content=layout, size_hint=(0.6, 0.4), auto_dismiss=False)
+
+        restart_button.bind(on_release=lambda *args: self.restart_game(popup))
+        close_button.bind(on_release=lambda *args: self.close_game(popup))
+        return popup
+
+    def restart_game(self, popup):
+        """Restart the Brick Break game."""
+        self.input_log.restart()
+        # Reset the game state (ball, paddle, bricks)
+        self.balls.clear()
+        self.balls.add(Window.width / 2, 100, self.rng.randint(-5, 5) or 1, 5)
+        self.particles.clear()
+        self.effects.clear()
+        self.timestep.reset()
+        self.game_over = False
+
+        self.paddle_x = Window.width / 2 - self.paddle_width / 2
+
+        # Rebuild the bricks
+        self.build_bricks()
+
+        # Reset the score and remove the popup (a replay restarts without one)
+        self.score = 0
+        if popup is not None:
+            popup.dismiss()
+
+        # Resume the game loop
+        self.lifecycle.resume()
+
+    def close_game(self, popup):
+        """Close the game and return to the main menu."""
+        # Stop the game loop and go back to the main menu
+        self.lifecycle.stop()
+        self.input_log.save()
+        self.close_level_pack()
+        popup.dismiss()
+        App.get_running_app().show_menu()
+
+    def return_to_menu(self, instance):
+        """Return to the main menu when the button is clicked."""
+        self.lifecycle.stop()  # Stop the game loop and release bindings and popups
+        self.input_log.save()
+        self.close_level_pack()
+        App.get_running_app().show_menu()
+
+    def close_level_pack(self):
+        if self.level_pack is not None:
+            self.level_pack.close()
+            self.level_pack = None
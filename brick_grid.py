@@ -0,0 +1,101 @@
+import math
+
+# Brick wall for Brick Break stored as a rows x cols grid of hit points.
+# Row 0 is the top row; bricks hang down from `top`. The ball's position maps
+# straight to a cell, so collision and removal never scan the whole wall.
+
+# Level-pack cells (see levelpack.py) are one byte: brick type in the high
+# nibble, hit points in the low nibble. These tables split them with
+# bytes.translate, so loading a level never touches bricks one by one.
+HIT_POINTS = bytes(i & 0x0F for i in range(256))
+TYPES = bytes((i >> 4) if i & 0x0F else 0 for i in range(256))
+
+
+class BrickGrid:
+    """Hit points and types plus geometry for a wall of equally sized bricks.
+
+    alive holds each brick's remaining hit points (0 = no brick) and types its
+    type (0-15). Without cells every brick is type 0 with one hit point.
+    """
+
+    def __init__(self, rows, cols, brick_width, brick_height, top, cells=None):
+        self.rows = rows
+        self.cols = cols
+        self.brick_width = brick_width
+        self.brick_height = brick_height
+        self.top = top
+        if cells is None:
+            self.alive = bytearray(b'\x01') * (rows * cols)
+            self.types = bytearray(rows * cols)
+        else:
+            if len(cells) != rows * cols:
+                raise ValueError(f"Expected {rows * cols} cells, got {len(cells)}")
+            self.alive = bytearray(cells.translate(HIT_POINTS))
+            self.types = bytearray(cells.translate(TYPES))
+        self.remaining = len(self.alive) - self.alive.count(0)
+
+    def __len__(self):
+        return self.remaining
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def is_alive(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.alive[row * self.cols + col] != 0
+
+    def brick_rect(self, row, col):
+        """Return (x, y, width, height) of the brick at row, col."""
+        return (col * self.brick_width, self.top - (row + 1) * self.brick_height,
+                self.brick_width, self.brick_height)
+
+    def cell_at(self, x, y):
+        """Return the (row, col) containing the point, or None if it is outside the wall."""
+        col = int(x // self.brick_width)
+        row = int((self.top - y) // self.brick_height)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def hit_test(self, x, y):
+        """Return the (row, col) of a live brick under the point, or None."""
+        cell = self.cell_at(x, y)
+        if cell is not None and self.alive[cell[0] * self.cols + cell[1]]:
+            return cell
+        return None
+
+    def cells_in_box(self, x, y, width, height):
+        """Yield the (row, col) of every live brick overlapping the box; touching an edge isn't overlapping."""
+        first_col = max(int(x // self.brick_width), 0)
+        last_col = min(math.ceil((x + width) / self.brick_width) - 1, self.cols - 1)
+        first_row = max(int((self.top - (y + height)) // self.brick_height), 0)
+        last_row = min(math.ceil((self.top - y) / self.brick_height) - 1, self.rows - 1)
+        for row in range(first_row, last_row + 1):
+            base = row * self.cols
+            for col in range(first_col, last_col + 1):
+                if self.alive[base + col]:
+                    yield row, col
+
+    def remove(self, row, col):
+        """Knock out a brick. Returns False if it was already gone."""
+        i = row * self.cols + col
+        if not self.alive[i]:
+            return False
+        self.alive[i] = 0
+        self.remaining -= 1
+        return True
+
+    def hit(self, row, col):
+        """Take a hit point off a brick. Returns True if that knocked it out."""
+        i = row * self.cols + col
+        hit_points = self.alive[i]
+        if hit_points > 1:
+            self.alive[i] = hit_points - 1
+            return False
+        return self.remove(row, col)
+
+    def live_cells(self):
+        """Yield the (row, col) of every brick still standing."""
+        cols = self.cols
+        for i, alive in enumerate(self.alive):
+            if alive:
+                yield divmod(i, cols)
@@ -0,0 +1,95 @@
+import random
+
+# Playing cards as small integers. A card's code is suit_index * 13 + rank_index
+# (0-51, suits and ranks in Deck order), and everything about a card is read
+# from the tables below instead of being worked out from strings.
+
+SUITS = ['H', 'D', 'C', 'S']
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+
+RANK_VALUE = bytes(r + 1 for s in range(4) for r in range(13))  # 1 (ace) .. 13 (king)
+SUIT_INDEX = bytes(s for s in range(4) for r in range(13))
+IS_RED = tuple(SUITS[s] in ('H', 'D') for s in range(4) for r in range(13))
+RANK_NAME = tuple(RANKS[r] for s in range(4) for r in range(13))
+SUIT_NAME = tuple(SUITS[s] for s in range(4) for r in range(13))
+
+# Flag set on a packed card code when the card is face down
+FACE_DOWN = 0x40
+# Byte that ends each pile in a packed state key
+PILE_END = 0xFF
+
+
+def card_code(rank, suit):
+    """Code of the card with the given rank and suit names."""
+    return SUITS.index(suit) * 13 + RANKS.index(rank)
+
+
+def can_stack(code, target):
+    """Whether a card may go on target in the tableau (alternate colour, one lower)."""
+    return IS_RED[code] != IS_RED[target] and RANK_VALUE[code] + 1 == RANK_VALUE[target]
+
+
+# The two cards that can go on each card in the tableau, and the cards that
+# start an empty tableau pile or foundation
+STACKS_ON = tuple(tuple(code for code in range(52) if can_stack(code, target)) for target in range(52))
+KINGS = tuple(code for code in range(52) if RANK_VALUE[code] == 13)
+ACES = tuple(code for code in range(52) if RANK_VALUE[code] == 1)
+
+
+class Card:
+    __slots__ = ('code', 'is_face_up')
+
+    def __init__(self, rank, suit):
+        self.code = card_code(rank, suit)
+        self.is_face_up = False
+
+    @classmethod
+    def from_code(cls, code):
+        card = cls.__new__(cls)
+        card.code = code
+        card.is_face_up = False
+        return card
+
+    @property
+    def rank(self):
+        return RANK_NAME[self.code]
+
+    @property
+    def suit(self):
+        return SUIT_NAME[self.code]
+
+    def flip(self):
+        self.is_face_up = not self.is_face_up
+
+    def is_red(self):
+        return IS_RED[self.code]
+
+    def is_black(self):
+        return not IS_RED[self.code]
+
+    def rank_value(self):
+        return RANK_VALUE[self.code]
+
+
+class Deck:
+    suits = SUITS
+    ranks = RANKS
+
+    def __init__(self):
+        self.cards = [Card.from_code(code) for code in range(52)]
+        self.shuffle()
+
+    def shuffle(self):
+        random.shuffle(self.cards)
+
+    def deal_card(self):
+        return self.cards.pop() if self.cards else None
+
+
+def pack_piles(piles):
+    """Pack piles of Cards into bytes: one byte per card, PILE_END after each pile."""
+    out = bytearray()
+    for pile in piles:
+        out.extend(card.code if card.is_face_up else card.code | FACE_DOWN for card in pile)
+        out.append(PILE_END)
+    return bytes(out)
@@ -0,0 +1,111 @@
+from collections import namedtuple
+
+# Swept (continuous) collision for the square balls in Pong and Brick Break.
+# Instead of moving a whole velocity step and testing for overlap, the ball is
+# swept along its path and stopped at the exact time of impact, so a fast ball
+# can no longer tunnel through a paddle or a brick.
+
+# Thickness used for walls expressed as boxes just outside the arena
+WALL_THICKNESS = 1e6
+
+Contact = namedtuple('Contact', 'tag time nx ny x y')
+
+
+def wall_boxes(width, height, left=True, right=True, top=True, bottom=True):
+    """Return (box, 'wall') obstacles hugging the edges of a width x height arena."""
+    t = WALL_THICKNESS
+    walls = []
+    if left:
+        walls.append(((-t, -t, t, height + 2 * t), 'wall'))
+    if right:
+        walls.append(((width, -t, t, height + 2 * t), 'wall'))
+    if top:
+        walls.append(((-t, height, width + 2 * t, t), 'wall'))
+    if bottom:
+        walls.append(((-t, -t, width + 2 * t, t), 'wall'))
+    return walls
+
+
+def sweep_box(x, y, w, h, dx, dy, box):
+    """Time of impact of a w x h box at (x, y) moving by (dx, dy) against a static box.
+
+    The static box is (bx, by, bw, bh). Returns (t, nx, ny) with 0 <= t <= 1 and
+    the contact normal of the face that was hit, or None if they do not meet
+    during this move. Boxes that already overlap are ignored so a ball can
+    always leave whatever it is stuck in.
+    """
+    bx, by, bw, bh = box
+    # Shrink the ball to a point by growing the box by the ball's size
+    left = bx - w
+    right = bx + bw
+    bottom = by - h
+    top = by + bh
+
+    if dx > 0:
+        tx_enter, tx_exit, nx = (left - x) / dx, (right - x) / dx, -1
+    elif dx < 0:
+        tx_enter, tx_exit, nx = (right - x) / dx, (left - x) / dx, 1
+    elif left < x < right:
+        tx_enter, tx_exit, nx = float('-inf'), float('inf'), 0
+    else:
+        return None
+
+    if dy > 0:
+        ty_enter, ty_exit, ny = (bottom - y) / dy, (top - y) / dy, -1
+    elif dy < 0:
+        ty_enter, ty_exit, ny = (top - y) / dy, (bottom - y) / dy, 1
+    elif bottom < y < top:
+        ty_enter, ty_exit, ny = float('-inf'), float('inf'), 0
+    else:
+        return None
+
+    enter = max(tx_enter, ty_enter)
+    leave = min(tx_exit, ty_exit)
+    if enter >= leave or enter < 0 or enter > 1:
+        return None
+    if tx_enter > ty_enter:
+        return enter, nx, 0
+    return enter, 0, ny
+
+
+def move_ball(x, y, size, dx, dy, obstacles, on_contact=None, max_bounces=4):
+    """Move a size x size ball by (dx, dy), bouncing off the first thing it hits.
+
+    `obstacles(x, y, dx, dy)` returns the (box, tag) pairs the ball could hit
+    while moving by (dx, dy) from (x, y); callers use it as a broad phase.
+    On each contact the velocity is reflected about the contact normal, then
+    `on_contact(tag, nx, ny, dx, dy)` may return a replacement (dx, dy) (for
+    speed-ups) or None. The rest of the step continues with the new velocity.
+
+    Returns (x, y, dx, dy, contacts) where contacts is a list of Contact tuples
+    whose time is the fraction of the step at which each impact happened.
+    """
+    contacts = []
+    elapsed = 0.0
+    for _ in range(max_bounces + 1):
+        remaining = 1.0 - elapsed
+        sx = dx * remaining
+        sy = dy * remaining
+        best = None
+        for box, tag in obstacles(x, y, sx, sy):
+            hit = sweep_box(x, y, size, size, sx, sy, box)
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit + (tag,)
+        if best is None:
+            return x + sx, y + sy, dx, dy, contacts
+
+        t, nx, ny, tag = best
+        x += sx * t
+        y += sy * t
+        elapsed += remaining * t
+        if nx:
+            dx = -dx
+        if ny:
+            dy = -dy
+        if on_contact is not None:
+            velocity = on_contact(tag, nx, ny, dx, dy)
+            if velocity is not None:
+                dx, dy = velocity
+        contacts.append(Contact(tag, elapsed, nx, ny, x, y))
+    # Out of bounces: the ball rests at its last contact for the rest of the step
+    return x, y, dx, dy, contacts
@@ -0,0 +1,142 @@
+import csv
+import json
+import time
+from array import array
+
+from kivy.uix.label import Label
+
+# Per-game frame instrumentation. Each game owns a FrameStats and brackets its
+# update with begin_frame()/end_frame(), calling mark() after each phase.
+# Samples go into fixed-size ring buffers, so recording never allocates.
+
+KEY_F3 = 284  # Toggle the overlay
+KEY_F4 = 285  # Export the recorded frames, as JSON and as CSV
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class FrameStats:
+    """Ring buffer of frame timings for one game loop."""
+
+    def __init__(self, name, target_hz, phases=('physics', 'render'), capacity=600):
+        self.name = name
+        self.target_interval = 1.0 / target_hz
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self.count = 0  # Total frames recorded; the buffer holds the last `capacity`
+        self.late_frames = 0
+        self.dropped_frames = 0
+
+        # Milliseconds per frame: real tick interval, dt reported by Kivy, total update, then each phase
+        self.columns = ('interval', 'dt', 'update') + self.phases
+        self.samples = {column: array('d', bytes(8 * capacity)) for column in self.columns}
+        self.last_tick = None
+        self.frame_start = 0.0
+        self.phase_start = 0.0
+        self.slot = 0
+
+    def begin_frame(self, dt):
+        now = time.perf_counter()
+        self.slot = self.count % self.capacity
+        interval = (now - self.last_tick) if self.last_tick is not None else self.target_interval
+        self.last_tick = now
+        self.samples['interval'][self.slot] = interval * 1000
+        self.samples['dt'][self.slot] = dt * 1000
+        for phase in self.phases:
+            self.samples[phase][self.slot] = 0.0
+
+        # A frame is late when it arrives half an interval after it was due, and
+        # every whole interval it overshoots is a frame that was never drawn
+        if interval > 1.5 * self.target_interval:
+            self.late_frames += 1
+            self.dropped_frames += int(interval / self.target_interval + 0.5) - 1
+        self.frame_start = self.phase_start = now
+
+    def mark(self, phase):
+        """Charge the time since the previous mark (or begin_frame) to phase."""
+        now = time.perf_counter()
+        self.samples[phase][self.slot] += (now - self.phase_start) * 1000
+        self.phase_start = now
+
+    def end_frame(self):
+        self.samples['update'][self.slot] = (time.perf_counter() - self.frame_start) * 1000
+        self.count += 1
+
+    def column(self, name):
+        """Recorded values of one column, oldest first."""
+        samples = self.samples[name]
+        if self.count <= self.capacity:
+            return list(samples[:self.count])
+        start = self.count % self.capacity
+        return list(samples[start:]) + list(samples[:start])
+
+    def summary(self):
+        """Mean, 95th percentile and max of every column, plus late/dropped frame counts."""
+        result = {'name': self.name, 'frames': self.count, 'late_frames': self.late_frames,
+                  'dropped_frames': self.dropped_frames, 'target_ms': self.target_interval * 1000}
+        for name in self.columns:
+            values = self.column(name)
+            result[name] = {
+                'mean': sum(values) / len(values) if values else 0.0,
+                'p95': percentile(values, 0.95),
+                'max': max(values) if values else 0.0,
+            }
+        return result
+
+    def export_csv(self, path):
+        """One row per recorded frame, oldest first, for a spreadsheet or plotting tool."""
+        rows = zip(*(self.column(name) for name in self.columns))
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.columns)
+            writer.writerows(rows)
+
+    def export_json(self, path):
+        data = {'summary': self.summary(), 'frames': {name: self.column(name) for name in self.columns}}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+class FrameStatsOverlay(Label):
+    """On-screen readout of a FrameStats. F3 toggles it, F4 exports to JSON and CSV.
+
+    The game binds on_key_down to the window (through its Lifecycle).
+    """
+
+    def __init__(self, stats, refresh_every=15, **kwargs):
+        kwargs.setdefault('font_size', 14)
+        kwargs.setdefault('halign', 'left')
+        kwargs.setdefault('valign', 'top')
+        super().__init__(**kwargs)
+        self.stats = stats
+        self.refresh_every = refresh_every
+        self.visible = False
+        self.opacity = 0
+        self.bind(size=lambda *args: setattr(self, 'text_size', self.size))
+
+    def on_key_down(self, window, keycode, scancode, text, modifiers):
+        if keycode == KEY_F3:
+            self.visible = not self.visible
+            self.opacity = 1 if self.visible else 0
+            self.refresh()
+        elif keycode == KEY_F4:
+            self.stats.export_json(f"frame_stats_{self.stats.name}.json")
+            self.stats.export_csv(f"frame_stats_{self.stats.name}.csv")
+
+    def frame_done(self):
+        """Called by the game after end_frame(); redraws the text every few frames."""
+        if self.visible and self.stats.count % self.refresh_every == 0:
+            self.refresh()
+
+    def refresh(self):
+        s = self.stats.summary()
+        lines = [f"{s['name']}  target {s['target_ms']:.1f} ms  late {s['late_frames']}  dropped {s['dropped_frames']}"]
+        for name in self.stats.columns:
+            c = s[name]
+            lines.append(f"{name:>9}: {c['mean']:6.2f} avg {c['p95']:6.2f} p95 {c['max']:6.2f} max ms")
+        self.text = "\n".join(lines)
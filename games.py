@@ -0,0 +1,128 @@
+import importlib
+import os
+import time
+from collections import namedtuple
+from itertools import chain
+
+from kivy.clock import Clock
+
+# Registry of the games on the launch menu. Each game lives in its own module,
+# which is only imported when the game starts or is prewarmed, so the menu
+# comes up without loading any game code.
+#
+# A game class may define a prewarm() classmethod: a generator doing the
+# expensive setup it can do ahead of time, with a yield between steps.
+#
+# A game's options function, if it has one, turns the menu's settings into the
+# keyword arguments its class takes. The settings are a dict:
+#
+#   difficulty -- the AI difficulty slider, 1 to 10
+#   peer       -- the netplay address typed in, or None to host
+
+# Brick Break plays the levels in this pack when it exists (see levelpack.py)
+BRICK_LEVEL_PACK = 'levels.pplp'
+
+
+def pong_options(settings):
+    return {'ai_difficulty': settings['difficulty']}
+
+
+def pong_net_options(settings):
+    return {'peer': settings['peer']}
+
+
+def brick_options(settings):
+    return {'level_pack': BRICK_LEVEL_PACK} if os.path.exists(BRICK_LEVEL_PACK) else {}
+
+
+Game = namedtuple('Game', 'title module cls options', defaults=(None,))
+
+GAMES = {
+    'pong': Game('Pong', 'pong_game', 'PongGame', pong_options),
+    'pong_net': Game('Netplay Pong', 'pong_net_game', 'NetPongGame', pong_net_options),
+    'brick_break': Game('Brick Break', 'brick_game', 'BrickBreakGame', brick_options),
+    'snake': Game('Snake', 'snake_game', 'SnakeGame'),
+}
+
+# Most recently started first; the menu prewarms in this order
+recent = []
+_popup_warm = False
+
+
+def load(name):
+    """Import a game's module if needed and return its widget class."""
+    game = GAMES[name]
+    return getattr(importlib.import_module(game.module), game.cls)
+
+
+def options(name, settings):
+    """Keyword arguments for starting a game with the menu's settings."""
+    game = GAMES[name]
+    return game.options(settings) if game.options is not None else {}
+
+
+def create(name, **kwargs):
+    """Start a game: build its widget and remember it as the most recent."""
+    cls = load(name)
+    if name in recent:
+        recent.remove(name)
+    recent.insert(0, name)
+    return cls(**kwargs)
+
+
+def prewarm_order():
+    """Games in the order they are likely to be picked: recent ones, then the rest."""
+    return recent + [name for name in GAMES if name not in recent]
+
+
+def warm_popup():
+    """Build and drop a game-over popup once, so the first real one doesn't load styles and fonts."""
+    global _popup_warm
+    if _popup_warm:
+        return
+    from kivy.uix.boxlayout import BoxLayout
+    from kivy.uix.button import Button
+    from kivy.uix.label import Label
+    from kivy.uix.popup import Popup
+    layout = BoxLayout(orientation='vertical', padding=10)
+    layout.add_widget(Label(text="Game Over", font_size=24))
+    layout.add_widget(Button(text="Restart", size_hint=(1, 0.2)))
+    Popup(title="Game Over", content=layout, size_hint=(0.6, 0.4))
+    _popup_warm = True
+
+
+def prewarm_steps(name):
+    """Generator that gets a game ready to start, one short step per yield."""
+    cls = load(name)
+    yield
+    warm_popup()
+    yield
+    prewarm = getattr(cls, 'prewarm', None)
+    if prewarm is not None:
+        yield from prewarm()
+
+
+class Prewarmer:
+    """Runs prewarm steps for several games in idle frames.
+
+    Each frame gets at most `budget` seconds of steps, so the menu keeps
+    drawing at full rate. A step that is already running always finishes.
+    """
+
+    def __init__(self, names, budget=0.004):
+        self.steps = chain.from_iterable(prewarm_steps(name) for name in names)
+        self.budget = budget
+        self.event = Clock.schedule_interval(self.run, 0)
+
+    def run(self, dt):
+        deadline = time.perf_counter() + self.budget
+        for _ in self.steps:
+            if time.perf_counter() >= deadline:
+                return True
+        self.event = None
+        return False  # Everything is warm; stop the interval
+
+    def cancel(self):
+        if self.event is not None:
+            self.event.cancel()
+            self.event = None
@@ -0,0 +1,165 @@
+import argparse
+import mmap
+import random
+import struct
+from collections import namedtuple
+
+from brick_grid import BrickGrid
+
+# Brick Break level packs. A pack is opened with mmap and only the header,
+# one index entry and the level's own cells are read, so loading one level
+# out of thousands costs the size of that level.
+#
+# File layout (little endian):
+#   header  b'PPLP', version u8, 3 pad bytes, level count u32
+#   index   one entry per level: data offset u64, rows u16, cols u16,
+#           encoding u8, 3 pad bytes
+#   data    each level's cells, row 0 (the top row) first:
+#             BYTES -- one byte per cell: 0 = no brick, otherwise brick type
+#                      (0-15) in the high nibble and hit points (1-15) in the low
+#             BITS  -- one bit per cell, least significant bit first: a set
+#                      bit is a type 0 brick with one hit point
+
+MAGIC = b'PPLP'
+VERSION = 1
+HEADER = struct.Struct('<4sB3xI')
+INDEX = struct.Struct('<QHHB3x')
+
+BYTES = 0
+BITS = 1
+
+# Byte -> the 8 cells its bits stand for, so unpacking works a byte at a time
+_BIT_CELLS = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+Level = namedtuple('Level', 'rows cols cells')
+
+
+def cell(brick_type, hit_points):
+    """Encode one brick as a cell byte."""
+    return (brick_type << 4) | hit_points
+
+
+def pack_bits(cells):
+    """Pack cells that are all 0 or 1 into bytes, 8 cells per byte."""
+    out = bytearray((len(cells) + 7) // 8)
+    for i in range(0, len(cells), 8):
+        byte = 0
+        for bit, value in enumerate(cells[i:i + 8]):
+            byte |= value << bit
+        out[i // 8] = byte
+    return bytes(out)
+
+
+def unpack_bits(data, count):
+    """Cells (0 or 1 each) for the first count bits of data."""
+    return b''.join([_BIT_CELLS[byte] for byte in data])[:count]
+
+
+def write_pack(path, levels):
+    """Write levels (Level tuples or (rows, cols, cells)) to a pack file.
+
+    Levels made only of plain one-hit bricks are stored one bit per cell.
+    """
+    levels = [Level(*level) for level in levels]
+    offset = HEADER.size + INDEX.size * len(levels)
+    index = bytearray()
+    blobs = []
+    for level in levels:
+        cells = bytes(level.cells)
+        if len(cells) != level.rows * level.cols:
+            raise ValueError(f"Level is {level.rows}x{level.cols} but has {len(cells)} cells")
+        if cells.count(0) + cells.count(1) == len(cells):
+            encoding, blob = BITS, pack_bits(cells)
+        else:
+            encoding, blob = BYTES, cells
+        index += INDEX.pack(offset, level.rows, level.cols, encoding)
+        blobs.append(blob)
+        offset += len(blob)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(levels)))
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+
+
+class LevelPack:
+    """A level pack opened read-only through mmap."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def level(self, number):
+        """Read one level; the cells are bytes in the BYTES encoding."""
+        if not 0 <= number < self.count:
+            raise IndexError(f"Level {number} is not in {self.path} ({self.count} levels)")
+        offset, rows, cols, encoding = INDEX.unpack_from(self.map, HEADER.size + INDEX.size * number)
+        count = rows * cols
+        if encoding == BITS:
+            cells = unpack_bits(self.map[offset:offset + (count + 7) // 8], count)
+        else:
+            cells = self.map[offset:offset + count]
+        return Level(rows, cols, cells)
+
+    def grid(self, number, brick_width, brick_height, top):
+        """Build a BrickGrid for a level; brick_width may be a callable of the level's column count."""
+        rows, cols, cells = self.level(number)
+        if callable(brick_width):
+            brick_width = brick_width(cols)
+        return BrickGrid(rows, cols, brick_width, brick_height, top, cells=cells)
+
+
+def random_level(rng, rows, cols, types=4, max_hit_points=3, density=0.8):
+    """A random level for testing and benchmarks."""
+    cells = bytearray(rows * cols)
+    for i in range(len(cells)):
+        if rng.random() < density:
+            cells[i] = cell(rng.randrange(types), rng.randint(1, max_hit_points))
+    return Level(rows, cols, bytes(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or inspect Brick Break level packs.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    generate = commands.add_parser('generate', help="write a pack of random levels")
+    generate.add_argument('path')
+    generate.add_argument('--levels', type=int, default=100)
+    generate.add_argument('--rows', type=int, default=8)
+    generate.add_argument('--cols', type=int, default=12)
+    generate.add_argument('--seed', type=int, default=0)
+    info = commands.add_parser('info', help="list the levels in a pack")
+    info.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        rng = random.Random(args.seed)
+        write_pack(args.path, (random_level(rng, args.rows, args.cols) for _ in range(args.levels)))
+        print(f"Wrote {args.levels} levels to {args.path}")
+    else:
+        with LevelPack(args.path) as pack:
+            print(f"{args.path}: {len(pack)} levels")
+            for number in range(len(pack)):
+                level = pack.level(number)
+                bricks = len(level.cells) - level.cells.count(0)
+                print(f"{number:>5} {level.rows:>4} x {level.cols:<4} {bricks} bricks")
+
+
+if __name__ == '__main__':
+    main()
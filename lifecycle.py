@@ -0,0 +1,81 @@
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+# Start/pause/stop lifecycle for a game widget. Everything the game hooks into
+# Kivy -- clock events, Window bindings and popups -- is registered
+# here instead of with Kivy directly, so stopping the game releases all of it
+# and nothing from an old game keeps running or receiving events. Animations
+# are tweens stepped from the game's own tick (see tween.py), so they stop
+# with it and need no entry here.
+
+NEW = 'new'
+RUNNING = 'running'
+PAUSED = 'paused'
+STOPPED = 'stopped'
+
+
+class Lifecycle:
+    """Owns a game's clock events, window bindings and popups."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.state = NEW
+        self.clock_events = []
+        self.window_bindings = []  # (event name, callback) pairs; an event can have several
+        self.popups = {}  # name -> popup, built once and reopened
+
+    def add_interval(self, callback, interval):
+        """Run callback every interval seconds while the game is running."""
+        event = Clock.create_trigger(callback, interval, interval=True)
+        self.clock_events.append(event)
+        if self.state == RUNNING:
+            event()
+        return event
+
+    def bind_window(self, **bindings):
+        """Window bindings that are active only while the game is running."""
+        pairs = list(bindings.items())
+        self.window_bindings.extend(pairs)
+        if self.state == RUNNING:
+            for event, callback in pairs:
+                Window.bind(**{event: callback})
+
+    def popup(self, name, build):
+        """Return the popup called name, calling build() to create it the first time."""
+        popup = self.popups.get(name)
+        if popup is None:
+            popup = self.popups[name] = build()
+        return popup
+
+    def start(self):
+        """Schedule the clock events and bind the window; also resumes a paused game."""
+        if self.state in (NEW, PAUSED):
+            for event in self.clock_events:
+                event()  # A trigger that is already scheduled is not scheduled twice
+            for event, callback in self.window_bindings:
+                Window.bind(**{event: callback})
+            self.state = RUNNING
+
+    resume = start
+
+    def pause(self):
+        """Stop the clock events and window bindings until start() is called."""
+        if self.state == RUNNING:
+            for event in self.clock_events:
+                event.cancel()
+            for event, callback in self.window_bindings:
+                Window.unbind(**{event: callback})
+            self.state = PAUSED
+
+    def stop(self):
+        """Release everything for good: clock, bindings, popups and child widgets."""
+        if self.state == STOPPED:
+            return
+        self.pause()
+        self.state = STOPPED  # Set first: dismissing a popup can call back into stop()
+        self.clock_events.clear()
+        self.window_bindings.clear()
+        for popup in list(self.popups.values()):
+            popup.dismiss()
+        self.popups.clear()
+        self.owner.clear_widgets()
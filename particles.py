@@ -0,0 +1,175 @@
+import numpy as np
+
+# Struct-of-arrays balls and debris particles for Brick Break. Every ball and
+# every particle is a slot in a few NumPy arrays instead of an object with
+# its own widget or Animation: a whole set is stepped in one vectorised pass
+# and drawn as one Mesh of quads, whose vertex data quad_vertices() builds.
+
+# Mesh indices are 16-bit, so one mesh holds at most 65536 / 4 quads
+MAX_QUADS = 16384
+
+_CORNER_X = np.array([0, 1, 1, 0], dtype=np.float32)
+_CORNER_Y = np.array([0, 0, 1, 1], dtype=np.float32)
+# Two triangles per quad, for every quad a mesh can hold
+QUAD_INDICES = (np.arange(MAX_QUADS, dtype=np.uint16)[:, None] * 4
+                + np.array([0, 1, 2, 2, 3, 0], dtype=np.uint16)).ravel()
+
+
+def quad_vertices(x, y, width, height, u=None, v=0.5):
+    """Flat float32 (x, y, u, v) vertices for quads with bottom-left corners at x, y.
+
+    Without u every quad maps the whole texture; otherwise all four corners
+    of quad i sample texel (u[i], v), which is how palette colours are picked.
+    """
+    # One row per quad: corners (x0, y0), (x1, y0), (x1, y1), (x0, y1), each followed by u, v.
+    # Filling whole float32 columns is several times faster than broadcasting into a (n, 4, 4) view.
+    x0 = x.astype(np.float32)
+    y0 = y.astype(np.float32)
+    x1 = x0 + width
+    y1 = y0 + height
+    vertices = np.empty((len(x), 16), dtype=np.float32)
+    vertices[:, 0] = vertices[:, 12] = x0
+    vertices[:, 4] = vertices[:, 8] = x1
+    vertices[:, 1] = vertices[:, 5] = y0
+    vertices[:, 9] = vertices[:, 13] = y1
+    if u is None:
+        vertices[:, 2::4] = _CORNER_X
+        vertices[:, 3::4] = _CORNER_Y
+    else:
+        vertices[:, 2::4] = u[:, None]
+        vertices[:, 3::4] = v
+    return vertices.ravel()
+
+
+class Balls:
+    """Every ball in play: bottom-left corner, velocity and bounce effect time.
+
+    prev_x and prev_y are the positions at the last physics step, for drawing
+    between steps.
+    """
+
+    # A bounce grows the ball by half its size and back over this many seconds
+    bounce_time = 0.2
+
+    def __init__(self, size):
+        self.size = size
+        self.clear()
+
+    def __len__(self):
+        return len(self.x)
+
+    def clear(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.dx = np.empty(0)
+        self.dy = np.empty(0)
+        self.bounce = np.empty(0)
+        self.prev_x = np.empty(0)
+        self.prev_y = np.empty(0)
+
+    def add(self, x, y, dx, dy):
+        """Put a ball in play; it is drawn at x, y until the next step."""
+        self.x = np.append(self.x, x)
+        self.y = np.append(self.y, y)
+        self.dx = np.append(self.dx, dx)
+        self.dy = np.append(self.dy, dy)
+        self.bounce = np.append(self.bounce, 0.0)
+        self.prev_x = np.append(self.prev_x, x)
+        self.prev_y = np.append(self.prev_y, y)
+
+    def keep(self, mask):
+        """Drop every ball where mask is False."""
+        self.x = self.x[mask]
+        self.y = self.y[mask]
+        self.dx = self.dx[mask]
+        self.dy = self.dy[mask]
+        self.bounce = self.bounce[mask]
+        self.prev_x = self.prev_x[mask]
+        self.prev_y = self.prev_y[mask]
+
+    def snapshot(self):
+        """Remember the current positions as the previous step's."""
+        self.prev_x = self.x.copy()
+        self.prev_y = self.y.copy()
+
+    def start_bounce(self, i):
+        self.bounce[i] = self.bounce_time
+
+    def vertices(self, alpha, dt):
+        """Mesh vertices for every ball interpolated alpha of the way to this step; runs the bounce effect by dt."""
+        np.maximum(self.bounce - dt, 0, out=self.bounce)
+        # 0 -> 1 -> 0 over bounce_time, anchored at the bottom-left like the old Ellipse animation
+        half = self.bounce_time / 2
+        grow = np.where(self.bounce > 0, 1 - np.abs(self.bounce - half) / half, 0)
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        size = self.size * (1 + 0.5 * grow)
+        return quad_vertices(x, y, size, size)
+
+
+class Particles:
+    """A fixed pool of debris particles: position, velocity, life and colour.
+
+    Live particles are packed into the first `count` slots. Spawning writes
+    into free slots and dead particles are compacted away, so the arrays are
+    allocated once.
+    """
+
+    def __init__(self, capacity=MAX_QUADS, gravity=-900.0, seed=None):
+        self.capacity = min(capacity, MAX_QUADS)
+        self.gravity = gravity
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self.x = np.zeros(self.capacity)
+        self.y = np.zeros(self.capacity)
+        self.dx = np.zeros(self.capacity)
+        self.dy = np.zeros(self.capacity)
+        self.life = np.zeros(self.capacity)  # Seconds left
+        self.lifetime = np.ones(self.capacity)  # Seconds it started with
+        self.u = np.zeros(self.capacity, dtype=np.float32)  # Palette texel
+        self.arrays = (self.x, self.y, self.dx, self.dy, self.life, self.lifetime, self.u)
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, width, height, n, u, speed=(60.0, 260.0), lifetime=(0.5, 1.0)):
+        """Burst up to n particles of palette texel u out of the box; the rest are dropped when the pool is full."""
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        rng = self.rng
+        angle = rng.uniform(0, 2 * np.pi, n)
+        velocity = rng.uniform(*speed, n)
+        self.x[s] = x + rng.uniform(0, width, n)
+        self.y[s] = y + rng.uniform(0, height, n)
+        self.dx[s] = np.cos(angle) * velocity
+        self.dy[s] = np.sin(angle) * velocity
+        self.lifetime[s] = self.life[s] = rng.uniform(*lifetime, n)
+        self.u[s] = u
+        self.count += n
+
+    def step(self, dt):
+        """Move, age and cull every live particle."""
+        n = self.count
+        if not n:
+            return
+        self.dy[:n] += self.gravity * dt
+        self.x[:n] += self.dx[:n] * dt
+        self.y[:n] += self.dy[:n] * dt
+        self.life[:n] -= dt
+        alive = self.life[:n] > 0
+        live = int(alive.sum())
+        if live < n:
+            for array in self.arrays:
+                array[:live] = array[:n][alive]
+            self.count = live
+
+    def clear(self):
+        self.count = 0
+
+    def vertices(self, size=6.0):
+        """Mesh vertices for every live particle, shrinking as it ages."""
+        n = self.count
+        size = size * self.life[:n] / self.lifetime[:n]
+        return quad_vertices(self.x[:n], self.y[:n], size, size, self.u[:n])
@@ -0,0 +1,73 @@
+from collections import namedtuple
+
+# Predictive Pong AI. Rather than chasing the ball every frame, the AI works
+# out where the ball will cross its paddle line -- folding the straight path
+# back into the arena for every side-wall bounce -- once per trajectory, and
+# keeps that target until the path changes (a paddle hit or a serve). Each
+# step is then just a move toward the cached target.
+#
+# Difficulty is how long the AI takes to react to a new trajectory, how far
+# off its aim is and how fast its paddle can move. intercept_x() is plain
+# arithmetic, so pong_batch.PongBatch uses it on whole arrays of matches.
+
+Difficulty = namedtuple('Difficulty', 'reaction_steps aim_error max_speed')
+
+
+def difficulty_for(level):
+    """AI settings for the menu's difficulty slider (1 = easiest, 10 = hardest).
+
+    From level 1 to 10 the reaction delay falls from 12 steps to 0 and the aim
+    error from 60 pixels to 0, while the paddle speed is the level in pixels
+    per step.
+    """
+    skill = (min(max(level, 1), 10) - 1) / 9
+    return Difficulty(reaction_steps=int(12 * (1 - skill) + 0.5), aim_error=60 * (1 - skill), max_speed=level)
+
+
+def intercept_x(ball_x, ball_y, dx, dy, target_y, span):
+    """The ball's x when its y reaches target_y, with side-wall bounces folded in.
+
+    span is the range ball_x can take (arena width minus ball size) and the
+    ball must be moving toward target_y. Works on floats or numpy arrays.
+    """
+    x = (ball_x + dx * (target_y - ball_y) / dy) % (2 * span)
+    return span - abs(span - x)
+
+
+class PongAI:
+    """Drives the top paddle of a PongSim from a cached intercept prediction."""
+
+    def __init__(self, sim, level=5, rng=None):
+        self.sim = sim
+        self.rng = rng or sim.rng
+        self.difficulty = difficulty_for(level)
+        self.trajectory = None  # sim.trajectory the cached target was planned for
+        self.target = sim.ai_x
+        self.wait = 0  # Steps left before reacting to the current trajectory
+        self.plans = 0
+
+    def plan(self):
+        """Pick where the paddle should be for the ball's current path."""
+        sim = self.sim
+        max_x = sim.width - sim.paddle_width
+        if sim.ball_dy > 0:
+            x = intercept_x(sim.ball_x, sim.ball_y, sim.ball_dx, sim.ball_dy,
+                            sim.ai_paddle_y - sim.ball_size, sim.width - sim.ball_size)
+            error = self.difficulty.aim_error
+            target = x + sim.ball_size / 2 - sim.paddle_width / 2 + self.rng.uniform(-error, error)
+        else:
+            target = max_x / 2  # Ball heading away: drift back to the middle
+        self.target = min(max(target, 0), max_x)
+        self.plans += 1
+
+    def step(self):
+        sim = self.sim
+        if sim.trajectory != self.trajectory:
+            self.trajectory = sim.trajectory
+            self.plan()
+            self.wait = self.difficulty.reaction_steps
+        if self.wait:
+            self.wait -= 1
+            return
+        speed = self.difficulty.max_speed
+        sim.ai_x += min(max(self.target - sim.ai_x, -speed), speed)
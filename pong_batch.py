@@ -0,0 +1,213 @@
+import argparse
+import time
+
+import numpy as np
+
+from pong_ai import difficulty_for, intercept_x
+
+# Vectorised twin of pong_sim.PongSim: N independent matches live in flat
+# arrays and one call to step() advances every one of them. Used to find out
+# what the LaunchMenu difficulty slider (1-10) actually means in win rate.
+
+
+class PongBatch:
+    """N Pong matches stepped in lockstep with the same rules as PongSim.
+
+    Collisions use the same swept idea as collision.move_ball, reduced to what
+    vectorises cleanly: one paddle-face crossing and one mirrored wall bounce
+    per step.
+    """
+
+    def __init__(self, count, width=800, height=600, ai_difficulty=5, player_speed=10, paddle_width=100,
+                 paddle_height=20, ball_size=20, ball_speed_multiplier=1.1, win_score=10, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self.paddle_width = paddle_width
+        self.paddle_height = paddle_height
+        self.paddle_margin = 20
+        self.ball_size = ball_size
+        self.ball_speed_multiplier = ball_speed_multiplier
+        self.win_score = win_score
+        self.rng = np.random.default_rng(seed)
+
+        # Scalars broadcast, arrays let every match run its own difficulty
+        self.ai_difficulty = np.broadcast_to(np.asarray(ai_difficulty, dtype=np.float64), (count,))
+        self.player_speed = np.broadcast_to(np.asarray(player_speed, dtype=np.float64), (count,))
+
+        # Per-match pong_ai settings, plus the AI's cached target and reaction countdown
+        levels = {level: difficulty_for(level) for level in np.unique(self.ai_difficulty)}
+        settings = np.array([levels[level] for level in self.ai_difficulty], dtype=np.float64).reshape(count, 3)
+        self.ai_reaction, self.ai_aim_error, self.ai_speed = settings.T
+        self.ai_target = np.empty(count)
+        self.ai_wait = np.zeros(count)
+        self.replan = np.zeros(count, dtype=bool)  # Matches whose ball changed path since the AI last planned
+
+        self.ball_x = np.empty(count)
+        self.ball_y = np.empty(count)
+        self.ball_dx = np.empty(count)
+        self.ball_dy = np.empty(count)
+        self.player_x = np.full(count, width / 2 - paddle_width / 2)
+        self.ai_x = np.full(count, height / 2 - paddle_height / 2)
+        self.player_score = np.zeros(count, dtype=np.int32)
+        self.ai_score = np.zeros(count, dtype=np.int32)
+        self.paddle_hits = np.zeros(count, dtype=np.int64)
+        self.frames = np.zeros(count, dtype=np.int64)
+        self.active = np.full(count, win_score > 0)  # Matches nobody has won yet, refreshed whenever a point is scored
+        self.reset_ball(np.ones(count, dtype=bool))
+
+    def reset_ball(self, mask):
+        """Re-serve the ball in every match selected by mask."""
+        n = int(mask.sum())
+        if not n:
+            return
+        self.ball_x[mask] = self.width / 2
+        self.ball_y[mask] = self.height / 2
+        self.ball_dx[mask] = self.rng.integers(1, 6, n) * self.ball_speed_multiplier
+        self.ball_dy[mask] = self.rng.integers(1, 6, n) * self.ball_speed_multiplier
+        self.replan |= mask
+
+    def plan_ai(self, mask):
+        """Re-plan the AI target in every match selected by mask, as pong_ai.PongAI.plan does."""
+        max_x = self.width - self.paddle_width
+        size = self.ball_size
+        index = np.flatnonzero(mask)  # Usually a handful of matches, far cheaper to gather than a full mask
+        dy = self.ball_dy[index]
+        x = intercept_x(self.ball_x[index], self.ball_y[index], self.ball_dx[index], dy,
+                        self.height - self.paddle_height - self.paddle_margin - size, self.width - size)
+        error = self.ai_aim_error[index]
+        aimed = x + size / 2 - self.paddle_width / 2 + self.rng.uniform(-1, 1, len(dy)) * error
+        self.ai_target[index] = np.minimum(np.maximum(np.where(dy > 0, aimed, max_x / 2), 0), max_x)
+        self.ai_wait[index] = self.ai_reaction[index]
+        self.replan[index] = False
+
+    def step(self):
+        """Advance every unfinished match by one frame.
+
+        Finished matches have their ball parked with zero velocity, so they fall
+        through every rule below without being masked out op by op.
+        """
+        max_x = self.width - self.paddle_width
+        size = self.ball_size
+        self.frames += self.active
+
+        # Scripted player: track the ball at a fixed speed, like a human holding an arrow key
+        offset = self.ball_x - (self.player_x + self.paddle_width / 2)
+        move = np.minimum(np.maximum(offset, -self.player_speed), self.player_speed)
+        self.player_x = np.minimum(np.maximum(self.player_x + move, 0), max_x)
+
+        # Every ball flies straight; the few that end up past a paddle face or a
+        # side wall are patched below through an index, which is much cheaper
+        # than running the collision maths over every match
+        x0, y0 = self.ball_x, self.ball_y
+        self.ball_x = x0 + self.ball_dx
+        self.ball_y = y0 + self.ball_dy
+
+        # Swept paddle faces: the ball hits the paddle it is heading toward if it
+        # crosses that paddle's inner face during this step while overlapping it
+        # horizontally
+        player_face = self.paddle_margin + self.paddle_height
+        ai_face = self.height - self.paddle_height - self.paddle_margin - size
+        near = np.flatnonzero((self.ball_y <= player_face) | (self.ball_y >= ai_face))
+        if len(near):
+            dx, dy = self.ball_dx[near], self.ball_dy[near]
+            to_player = dy < 0
+            t = (np.where(to_player, player_face, ai_face) - y0[near]) / dy
+            x_t = x0[near] + dx * t
+            paddle_x = np.where(to_player, self.player_x[near], self.ai_x[near])
+            hit = (t >= 0) & (t <= 1) & (x_t > paddle_x - size) & (x_t < paddle_x + self.paddle_width)
+            if hit.any():
+                hits, t, dx, dy = near[hit], t[hit], dx[hit], dy[hit]
+                new_dx = dx * self.ball_speed_multiplier
+                new_dy = -dy * self.ball_speed_multiplier
+                self.ball_x[hits] = x0[hits] + dx * t + new_dx * (1 - t)
+                self.ball_y[hits] = y0[hits] + dy * t + new_dy * (1 - t)
+                self.ball_dx[hits] = new_dx
+                self.ball_dy[hits] = new_dy
+                self.paddle_hits[hits] += 1
+                self.replan[hits] = True
+
+        # Side walls: mirror anything that went past them back into the arena
+        right_edge = self.width - size
+        out = np.flatnonzero((self.ball_x < 0) | (self.ball_x > right_edge))
+        if len(out):
+            x = self.ball_x[out]
+            self.ball_x[out] = np.where(x < 0, -x, 2 * right_edge - x)
+            self.ball_dx[out] = -self.ball_dx[out]
+
+        # AI movement, same rule as pong_ai.PongAI.step: plan on a new path, wait, then head for the target
+        if self.replan.any():
+            self.plan_ai(self.replan)
+        waiting = self.ai_wait > 0
+        self.ai_wait -= waiting
+        move = np.minimum(np.maximum(self.ai_target - self.ai_x, -self.ai_speed), self.ai_speed)
+        self.ai_x = np.where(waiting, self.ai_x, self.ai_x + move)
+
+        # Scoring
+        ai_scored = self.ball_y <= 0
+        player_scored = self.ball_y >= self.height
+        scored = ai_scored | player_scored
+        if scored.any():
+            self.ai_score += ai_scored
+            self.player_score += player_scored
+            self.reset_ball(scored)
+            self.active = (self.player_score < self.win_score) & (self.ai_score < self.win_score)
+            over = scored & ~self.active
+            self.ball_dx[over] = 0
+            self.ball_dy[over] = 0
+            self.replan[over] = False
+
+    def run(self, max_frames=1_000_000):
+        """Step until every match has a winner or max_frames is reached."""
+        for _ in range(max_frames):
+            if not self.active.any():
+                break
+            self.step()
+
+
+def calibrate(difficulties=range(1, 11), matches=200, player_speed=10, seed=0, **kwargs):
+    """Play `matches` games per difficulty level and report how the AI fares.
+
+    Every level runs in the same batch, so the sweep takes as many steps as its
+    longest match (around 40,000) and costs far more per step than per match:
+    the default finishes in a few seconds with win rates good to a few percent.
+    """
+    difficulties = list(difficulties)
+    levels = np.repeat(np.asarray(difficulties, dtype=np.float64), matches)
+    batch = PongBatch(len(levels), ai_difficulty=levels, player_speed=player_speed, seed=seed, **kwargs)
+    batch.run()
+
+    results = []
+    for i, level in enumerate(difficulties):
+        sl = slice(i * matches, (i + 1) * matches)
+        points = batch.player_score[sl] + batch.ai_score[sl]
+        results.append({
+            'difficulty': level,
+            'ai_win_rate': float(np.mean(batch.ai_score[sl] >= batch.win_score)),
+            'unfinished': int(np.sum(batch.active[sl])),
+            'mean_rally_hits': float(batch.paddle_hits[sl].sum() / max(points.sum(), 1)),
+            'mean_point_frames': float(batch.frames[sl].sum() / max(points.sum(), 1)),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the Pong AI win rate for each difficulty level.")
+    parser.add_argument('--matches', type=int, default=200, help="matches per difficulty level")
+    parser.add_argument('--player-speed', type=float, default=10, help="speed of the scripted opponent")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = calibrate(matches=args.matches, player_speed=args.player_speed, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{'level':>5} {'AI win %':>9} {'hits/point':>11} {'frames/point':>13} {'unfinished':>11}")
+    for row in results:
+        print(f"{row['difficulty']:>5g} {row['ai_win_rate'] * 100:>8.1f}% {row['mean_rally_hits']:>11.2f} "
+              f"{row['mean_point_frames']:>13.1f} {row['unfinished']:>11}")
+    print(f"{len(results) * args.matches} matches in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import random
+
+from kivy.app import App
+from kivy.core.window import Window
+from kivy.graphics import Color, Ellipse, Line, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.widget import Widget
+
+from frame_stats import FrameStats, FrameStatsOverlay
+from lifecycle import STOPPED, Lifecycle
+from pong_sim import PongSim
+from replay import InputRecorder, new_seed
+from timestep import FixedTimestep, lerp
+
+# Pong against the AI paddle. Loaded on demand through games.py.
+
+
+class PongGame(Widget):
+    # The sim's speeds are per physics step, so physics runs at a fixed rate; the
+    # canvas is redrawn at the display rate, interpolated between steps
+    physics_rate = 30.0
+    display_rate = 60.0
+
+    def return_to_menu(self, instance):
+        """Return to the main menu when the button is clicked."""
+        if self.lifecycle.state == STOPPED:
+            return  # stop() dismissing the game-over popup calls back in here
+        self.lifecycle.stop()  # Stop the game loop and release bindings and popups
+        self.input_log.save()
+        App.get_running_app().show_menu()
+
+    def __init__(self, ai_difficulty=5, paddle_color=(1, 1, 1), ball_color=(1, 1, 1), high_score=0, seed=None,
+                 scores=None, **kwargs):
+        super().__init__(**kwargs)
+        # Everything random comes from a seeded RNG, so a recorded session replays exactly
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.input_log = InputRecorder('pong', self.seed, Window.size)
+        # Clock events, window bindings and popups go through the lifecycle so they can't leak
+        self.lifecycle = Lifecycle(self)
+        self.ball_color = ball_color
+        self.paddle_color = paddle_color
+        # Finished matches go to the score store (scores.ScoreStore); without one they aren't kept
+        self.scores = scores
+        self.high_score = max(high_score, scores.high_score('pong')) if scores is not None else high_score
+
+        # All of the physics lives in the headless simulation; this widget only draws it
+        self.sim = PongSim(Window.width, Window.height, ai_difficulty=ai_difficulty, rng=self.rng)
+
+        # Return to Menu Button
+        self.menu_button = Button(text="Return to Menu", size_hint=(0.2, 0.1), pos_hint={'x': 0, 'y': 0.9})
+        self.menu_button.bind(on_release=self.return_to_menu)
+        self.add_widget(self.menu_button)
+
+        # Score labels
+        self.score_label1 = Label(text=f"Player: {self.sim.player_score}", font_size=24,
+                                  pos=(Window.width * 0.1, Window.height - 60))
+        self.score_label2 = Label(text=f"AI: {self.sim.ai_score}", font_size=24,
+                                  pos=(Window.width * 0.7, Window.height - 60))
+        self.add_widget(self.score_label1)
+        self.add_widget(self.score_label2)
+
+        # High score label
+        self.high_score_label = Label(text=f"High Score: {self.high_score}", font_size=24,
+                                      pos=(Window.width * 0.4, Window.height - 60))
+        self.add_widget(self.high_score_label)
+
+        sim = self.sim
+        with self.canvas:
+            Color(*self.ball_color)
+            self.ball = Ellipse(pos=(sim.ball_x, sim.ball_y), size=(sim.ball_size, sim.ball_size))
+
+            Color(*self.paddle_color)
+            self.player = Rectangle(pos=(sim.player_x, sim.player_paddle_y), size=(sim.paddle_width, sim.paddle_height))
+            self.ai = Rectangle(pos=(sim.ai_x, sim.ai_paddle_y), size=(sim.paddle_width, sim.paddle_height))
+
+            Color(1, 1, 1, 1)  # Horizontal center line
+            self.center_line = Line(points=[0, Window.height / 2, Window.width, Window.height / 2], width=2)
+
+        # Frame timing, shown with F3
+        self.frame_stats = FrameStats('pong', self.display_rate, phases=('physics', 'render', 'ui'))
+        self.stats_overlay = FrameStatsOverlay(self.frame_stats, size=(460, 140),
+                                               pos=(Window.width - 470, Window.height - 150))
+        self.add_widget(self.stats_overlay)
+        self.lifecycle.bind_window(on_key_down=self.stats_overlay.on_key_down)
+
+        # Schedule the update function to run every frame
+        self.timestep = FixedTimestep(self.physics_step, self.physics_rate)
+        self.previous = (sim.ball_x, sim.ball_y, sim.ai_x)  # Ball and AI paddle at the last step
+        self.lifecycle.add_interval(self.update, 1.0 / self.display_rate)
+
+        # Bind keyboard events
+        self.bind(on_key_down=self.on_key_down)
+        self.bind(on_touch_move=self.on_touch_move)
+
+        # Movement variables
+        self.move_left = False
+        self.move_right = False
+
+        self.lifecycle.start()
+
+    def on_touch_move(self, touch, *args):
+        self.input_log.touch_move(touch)
+        # Gated on the arena rather than the widget: a replayed game is never laid out, so its rect is Kivy's default
+        if 0 <= touch.x <= self.sim.width and 0 <= touch.y <= self.sim.height:
+            # Centre the paddle on the touch; the sim keeps it within screen bounds
+            self.sim.move_player_to(touch.x)
+            self.player.pos = (self.sim.player_x, self.player.pos[1])
+
+    def on_key_down(self, instance, keyboard, keycode, text, modifiers):
+        self.input_log.key_down(keyboard, keycode)
+        if keycode == 80:  # Left arrow key code (typically)
+            self.move_left = True
+        elif keycode == 79:  # Right arrow key code (typically)
+            self.move_right = True
+
+    def update(self, dt):
+        """Game update loop."""
+        self.input_log.tick(dt)
+        stats = self.frame_stats
+        stats.begin_frame(dt)
+        self.fit_arena()
+
+        alpha = self.timestep.advance(dt)
+        stats.mark('physics')
+        self.sync_canvas(alpha)
+        stats.mark('render')
+
+        # Update high score
+        self.update_high_score()
+        stats.mark('ui')
+        stats.end_frame()
+        self.stats_overlay.frame_done()
+
+    def fit_arena(self):
+        """Keep the arena the size of the window."""
+        if (self.sim.width, self.sim.height) != tuple(Window.size):
+            self.sim.resize(*Window.size)
+
+    def physics_step(self, interval):
+        """Advance the match by one fixed step."""
+        sim = self.sim
+        if sim.winner():
+            return  # The match is over and the popup is up
+        self.previous = (sim.ball_x, sim.ball_y, sim.ai_x)
+        scorer = sim.step(self.move_left, self.move_right)
+
+        # Scoring
+        if scorer is not None:
+            self.previous = (sim.ball_x, sim.ball_y, sim.ai_x)  # Don't draw the served ball sliding back
+            if scorer == 'ai':
+                self.score_label2.text = f"AI: {sim.ai_score}"
+            else:
+                self.score_label1.text = f"Player: {sim.player_score}"
+            self.check_win_condition()
+
+    def sync_canvas(self, alpha=1.0):
+        """Copy the simulation state onto the canvas, alpha of the way from the previous step."""
+        sim = self.sim
+        ball_x, ball_y, ai_x = self.previous
+        self.ball.pos = (lerp(ball_x, sim.ball_x, alpha), lerp(ball_y, sim.ball_y, alpha))
+        self.player.pos = (sim.player_x, sim.player_paddle_y)  # Follows input directly
+        self.ai.pos = (lerp(ai_x, sim.ai_x, alpha), sim.ai_paddle_y)
+
+    def update_high_score(self):
+        """Update the high score if the player's score surpasses it."""
+        if self.sim.player_score > self.high_score:
+            self.high_score = self.sim.player_score
+            self.high_score_label.text = f"High Score: {self.high_score}"
+
+    def check_win_condition(self):
+        """Check if either the player or the AI has won, and display a popup."""
+        winner = self.sim.winner()
+        if winner == 'player':
+            self.show_popup("You Win!")
+        elif winner == 'ai':
+            self.show_popup("You've been defeated!")
+
+    def show_popup(self, message):
+        """Display a popup message when the game is over."""
+        self.lifecycle.pause()  # Nothing moves behind the popup
+        if self.scores is not None:
+            self.scores.record('pong', self.sim.player_score)
+        popup = self.lifecycle.popup('game_over', self.build_popup)
+        self.popup_label.text = message
+        popup.open()
+
+    def build_popup(self):
+        layout = BoxLayout(orientation='vertical', padding=10)
+        self.popup_label = Label(font_size=24)
+        close_button = Button(text="Return to Menu", size_hint=(1, 0.2))
+
+        layout.add_widget(self.popup_label)
+        layout.add_widget(close_button)
+
+        popup = Popup(title="Game Over", content=layout, size_hint=(0.6, 0.4))
+        close_button.bind(on_release=popup.dismiss)
+        popup.bind(on_dismiss=self.return_to_menu)
+        return popup
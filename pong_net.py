@@ -0,0 +1,531 @@
+import argparse
+import asyncio
+import queue
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+from pong_sim import PongSim
+
+# Two-player Pong over UDP with rollback.
+#
+# Only inputs cross the network: each peer sends, every physics step, the
+# paddle position its player asked for on every frame the other side hasn't
+# acknowledged yet, so a lost packet is covered by the next one. Each peer
+# simulates immediately with its own input and a prediction of the remote one
+# (its last known input). When the real remote input for an earlier frame
+# turns out different, the session restores the snapshot from before that
+# frame and re-simulates up to the present. The local paddle therefore never
+# waits on the network.
+#
+# NetPongSim keeps the whole match state in a few numbers and derives every
+# serve from the match seed, so a snapshot is a tuple and both peers compute
+# bit-identical frames from the same inputs.
+#
+#   python pong_net.py proxy 7778 127.0.0.1:7777 --latency 0.05 --jitter 0.01 --loss 0.05
+#   python pong_net.py test --latency 0.05 --jitter 0.01 --loss 0.05
+#
+# The proxy sits between the two games to add latency, jitter and loss; the
+# test runs two headless peers through one on localhost and checks that
+# they agree on every confirmed frame.
+
+DEFAULT_PORT = 7777
+MAGIC = b'PPNP'
+VERSION = 1
+HEADER = struct.Struct('<4sBB')  # magic, version, packet kind
+
+HELLO = 0  # guest -> host, no body
+WELCOME = 1  # host -> guest, MATCH body
+INPUT = 2  # INPUT body followed by count u16 inputs
+
+MATCH = struct.Struct('<QHHH')  # seed, arena width, arena height, win score
+INPUT_BODY = struct.Struct('<IIH')  # remote frames received (ack), first frame, count
+
+# A peer runs at most this many frames ahead of the last remote input it has;
+# past that it waits, which also bounds how far back a rollback can go
+MAX_ROLLBACK = 30
+# Most inputs carried by one packet
+MAX_INPUTS = 64
+# A peer that has sent nothing for this long is gone
+TIMEOUT = 5.0
+
+BOTTOM = 0  # Host's paddle
+TOP = 1  # Guest's paddle
+
+Match = namedtuple('Match', 'seed width height win_score side')
+
+
+def packet(kind, body=b''):
+    return HEADER.pack(MAGIC, VERSION, kind) + body
+
+
+def parse(data):
+    """Return (kind, body) of a packet, or None if it isn't one of ours."""
+    if len(data) < HEADER.size:
+        return None
+    magic, version, kind = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return kind, data[HEADER.size:]
+
+
+class NetPongSim(PongSim):
+    """PongSim for two players: both paddles follow input, no AI.
+
+    Serves come from the match seed and a serve counter rather than a running
+    RNG, so snapshot() is a handful of numbers.
+    """
+
+    def __init__(self, width, height, seed, **kwargs):
+        self.seed = seed
+        self.serves = 0
+        super().__init__(width, height, **kwargs)
+        self.ai_x = width / 2 - self.paddle_width / 2
+
+    def reset_ball(self):
+        self.rng = random.Random(self.seed * 1_000_003 + self.serves)
+        self.serves += 1
+        super().reset_ball()
+
+    def step(self, bottom_x, top_x):
+        """Advance one frame with each paddle centred on its player's input."""
+        self.move_player_to(bottom_x)
+        self.ai_x = min(max(top_x - self.paddle_width / 2, 0), self.width - self.paddle_width)
+        self.sweep_ball()
+        return self.score_point()
+
+    def snapshot(self):
+        return (self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, self.player_x, self.ai_x,
+                self.player_score, self.ai_score, self.serves)
+
+    def restore(self, state):
+        (self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, self.player_x, self.ai_x,
+         self.player_score, self.ai_score, self.serves) = state
+
+    def winner_of(self, state):
+        """winner() for the match as it was in a snapshot."""
+        player_score, ai_score = state[6], state[7]
+        if player_score >= self.win_score:
+            return 'player'
+        if ai_score >= self.win_score:
+            return 'ai'
+        return None
+
+
+class RollbackSession:
+    """Frame bookkeeping, prediction and rollback for one side of a match.
+
+    Knows nothing about sockets: advance() runs a frame with the local input,
+    receive() takes the peer's packets and packet() builds the next one to
+    send.
+    """
+
+    def __init__(self, sim, side, max_rollback=MAX_ROLLBACK):
+        self.sim = sim
+        self.side = side
+        self.max_rollback = max_rollback
+        self.frame = 0  # Next frame to simulate
+        self.start_input = int(sim.width / 2)  # Both paddles start centred
+        self.local = {}  # frame -> local input, kept until the peer acknowledges it
+        self.remote = []  # Confirmed remote input of every frame so far
+        self.predicted = {}  # frame -> remote input the frame was simulated with, until confirmed
+        self.snapshots = {}  # frame -> state before that frame, until confirmed
+        self.acked = 0  # Local frames the peer has received
+        self.last_heard = time.monotonic()
+        # (frame, winner) once a confirmed frame ends the match. Predicted frames can't end it:
+        # a rollback could still take the point back
+        self.result = None
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_depth = 0
+        self.stalls = 0
+        self.checksums = {}  # frame -> hash of the state after it, for confirmed frames (when tracking)
+        self.track_checksums = False
+
+    @property
+    def confirmed(self):
+        """Frames whose remote input is known; everything before is final."""
+        return len(self.remote)
+
+    @property
+    def synced(self):
+        """True when every simulated frame is confirmed, so the state is final."""
+        return self.confirmed >= self.frame
+
+    @property
+    def finished(self):
+        """True once the match is decided and the peer has every input up to its final frame."""
+        return self.result is not None and self.acked > self.result[0]
+
+    @property
+    def disconnected(self):
+        return time.monotonic() - self.last_heard > TIMEOUT
+
+    def predict(self):
+        # Remote players mostly keep doing what they did: repeat the last input known
+        return self.remote[-1] if self.remote else self.start_input
+
+    def run_frame(self, frame):
+        """Simulate one frame from the current state; returns who scored."""
+        local = self.local[frame]
+        remote = self.remote[frame] if frame < self.confirmed else self.predict()
+        self.predicted[frame] = remote
+        self.snapshots[frame] = self.sim.snapshot()
+        if self.side == BOTTOM:
+            return self.sim.step(local, remote)
+        return self.sim.step(remote, local)
+
+    def advance(self, local_input):
+        """Run the next frame with this side's input. Returns False (and waits) if too far ahead.
+
+        Once the match has a result, nothing more is simulated; packet() still
+        has to be sent until the peer has caught up (see finished).
+        """
+        if self.result is not None:
+            return False
+        if self.frame - self.confirmed >= self.max_rollback:
+            self.stalls += 1
+            return False
+        self.local[self.frame] = int(min(max(local_input, 0), 0xFFFF))
+        self.run_frame(self.frame)
+        self.frame += 1
+        self.prune()
+        return True
+
+    def receive(self, data):
+        """Take one packet from the peer, rolling back if it shows a misprediction."""
+        parsed = parse(data)
+        if parsed is None or parsed[0] != INPUT:
+            return
+        body = parsed[1]
+        ack, first, count = INPUT_BODY.unpack_from(body)
+        self.last_heard = time.monotonic()
+        self.acked = max(self.acked, ack)
+        inputs = array('H')
+        inputs.frombytes(body[INPUT_BODY.size:INPUT_BODY.size + 2 * count])
+        if sys.byteorder == 'big':
+            inputs.byteswap()
+
+        mismatch = None
+        for frame in range(max(first, self.confirmed), first + count):
+            value = inputs[frame - first]
+            self.remote.append(value)
+            if frame < self.frame and mismatch is None and self.predicted[frame] != value:
+                mismatch = frame
+        if mismatch is not None and self.result is None:
+            self.rollback(mismatch)
+        self.prune()
+
+    def rollback(self, frame):
+        """Restore the state before frame and re-simulate up to the present."""
+        depth = self.frame - frame
+        self.rollbacks += 1
+        self.resimulated += depth
+        self.max_depth = max(self.max_depth, depth)
+        self.sim.restore(self.snapshots[frame])
+        for f in range(frame, self.frame):
+            self.run_frame(f)
+
+    def prune(self):
+        """Drop what no rollback can need any more: state before the last confirmed frame.
+
+        Each frame dropped here is final, so this is also where the match
+        result is decided.
+        """
+        keep = min(self.confirmed, self.frame)
+        final = None
+        for frame in sorted(f for f in self.snapshots if f < keep):
+            if self.result is None:
+                after = self.snapshots[frame + 1] if frame + 1 < self.frame else self.sim.snapshot()
+                if self.track_checksums:
+                    self.checksums[frame] = hash(after)
+                winner = self.sim.winner_of(after)
+                if winner is not None:
+                    self.result = (frame, winner)
+                    final = after
+            del self.snapshots[frame]
+            del self.predicted[frame]
+        if final is not None:
+            self.sim.restore(final)  # Frames simulated past the end don't count; show the match as it ended
+        # A local input is needed until the peer has it and no rollback can replay its frame
+        for frame in [f for f in self.local if f < min(self.acked, keep)]:
+            del self.local[frame]
+
+    def packet(self):
+        """The input packet to send now: an ack plus every local input the peer hasn't got."""
+        first = self.acked
+        count = min(self.frame - first, MAX_INPUTS)
+        inputs = array('H', (self.local[f] for f in range(first, first + count)))
+        if sys.byteorder == 'big':
+            inputs.byteswap()
+        return packet(INPUT, INPUT_BODY.pack(self.confirmed, first, count) + inputs.tobytes())
+
+
+class LoopThread:
+    """An asyncio event loop running on a daemon thread."""
+
+    def __init__(self, name):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def call(self, coro):
+        """Run a coroutine on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class _Datagrams(asyncio.DatagramProtocol):
+    def __init__(self, handler):
+        self.handler = handler
+
+    def datagram_received(self, data, addr):
+        self.handler(data, addr)
+
+
+class NetLink(LoopThread):
+    """The UDP socket of one peer, served by an asyncio loop off the game thread.
+
+    Hosting waits for a HELLO and answers with the match settings; joining
+    sends HELLO until the WELCOME comes back. Input packets from the peer are
+    queued for the game thread, which drains them with receive().
+    """
+
+    def __init__(self, port=DEFAULT_PORT, peer=None, width=800, height=600, win_score=10, seed=None):
+        super().__init__('netplay')
+        self.peer = peer  # (host, port) to join, or None to host
+        self.inbox = queue.Queue()
+        self.connected = threading.Event()
+        self.remote = None  # Address of the other peer once connected
+        if peer is None:
+            seed = random.getrandbits(63) if seed is None else seed
+            self.match = Match(seed, width, height, win_score, BOTTOM)
+        else:
+            self.match = None  # Comes with the WELCOME
+        try:
+            self.transport = self.call(self.open(port))
+        except OSError:
+            self.stop()  # The port is taken or the peer's host unknown; don't leave the loop thread running
+            raise
+
+    async def open(self, port):
+        local = ('0.0.0.0', port) if self.peer is None else ('0.0.0.0', 0)
+        transport, _ = await self.loop.create_datagram_endpoint(lambda: _Datagrams(self.on_datagram),
+                                                                local_addr=local)
+        if self.peer is not None:
+            # Resolve the host once (raising here if it can't be): datagrams from the peer carry its IP
+            try:
+                info = await self.loop.getaddrinfo(*self.peer, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            except OSError:
+                transport.close()
+                raise
+            self.peer = info[0][4]
+            self.loop.create_task(self.say_hello(transport))
+        return transport
+
+    async def say_hello(self, transport):
+        while not self.connected.is_set() and not transport.is_closing():
+            transport.sendto(packet(HELLO), self.peer)
+            await asyncio.sleep(0.2)
+
+    def on_datagram(self, data, addr):
+        parsed = parse(data)
+        if parsed is None:
+            return
+        kind, body = parsed
+        if kind == HELLO and self.peer is None:
+            # The first guest to say hello gets the match; a repeated HELLO means the WELCOME was lost
+            if not self.connected.is_set():
+                self.remote = addr
+            if addr == self.remote:
+                match = self.match
+                self.transport.sendto(packet(WELCOME, MATCH.pack(match.seed, match.width, match.height,
+                                                                 match.win_score)), addr)
+                self.connected.set()
+        elif kind == WELCOME and self.peer is not None and not self.connected.is_set():
+            self.remote = self.peer
+            self.match = Match(*MATCH.unpack_from(body), TOP)
+            self.connected.set()
+        elif kind == INPUT and self.connected.is_set() and addr == self.remote:
+            self.inbox.put(data)
+
+    def send(self, data):
+        self.loop.call_soon_threadsafe(self.transport.sendto, data, self.remote)
+
+    def receive(self):
+        """Every input packet that arrived since the last call."""
+        packets = []
+        while True:
+            try:
+                packets.append(self.inbox.get_nowait())
+            except queue.Empty:
+                return packets
+
+    def session(self):
+        """A RollbackSession on a fresh NetPongSim for the agreed match; call once connected."""
+        match = self.match
+        sim = NetPongSim(match.width, match.height, match.seed, win_score=match.win_score)
+        return RollbackSession(sim, match.side)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.transport.close)
+            self.stop()
+
+
+class LossyProxy(LoopThread):
+    """Relays UDP between one client and a server with added latency, jitter and loss.
+
+    latency and jitter are one-way, in seconds; packets that draw different
+    jitter can overtake each other, as on a real network.
+    """
+
+    def __init__(self, port, target, latency=0.05, jitter=0.0, loss=0.0, seed=None):
+        super().__init__('netplay-proxy')
+        self.target = target
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.client = None
+        self.forwarded = 0
+        self.dropped = 0
+        self.transport = self.call(self.open(port))
+
+    async def open(self, port):
+        transport, _ = await self.loop.create_datagram_endpoint(lambda: _Datagrams(self.on_datagram),
+                                                                local_addr=('0.0.0.0', port))
+        return transport
+
+    def on_datagram(self, data, addr):
+        if addr == self.target:
+            destination = self.client
+        else:
+            self.client = addr
+            destination = self.target
+        if destination is None or self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0)
+        self.loop.call_later(delay, self.transport.sendto, data, destination)
+        self.forwarded += 1
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.transport.close)
+        self.stop()
+
+
+def address(text):
+    """Parse "host:port" into a (host, port) pair; the host defaults to localhost and the port to DEFAULT_PORT."""
+    host, colon, port = text.strip().rpartition(':')
+    if not colon:
+        host, port = port, ''  # No port given
+    try:
+        number = int(port) if port else DEFAULT_PORT
+    except ValueError:
+        number = -1
+    if not 0 < number < 65536:
+        raise ValueError(f"{port!r} is not a port number")
+    return host or '127.0.0.1', number
+
+
+def follow_ball(sim, rng, noise=40):
+    """Scripted player for tests: chase the ball, missing by up to noise pixels."""
+    return sim.ball_x + sim.ball_size / 2 + rng.uniform(-noise, noise)
+
+
+def self_test(frames=3000, rate=30.0, latency=0.05, jitter=0.01, loss=0.05, port=DEFAULT_PORT + 100,
+              width=400, height=300, win_score=3):
+    """Play a match between two headless peers through a LossyProxy; returns a report dict.
+
+    The host plays well and the guest sloppily, so the match ends; frames
+    caps how long it may take.
+    """
+    host = NetLink(port=port, width=width, height=height, win_score=win_score)
+    proxy = LossyProxy(port + 1, ('127.0.0.1', port), latency, jitter, loss, seed=1)
+    guest = NetLink(peer=('127.0.0.1', port + 1))
+    try:
+        if not (host.connected.wait(5) and guest.connected.wait(5)):
+            raise RuntimeError("peers did not connect")
+        peers = [(host, host.session(), random.Random(1), 20), (guest, guest.session(), random.Random(2), 120)]
+        for _, session, _, _ in peers:
+            session.track_checksums = True
+        step_times = []
+        start = time.perf_counter()
+        tick = 0
+        while tick < frames and not all(session.finished for _, session, _, _ in peers):
+            for link, session, rng, noise in peers:
+                began = time.perf_counter()
+                for data in link.receive():
+                    session.receive(data)
+                session.advance(follow_ball(session.sim, rng, noise))
+                link.send(session.packet())  # Also after the result, until the peer has caught up
+                step_times.append(time.perf_counter() - began)
+            tick += 1
+            time.sleep(max(start + tick / rate - time.perf_counter(), 0))
+        (_, a, _, _), (_, b, _, _) = peers
+        common = set(a.checksums) & set(b.checksums)
+        step_times.sort()
+        return {
+            'frames': min(a.frame, b.frame),
+            'finished': a.finished and b.finished,
+            'results': (a.result, b.result),
+            'compared': len(common),
+            'mismatches': sum(a.checksums[f] != b.checksums[f] for f in common),
+            'rollbacks': a.rollbacks + b.rollbacks,
+            'max_rollback_frames': max(a.max_depth, b.max_depth),
+            'resimulated_per_frame': (a.resimulated + b.resimulated) / (a.frame + b.frame),
+            'stalls': a.stalls + b.stalls,
+            'p50_step_us': step_times[len(step_times) // 2] * 1e6,
+            'p99_step_us': step_times[len(step_times) * 99 // 100] * 1e6,
+            'dropped': proxy.dropped,
+            'score': (a.sim.player_score, a.sim.ai_score),
+        }
+    finally:
+        guest.close()
+        proxy.close()
+        host.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Netplay tools: a lossy UDP proxy and a localhost self-test.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    proxy = commands.add_parser('proxy', help="relay a match with added latency, jitter and loss")
+    proxy.add_argument('port', type=int, help="port the guest joins")
+    proxy.add_argument('target', type=address, help="host:port of the hosting game")
+    test = commands.add_parser('test', help="play two headless peers through a proxy and compare them")
+    test.add_argument('--frames', type=int, default=3000, help="most ticks the match may take")
+    for command in (proxy, test):
+        command.add_argument('--latency', type=float, default=0.05, help="one-way delay in seconds")
+        command.add_argument('--jitter', type=float, default=0.01, help="random +/- delay in seconds")
+        command.add_argument('--loss', type=float, default=0.05, help="fraction of packets dropped")
+    args = parser.parse_args()
+
+    if args.command == 'proxy':
+        relay = LossyProxy(args.port, args.target, args.latency, args.jitter, args.loss)
+        print(f"Relaying :{args.port} -> {args.target[0]}:{args.target[1]}, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            relay.close()
+    else:
+        report = self_test(args.frames, latency=args.latency, jitter=args.jitter, loss=args.loss)
+        for key, value in report.items():
+            print(f"{key:>22}: {value:.1f}" if isinstance(value, float) else f"{key:>22}: {value}")
+        agreed = report['finished'] and report['results'][0] == report['results'][1]
+        raise SystemExit(1 if report['mismatches'] or not agreed else 0)
+
+
+if __name__ == '__main__':
+    main()
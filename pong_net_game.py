@@ -0,0 +1,129 @@
+from kivy.core.window import Window
+from kivy.uix.label import Label
+
+from pong_game import PongGame
+from pong_net import BOTTOM, DEFAULT_PORT, NetLink, address
+from timestep import lerp
+
+# Two-player Pong over the network (see pong_net.py). Loaded on demand
+# through games.py; the menu passes the address to join, or none to host.
+
+
+class NetPongGame(PongGame):
+    """Pong against another player over UDP, with rollback.
+
+    The host's paddle is at the bottom of the arena and the guest's at the
+    top. Each player sees the arena turned so their own paddle is at the
+    bottom, and their own paddle is drawn straight from input.
+    """
+
+    def __init__(self, peer=None, port=DEFAULT_PORT, **kwargs):
+        # The arena is the host's window size; a guest learns it from the host
+        self.link = NetLink(port=port, peer=address(peer) if peer else None,
+                            width=int(Window.width), height=int(Window.height))
+        self.session = None
+        self.over = False  # The result is up; the link runs on until the peer has it too
+        super().__init__(**kwargs)
+        self.input_log.recording = False  # One side's inputs can't replay a netplay match
+        self.scores = None  # Nor does it count for the high scores
+        self.remove_widget(self.high_score_label)
+
+        self.target_x = self.sim.width / 2  # Where this player wants their paddle centred
+        self.lifecycle.bind_window(on_key_down=self.on_key_down, on_key_up=self.on_key_up)
+        waiting = f"Joining {peer}..." if peer else f"Waiting for an opponent on port {port}..."
+        self.status_label = Label(text=waiting, font_size=24, center=(Window.width / 2, Window.height / 2 + 60))
+        self.add_widget(self.status_label)
+
+    def return_to_menu(self, instance):
+        self.link.close()
+        super().return_to_menu(instance)
+
+    def fit_arena(self):
+        pass  # Both peers simulate the arena agreed at connection, whatever their window size
+
+    def update_high_score(self):
+        pass
+
+    def start_match(self):
+        """Switch to the agreed match once the peers have connected."""
+        self.session = self.link.session()
+        self.sim = self.session.sim
+        self.previous = self.sim.snapshot()
+        self.target_x = self.sim.width / 2
+        self.remove_widget(self.status_label)
+
+    def on_touch_move(self, touch, *args):
+        if self.collide_point(touch.x, touch.y):
+            self.target_x = touch.x
+
+    def on_key_up(self, instance, keyboard, keycode, *args):
+        if keycode == 80:
+            self.move_left = False
+        elif keycode == 79:
+            self.move_right = False
+
+    def physics_step(self, interval):
+        """Exchange inputs with the peer and run the next frame."""
+        if self.session is None:
+            if not self.link.connected.is_set():
+                return
+            self.start_match()
+        session = self.session
+        sim = self.sim
+
+        half = sim.paddle_width / 2
+        speed = sim.player_speed * (self.move_right - self.move_left)
+        self.target_x = min(max(self.target_x + speed, half), sim.width - half)
+
+        self.previous = sim.snapshot()
+        for data in self.link.receive():
+            session.receive(data)
+        session.advance(self.target_x)  # Does nothing once the match has a result
+        # Keep sending after the end too: the peer may still need this side's last inputs to see it
+        self.link.send(session.packet())
+
+        if session.result is not None:
+            self.check_win_condition()
+            if session.finished or session.disconnected:
+                self.lifecycle.pause()
+        elif session.disconnected:
+            self.over = True
+            super().show_popup("Connection lost")
+
+    def check_win_condition(self):
+        """Show the result once a confirmed frame has decided the match; a predicted point could be rolled back."""
+        if self.over or self.session.result is None:
+            return
+        self.over = True
+        self.previous = self.sim.snapshot()  # The session has put the match back at its final frame
+        mine = 'player' if self.session.side == BOTTOM else 'ai'
+        self.show_popup("You Win!" if self.session.result[1] == mine else "You've been defeated!")
+
+    def show_popup(self, message):
+        """Open the game-over popup without pausing: the link has to run until the peer is done."""
+        popup = self.lifecycle.popup('game_over', self.build_popup)
+        self.popup_label.text = message
+        popup.open()
+
+    def sync_canvas(self, alpha=1.0):
+        """Draw the match from this player's side, alpha of the way from the previous step."""
+        sim = self.sim
+        if self.session is None:
+            return
+        ball_x, ball_y, _, _, bottom_x, top_x = self.previous[:6]
+        x = lerp(ball_x, sim.ball_x, alpha)
+        y = lerp(ball_y, sim.ball_y, alpha)
+        own_x = min(max(self.target_x - sim.paddle_width / 2, 0), sim.width - sim.paddle_width)
+        if self.session.side == BOTTOM:
+            other_x = lerp(top_x, sim.ai_x, alpha)
+            own_score, other_score = sim.player_score, sim.ai_score
+        else:
+            y = sim.height - y - sim.ball_size  # Turn the arena around for the guest
+            other_x = lerp(bottom_x, sim.player_x, alpha)
+            own_score, other_score = sim.ai_score, sim.player_score
+        self.ball.pos = (x, y)
+        self.player.pos = (own_x, sim.player_paddle_y)
+        self.ai.pos = (other_x, sim.ai_paddle_y)
+        # Scores can change when a rollback rewrites a point; labels only redraw on a new text
+        self.score_label1.text = f"You: {own_score}"
+        self.score_label2.text = f"Opponent: {other_score}"
@@ -0,0 +1,123 @@
+import random
+
+from collision import move_ball, wall_boxes
+from pong_ai import PongAI
+
+# Headless Pong core. Nothing in here touches Kivy, so a match can be
+# stepped without a window (AI tuning, load tests, regression checks).
+
+
+class PongSim:
+    """Pure-Python Pong state: ball, both paddles, scores and arena size."""
+
+    def __init__(self, width, height, ai_difficulty=5, paddle_width=100, paddle_height=20,
+                 ball_size=20, ball_speed_multiplier=1.1, win_score=10, player_speed=10, rng=None):
+        self.width = width
+        self.height = height
+        self.ai_difficulty = ai_difficulty
+        self.paddle_width = paddle_width
+        self.paddle_height = paddle_height
+        self.paddle_margin = 20  # Gap between each paddle and its edge of the arena
+        self.ball_size = ball_size
+        self.ball_speed_multiplier = ball_speed_multiplier  # Ball speed multiplier on paddle hit
+        self.win_score = win_score
+        self.player_speed = player_speed
+        self.rng = rng or random.Random()
+
+        self.player_score = 0
+        self.ai_score = 0
+        self.contacts = []  # Contacts made by the ball during the last step
+        self.trajectory = 0  # Bumped whenever the ball's path changes other than off a side wall
+        self.player_x = width / 2 - paddle_width / 2  # Player's paddle at the bottom
+        self.ai_x = height / 2 - paddle_height / 2  # AI's paddle at the top
+        self.reset_ball()
+        self.ai = PongAI(self, ai_difficulty)
+
+    @property
+    def player_paddle_y(self):
+        return self.paddle_margin
+
+    @property
+    def ai_paddle_y(self):
+        return self.height - self.paddle_height - self.paddle_margin
+
+    def resize(self, width, height):
+        """Change the arena size, keeping both paddles inside it."""
+        self.width = width
+        self.height = height
+        self.trajectory += 1
+        self.player_x = min(max(self.player_x, 0), width - self.paddle_width)
+        self.ai_x = min(max(self.ai_x, 0), width - self.paddle_width)
+
+    def reset_ball(self):
+        """Put the ball back in the centre with a fresh random velocity."""
+        self.ball_x = self.width / 2
+        self.ball_y = self.height / 2
+        self.ball_dx = self.rng.randint(1, 5) * self.ball_speed_multiplier
+        self.ball_dy = self.rng.randint(1, 5) * self.ball_speed_multiplier
+        self.trajectory += 1
+
+    def move_player_to(self, x):
+        """Centre the player's paddle on x, clamped to the arena."""
+        self.player_x = min(max(x - self.paddle_width / 2, 0), self.width - self.paddle_width)
+
+    def accelerate_ball(self):
+        """Increase the speed of the ball slightly."""
+        self.ball_dx *= self.ball_speed_multiplier
+        self.ball_dy *= self.ball_speed_multiplier
+
+    def on_contact(self, tag, nx, ny, dx, dy):
+        """Speed the ball up whenever it comes off a paddle."""
+        if tag != 'wall':
+            self.trajectory += 1
+            return dx * self.ball_speed_multiplier, dy * self.ball_speed_multiplier
+        return None
+
+    def step_ai(self):
+        """Move the AI paddle toward its predicted intercept (see pong_ai)."""
+        self.ai.step()
+
+    def step(self, move_left=False, move_right=False):
+        """Advance the match by one frame.
+
+        Returns 'player' or 'ai' when that side scored this frame, otherwise None.
+        """
+        # Player movement
+        if move_left:
+            self.player_x -= self.player_speed
+        if move_right:
+            self.player_x += self.player_speed
+        self.player_x = min(max(self.player_x, 0), self.width - self.paddle_width)
+
+        self.sweep_ball()
+        self.step_ai()
+        return self.score_point()
+
+    def sweep_ball(self):
+        """Move the ball one frame, sweeping it against the side walls and both paddles."""
+        obstacles = wall_boxes(self.width, self.height, top=False, bottom=False)
+        obstacles.append(((self.player_x, self.player_paddle_y, self.paddle_width, self.paddle_height), 'player'))
+        obstacles.append(((self.ai_x, self.ai_paddle_y, self.paddle_width, self.paddle_height), 'ai'))
+        self.ball_x, self.ball_y, self.ball_dx, self.ball_dy, self.contacts = move_ball(
+            self.ball_x, self.ball_y, self.ball_size, self.ball_dx, self.ball_dy,
+            lambda *args: obstacles, self.on_contact)
+
+    def score_point(self):
+        """Score and re-serve if the ball left the arena; returns the side that scored or None."""
+        if self.ball_y <= 0:
+            self.ai_score += 1
+            self.reset_ball()
+            return 'ai'
+        if self.ball_y >= self.height:
+            self.player_score += 1
+            self.reset_ball()
+            return 'player'
+        return None
+
+    def winner(self):
+        """Return 'player' or 'ai' once either side reaches the win score, else None."""
+        if self.player_score >= self.win_score:
+            return 'player'
+        if self.ai_score >= self.win_score:
+            return 'ai'
+        return None
@@ -0,0 +1,206 @@
+import argparse
+import os
+import random
+import struct
+import time
+
+# Session recording and deterministic replay.
+#
+# Every game is created with an RNG seed and logs its inputs through an
+# InputRecorder: one record per update tick (with the dt Kivy passed) and one
+# per key or touch event, in the order they reached the game. Replaying feeds
+# the same seed, dts and events back into a fresh game, either at the recorded
+# pace or as fast as the CPU allows with no window.
+#
+# A session keeps at most max_records records (about two hours of play); a
+# longer one is saved cut short, which still replays exactly as far as it
+# goes. Only the newest KEEP replays are kept in the replays directory.
+#
+# File layout (little endian):
+#   header  b'PPRL', version u8, seed u64, window width u16, height u16,
+#           game name length u8, game name (utf-8)
+#   records code u8, time since start in ms u32, a f64, b f64
+
+MAGIC = b'PPRL'
+VERSION = 1
+HEADER = struct.Struct('<4sBQHHB')
+RECORD = struct.Struct('<BIdd')
+
+TICK = 0  # a = dt
+KEY_DOWN = 1  # a = key, b = scancode
+KEY_UP = 2
+TOUCH_DOWN = 3  # a = x, b = y
+TOUCH_MOVE = 4
+TOUCH_UP = 5
+RESTART = 6  # the player chose Restart on the game-over popup
+
+MAX_RECORDS = 500000  # About 10 MB
+KEEP = 20
+
+
+def new_seed():
+    return random.randrange(2 ** 63)
+
+
+class InputRecorder:
+    """Collects a session's inputs in memory; save() writes them out."""
+
+    def __init__(self, game, seed, window_size, directory='replays', max_records=MAX_RECORDS, keep=KEEP):
+        self.game = game
+        self.seed = seed
+        self.window_size = (int(window_size[0]), int(window_size[1]))
+        self.directory = directory
+        self.keep = keep  # Replays left in directory after a save
+        self.recording = True
+        self.data = bytearray()
+        self.limit = max_records * RECORD.size  # Bytes of data; later records are dropped
+        self.start = time.perf_counter()
+
+    def record(self, code, a=0.0, b=0.0):
+        if self.recording and len(self.data) < self.limit:
+            ms = int((time.perf_counter() - self.start) * 1000)
+            self.data += RECORD.pack(code, ms, a, b)
+
+    def tick(self, dt):
+        self.record(TICK, dt)
+
+    def key_down(self, key, scancode):
+        self.record(KEY_DOWN, key, scancode)
+
+    def key_up(self, key, scancode):
+        self.record(KEY_UP, key, scancode)
+
+    def touch_down(self, touch):
+        self.record(TOUCH_DOWN, touch.x, touch.y)
+
+    def touch_move(self, touch):
+        self.record(TOUCH_MOVE, touch.x, touch.y)
+
+    def touch_up(self, touch):
+        self.record(TOUCH_UP, touch.x, touch.y)
+
+    def restart(self):
+        self.record(RESTART)
+
+    def save(self, path=None):
+        """Write the session to path and return the path.
+
+        The default path is replays/<game>-<time>.pprl, and saving there
+        deletes all but the newest keep replays.
+        """
+        if not self.recording:
+            return None
+        prune = path is None
+        if prune:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{self.game}-{time.strftime('%Y%m%d-%H%M%S')}.pprl")
+        name = self.game.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, *self.window_size, len(name)))
+            f.write(name)
+            f.write(self.data)
+        if prune:
+            self.prune()
+        return path
+
+    def prune(self):
+        """Delete all but the newest keep replays in the directory."""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.pprl')]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already gone, or in use; the next save tries again
+
+
+class ReplayTouch:
+    """Stand-in for a Kivy touch carrying only what the games read."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.pos = (x, y)
+        self.ud = {}
+
+
+class Replay:
+    """A recorded session loaded from disk."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, self.seed, width, height, name_length = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        offset = HEADER.size
+        self.game = data[offset:offset + name_length].decode('utf-8')
+        self.window_size = (width, height)
+        self.records = list(RECORD.iter_unpack(data[offset + name_length:]))
+
+    @property
+    def ticks(self):
+        return sum(1 for record in self.records if record[0] == TICK)
+
+    def play(self, game, realtime=False):
+        """Feed the session into game, a fresh instance built with this replay's seed.
+
+        The game is paused so only the recorded ticks drive it. With
+        realtime=True each record waits for its original time.
+        """
+        game.lifecycle.pause()
+        game.input_log.recording = False
+
+        start = time.perf_counter()
+        for code, ms, a, b in self.records:
+            if realtime:
+                delay = ms / 1000 - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            if code == TICK:
+                game.update(a)
+            elif code == KEY_DOWN:
+                game.on_key_down(None, int(a), int(b), None, [])
+            elif code == KEY_UP:
+                game.on_key_up(None, int(a), int(b))
+            elif code == TOUCH_DOWN:
+                game.on_touch_down(ReplayTouch(a, b))
+            elif code == TOUCH_MOVE:
+                game.on_touch_move(ReplayTouch(a, b))
+            elif code == TOUCH_UP:
+                game.on_touch_up(ReplayTouch(a, b))
+            elif code == RESTART:
+                game.restart_game(None)
+                game.lifecycle.pause()
+        return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session without a window.")
+    parser.add_argument('path')
+    parser.add_argument('--realtime', action='store_true', help="keep the recorded pace instead of running flat out")
+    parser.add_argument('--profile', action='store_true', help="run under cProfile and print the hottest calls")
+    args = parser.parse_args()
+
+    # The benchmark module sets Kivy up headless, so it has to be imported before anything Kivy
+    import benchmark
+    replay = Replay(args.path)
+    benchmark.install_window(benchmark.HeadlessWindow(*replay.window_size))
+    import games
+    game = games.load(replay.game)(seed=replay.seed)
+
+    start = time.perf_counter()
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(replay.play, game, args.realtime)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    else:
+        replay.play(game, args.realtime)
+    elapsed = time.perf_counter() - start
+    print(f"{replay.game}: {replay.ticks} ticks in {elapsed:.2f}s ({replay.ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+
+
+if __name__ == '__main__':
+    main()
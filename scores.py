@@ -0,0 +1,167 @@
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Persistent high scores for every game, kept in a SQLite database.
+#
+# record() only puts the score on a queue. A worker thread owns the writing
+# connection and commits everything that has queued up in one transaction,
+# so the game loop never waits on the disk. The worker also reads each game's
+# best score when it starts, so high_score() is a dict lookup. Other reads use
+# their own connection;
+# the database runs in WAL mode so they don't wait for the writer, and the
+# (game, score) index makes a top-N query a short index scan.
+
+DEFAULT_PATH = 'scores.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    player TEXT NOT NULL DEFAULT '',
+    recorded REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_game ON scores (game, score DESC, recorded);
+"""
+
+INSERT = "INSERT INTO scores (game, score, player, recorded) VALUES (?, ?, ?, ?)"
+
+Score = namedtuple('Score', 'game score player recorded')
+
+_STOP = object()  # Queued by close() to end the worker
+
+
+class ScoreStore:
+    """High scores in a SQLite file, written in batches from a worker thread."""
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=100, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        # How long the worker waits for more scores before committing a batch
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.best = {}  # game -> best score, including scores the worker hasn't written yet
+        self.best_lock = threading.Lock()  # record() and the worker's first read both update best
+        self.loaded = threading.Event()  # Set once best holds the scores already in the database
+        self.commits = 0
+        self.closed = False
+        self.reader = self.connect()
+        self.reader.executescript(SCHEMA)
+        self.worker = threading.Thread(target=self.run, name='scores', daemon=True)
+        self.worker.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def record(self, game, score, player=''):
+        """Queue a finished game's score. Never blocks."""
+        if self.closed:
+            raise ValueError("score store is closed")
+        self.queue.put((game, int(score), player, time.time()))
+        self.raise_best(game, int(score))
+
+    def raise_best(self, game, score):
+        with self.best_lock:
+            if score > self.best.get(game, 0):
+                self.best[game] = score
+
+    def high_score(self, game):
+        """The best score recorded for game, or 0.
+
+        Scores from earlier sessions count once the worker has read them
+        (see loaded), which is the first thing it does.
+        """
+        return self.best.get(game, 0)
+
+    def top(self, game, n=10):
+        """The n best scores for game, best first.
+
+        Scores still on the queue appear once the worker commits them, at
+        most flush_interval after they were recorded (or after flush()).
+        """
+        rows = self.reader.execute("SELECT game, score, player, recorded FROM scores WHERE game = ? "
+                                   "ORDER BY score DESC, recorded LIMIT ?", (game, n))
+        return [Score(*row) for row in rows]
+
+    def flush(self, timeout=None):
+        """Wait until every queued score has been committed.
+
+        Returns False if that took longer than timeout seconds, or if the
+        worker has died and never will.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                if not self.worker.is_alive():
+                    return False
+                wait = 0.1  # Look at the worker again this often
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return False
+                self.queue.all_tasks_done.wait(wait)
+        return True
+
+    def close(self):
+        """Commit what is queued, stop the worker and close the database."""
+        if self.closed:
+            return
+        self.closed = True
+        if self.worker.is_alive():
+            self.queue.put(_STOP)
+            self.worker.join()
+        self.reader.close()
+
+    def run(self):
+        """Worker thread: commit queued scores in batches until close()."""
+        connection = self.connect()
+        for game, best in connection.execute("SELECT game, MAX(score) FROM scores GROUP BY game"):
+            self.raise_best(game, best)
+        self.loaded.set()
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            if batch[-1] is _STOP:
+                running = False
+                batch.pop()
+            if batch:
+                with connection:
+                    connection.executemany(INSERT, batch)
+                self.commits += 1
+            for _ in range(len(batch) + (not running)):
+                self.queue.task_done()
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the high scores kept in the score database.")
+    parser.add_argument('games', nargs='*', help="games to list (default: every game with a score)")
+    parser.add_argument('--path', default=DEFAULT_PATH)
+    parser.add_argument('-n', type=int, default=10, help="scores per game")
+    args = parser.parse_args()
+
+    store = ScoreStore(args.path)
+    games = args.games or [row[0] for row in store.reader.execute("SELECT DISTINCT game FROM scores ORDER BY game")]
+    for game in games:
+        print(game)
+        for rank, score in enumerate(store.top(game, args.n), 1):
+            when = time.strftime('%Y-%m-%d %H:%M', time.localtime(score.recorded))
+            print(f"  {rank:>3}. {score.score:>6}  {when}  {score.player}")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
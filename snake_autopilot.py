@@ -0,0 +1,365 @@
+import heapq
+from array import array
+from itertools import islice
+
+from snake_board import DIRECTIONS
+
+# Snake autopilot for attract mode and soak tests. It plans on the board's own
+# occupancy grid with A*, and plans are cached: while the snake follows a
+# path, every cell on it is still reachable in time, so nothing is searched
+# again until the path runs out, the food moves or something else (a player)
+# steers the snake.
+#
+# The snake keeps its body in order along a Hamiltonian cycle of the board,
+# and A* only takes shortcuts that stay ahead of the tail along the cycle.
+# Every cell between the head and the tail on the cycle is free, so such a
+# path is always safe, the tail is always reachable and the plain cycle is
+# there as the fallback. Shortcuts leave free cells behind the head that
+# only open up again once the tail passes them, so they stop when the snake
+# covers half the board or the room ahead can't take the growth still to
+# come, and the snake steps round food it can't afford to eat yet. That way
+# it can't die or stall and fills the board. A search that runs over its
+# budget is dropped for greedy jumps along the cycle, so no tick searches the
+# whole board.
+#
+# An odd board (both sides odd) has no cycle through every cell; its cycle
+# leaves out a corner, which shares a place in the order with a neighbour.
+# That corner is a free cell the head can't reach in order, so the last food
+# or two of an odd board may be left (the snake circles) or be fatal.
+#
+# A snake that is not in cycle order (a player steered it) steps along the
+# cycle wherever that is safe, and is back in order once its whole body has
+# been laid down that way. Until then it plans with time-aware searches. Each
+# body cell's move stamp gives how many moves until the tail leaves it, so a
+# path may run through body cells that are free by the time the head gets
+# there. A plan to the food is only taken if the tail is still reachable
+# after eating it; otherwise the snake follows its tail. These searches share
+# a budget per move too, half of it kept for finding the tail.
+
+_MOVES = {step: name for name, step in DIRECTIONS.items()}
+
+
+def hamiltonian_cycle(cols, rows):
+    """A cycle through the cells of the board as a list of cells, or None if the board is a single line.
+
+    Every cell is on it, except when both sides are odd: no cycle covers an
+    odd number of cells, so the top right corner is left out.
+    """
+    if min(cols, rows) < 2:
+        return None
+    transpose = rows % 2 == 1 and cols % 2 == 0  # The serpentine needs an even number of rows; walk columns
+    if transpose:
+        cols, rows = rows, cols
+    height = rows - rows % 2
+    path = [(col, 0) for col in range(cols)]
+    for row in range(1, height):
+        span = range(cols - 1, 0, -1) if row % 2 else range(1, cols)
+        path.extend((col, row) for col in span)
+    path.extend((0, row) for row in range(height - 1, 0, -1))
+    if height < rows:
+        # Both sides odd: splice the top row in two cells at a time, between neighbours in the row below
+        for col in range(cols - 2, 0, -2):
+            i = path.index((col, height - 1))
+            path[i + 1:i + 1] = [(col, height), (col - 1, height)]
+    if transpose:
+        cols, rows = rows, cols
+        path = [(row, col) for col, row in path]
+    return [row * cols + col for col, row in path]
+
+
+class Autopilot:
+    """Chooses the snake's direction each move on a SnakeBoard."""
+
+    def __init__(self, board, budget=150, free_budget=600):
+        self.budget = budget  # Most cells one cycle-order search expands
+        self.free_budget = free_budget  # Most cells the time-aware searches of one plan expand together
+        self.left = free_budget  # What is left of it for the plan being made
+        self.reset(board)
+
+    def reset(self, board):
+        self.board = board
+        self.moves = 0  # Number of head placements seen
+        # Move stamp of each body cell: the body index of a cell is moves - stamp[cell]
+        self.stamp = array('l', bytes(array('l').itemsize * board.cols * board.rows))
+        for i, cell in enumerate(reversed(board.body)):
+            self.stamp[cell] = i - len(board.body) + 1
+        self.head = board.body[0]
+        self.path = []  # Cells still to visit, next one last
+        self.goal = None  # Food cell the path leads to, or None for a tail or cycle path
+        self.cycle = hamiltonian_cycle(board.cols, board.rows)
+        self.order = None  # Each cell's position on the cycle
+        if self.cycle is not None:
+            size = len(self.cycle)
+            self.order = array('i', [-1]) * (board.cols * board.rows)
+            for i, cell in enumerate(self.cycle):
+                self.order[cell] = i
+            # A corner left off the cycle shares the position of the cell between its two neighbours on
+            # it, so the snake can pass through either and still be in cycle order
+            for cell in range(len(self.order)):
+                if self.order[cell] < 0:
+                    col, row = board.cell_xy(cell)
+                    around = {self.order[(row + dr) * board.cols + col + dc] for dc, dr in DIRECTIONS.values()
+                              if 0 <= col + dc < board.cols and 0 <= row + dr < board.rows}
+                    self.order[cell] = next((i + 1) % size for i in around if (i + 2) % size in around)
+        self.on_cycle = self.in_cycle_order()
+        self.given_up = None  # Food the last search could not reach in its budget
+        self.run = 0  # Moves in a row along the cycle while out of cycle order
+        self.plans = 0
+        self.nodes = 0  # Cells expanded by all searches so far
+
+    def in_cycle_order(self):
+        """Whether the body runs forward along the cycle from the tail to the head."""
+        if self.order is None:
+            return False
+        size = len(self.cycle)
+        body = self.board.body
+        span = (self.order[body[0]] - self.order[body[-1]]) % size
+        return all(0 < (self.order[a] - self.order[b]) % size <= span for a, b in zip(body, islice(body, 1, None)))
+
+    def observe(self):
+        """Catch up with the board: stamp the new head if the snake moved."""
+        board = self.board
+        head = board.body[0]
+        if head != self.head:
+            self.moves += 1
+            self.stamp[head] = self.moves
+            self.head = head
+            if self.path and self.path[-1] == head:
+                self.path.pop()
+            else:
+                self.path = []  # Someone else steered; the plan no longer applies
+                self.on_cycle = self.in_cycle_order()
+            if not self.on_cycle and self.order is not None:
+                # Once the whole body was laid down one cycle step at a time, it is in cycle order again
+                size = len(self.cycle)
+                self.run = self.run + 1 if (self.order[head] - self.order[board.body[1]]) % size == 1 else 0
+                if self.run >= len(board) and self.in_cycle_order():
+                    self.on_cycle = True
+                    self.path, self.given_up = [], None  # Plan along the cycle from here
+
+    def vacates(self, cell, moves, length, growth, overlay=None):
+        """Moves (from the plan's start) until the snake leaves cell; 0 if it is free then."""
+        if overlay is not None and cell in overlay:
+            stamp = overlay[cell]
+        elif self.board.occupied[cell]:
+            stamp = self.stamp[cell]
+        else:
+            return 0
+        return max(length - (moves - stamp) + growth, 0)
+
+    def search(self, start, goal, moves, length, growth, overlay=None):
+        """A* from start to goal, entering a cell only once the body has left it.
+
+        moves, length and growth describe the snake at the start: its move
+        count, length and pending growth. Returns the path as cells from the
+        goal back to the first step, or None if there is none within the
+        budget.
+        """
+        board = self.board
+        cols, rows = board.cols, board.rows
+        gc, gr = goal % cols, goal // cols
+        best = {start: 0}
+        came = {}
+        # Ties go to the deepest cell, or an open board would be expanded across its whole width
+        frontier = [(abs(start % cols - gc) + abs(start // cols - gr), 0, start)]
+        expanded = 0
+        while frontier and expanded < self.left:
+            _, steps, cell = heapq.heappop(frontier)
+            steps = -steps
+            if cell == goal:
+                self.nodes += expanded
+                self.left -= expanded
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came[cell]
+                return path
+            if steps > best.get(cell, steps):
+                continue
+            expanded += 1
+            col, row = cell % cols, cell // cols
+            arrival = steps + 1
+            for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                c, r = col + dc, row + dr
+                if not (0 <= c < cols and 0 <= r < rows):
+                    continue
+                n = r * cols + c
+                if arrival >= best.get(n, arrival + 1):
+                    continue
+                if self.vacates(n, moves, length, growth, overlay) > arrival:
+                    continue
+                best[n] = arrival
+                came[n] = cell
+                heapq.heappush(frontier, (arrival + abs(c - gc) + abs(r - gr), -arrival, n))
+        self.nodes += expanded
+        self.left -= expanded
+        return None
+
+    def jump(self, head, limit, eat=True):
+        """The neighbour furthest along the cycle but at most limit cells ahead; at least the next cell.
+
+        Of two cells as far ahead (the corner left off an odd board and the
+        cell it stands in for), the food is taken if eat and avoided if not.
+        """
+        board = self.board
+        order, size = self.order, len(self.cycle)
+        best = self.cycle[(order[head] + 1) % size]
+        furthest = 1
+        col, row = board.cell_xy(head)
+        for dc, dr in DIRECTIONS.values():
+            c, r = col + dc, row + dr
+            if 0 <= c < board.cols and 0 <= r < board.rows:
+                n = r * board.cols + c
+                ahead = (order[n] - order[head]) % size
+                if furthest < ahead <= limit or (ahead == furthest and (n == board.food) == eat):
+                    best, furthest = n, ahead
+        return best
+
+    def detour(self, head, food):
+        """A step to a free cell off the cycle other than the food, leaving cycle order; None if there is none."""
+        board = self.board
+        col, row = board.cell_xy(head)
+        for dc, dr in DIRECTIONS.values():
+            c, r = col + dc, row + dr
+            if 0 <= c < board.cols and 0 <= r < board.rows:
+                n = r * board.cols + c
+                if n != food and not board.occupied[n]:
+                    self.on_cycle = False
+                    return [n]
+        return None
+
+    def shortcut(self, start, goal, limit):
+        """A* from start to goal moving only forward along the cycle, at most limit cells ahead.
+
+        Returns the path as cells from the goal back to the first step, or
+        None if the goal was not found within the budget.
+        """
+        board = self.board
+        cols, rows = board.cols, board.rows
+        order, size = self.order, len(self.cycle)
+        base = order[start]
+        gc, gr = goal % cols, goal // cols
+        came = {start: None}
+        frontier = [(abs(start % cols - gc) + abs(start // cols - gr), 0, 0, start)]
+        expanded = 0
+        while frontier and expanded < self.budget:
+            _, steps, ahead, cell = heapq.heappop(frontier)
+            if cell == goal:
+                self.nodes += expanded
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came[cell]
+                return path
+            expanded += 1
+            col, row = cell % cols, cell // cols
+            for dc, dr in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                c, r = col + dc, row + dr
+                if not (0 <= c < cols and 0 <= r < rows):
+                    continue
+                n = r * cols + c
+                # Later on the cycle than cell, but not past the limit; each cell is reached once
+                if n in came or not ahead < (order[n] - base) % size <= limit:
+                    continue
+                came[n] = cell
+                heapq.heappush(frontier, (steps + 1 + abs(c - gc) + abs(r - gr), steps + 1, (order[n] - base) % size, n))
+        self.nodes += expanded
+        return None
+
+    def plan(self):
+        """Find a new path to follow; the notes at the top of the module give the order of preference."""
+        board = self.board
+        self.plans += 1
+        head, length, growth = board.body[0], len(board), board.grow_pending
+        if self.on_cycle:
+            # Stay far enough ahead of the tail to grow for the pending food and this one, with a cell to spare
+            # for food that turns up right in front
+            size = len(self.cycle)
+            gap = (self.order[board.body[-1]] - self.order[head]) % size
+            limit = gap - growth - 3
+            if 2 * length > size:
+                limit = min(limit, 1)  # No more shortcuts: the cells they skip must drain first
+            food = board.food
+            # Food in the cell sharing the head's position (on an odd board) is a whole lap away
+            ahead = size if food is None else (self.order[food] - self.order[head] - 1) % size + 1
+            # The same goes for food in the next cell, unless every free cell is ahead: then the board
+            # fills up before the growth runs out
+            eat = gap > growth + 2 or len(board.free) < gap
+            path = None
+            # The cycle itself reaches any food up to the limit, so only then is a search worthwhile
+            if ahead <= limit and food != self.given_up:
+                path = self.shortcut(head, food, limit)
+                if path is None:
+                    self.given_up = food  # Too far round for the budget; jump along the cycle instead
+            if path is None:
+                path = [self.jump(head, min(ahead, limit), eat)]
+            if path[-1] == food and not eat:
+                path = self.detour(head, food) or path
+            self.path, self.goal = path, (food if path[0] == food else None)
+            return
+        food = board.food
+        self.left = self.free_budget // 2  # At most half for the food; the rest is kept for staying alive
+        if self.order is not None:
+            # Head back into cycle order: step along the cycle whenever that is safe
+            step = self.cycle[(self.order[head] + 1) % len(self.cycle)]
+            if self.vacates(step, self.moves, length, growth) <= 1 and self.tail_reachable_after([step], step == food):
+                self.path, self.goal = [step], (food if step == food else None)
+                return
+        if food is not None and food != self.given_up:
+            path = self.search(head, food, self.moves, length, growth)
+            if path is not None and self.tail_reachable_after(path, eats=True):
+                self.path, self.goal = path, food
+                return
+            self.given_up = food  # Not again until back in cycle order (with no cycle, after a tail path)
+        self.left += self.free_budget - self.free_budget // 2
+        path = self.search(head, board.body[-1], self.moves, length, growth)
+        if path is not None and not self.tail_reachable_after(path, eats=False):
+            # The path crosses the cells the tail is about to leave; take one step and look again
+            path = path[-1:]
+        if path and self.order is None:
+            self.given_up = None  # With no cycle to return to, try the food again once this path is done
+        self.path, self.goal = path or [], None
+
+    def tail_reachable_after(self, path, eats):
+        """Whether the snake could still reach its tail after following path (and eating at its end)."""
+        board = self.board
+        steps = len(path)
+        eaten = min(steps, board.grow_pending)
+        moves = self.moves + steps
+        length = len(board) + eaten
+        growth = board.grow_pending - eaten + eats
+        overlay = {cell: moves - i for i, cell in enumerate(path)}
+        # The snake is then the path (food first) followed by the front of the current body
+        tail = path[length - 1] if length <= steps else board.body[length - steps - 1]
+        return self.search(path[0], tail, moves, length, growth, overlay) is not None
+
+    def next_direction(self):
+        """The direction to move next."""
+        self.observe()
+        board = self.board
+        if self.path and (self.goal is not None and self.goal != board.food):
+            self.path = []  # The food was eaten or moved
+        if self.path and self.vacates(self.path[-1], self.moves, len(board), board.grow_pending) > 1:
+            self.path = []
+        if not self.path:
+            self.plan()
+        if self.path:
+            return self.direction_to(self.path[-1])
+        return self.fallback()
+
+    def fallback(self):
+        """No path: move to any cell that is free next move."""
+        board = self.board
+        length, growth = len(board), board.grow_pending
+        col, row = board.cell_xy(board.body[0])
+        for name, (dc, dr) in DIRECTIONS.items():
+            c, r = col + dc, row + dr
+            if 0 <= c < board.cols and 0 <= r < board.rows:
+                if self.vacates(r * board.cols + c, self.moves, length, growth) <= 1:
+                    return name
+        return 'RIGHT'  # Boxed in
+
+    def direction_to(self, cell):
+        board = self.board
+        (col, row), (c, r) = board.cell_xy(board.body[0]), board.cell_xy(cell)
+        return _MOVES[(c - col, r - row)]
@@ -0,0 +1,111 @@
+import random
+from array import array
+from collections import deque
+
+# Headless Snake board. The body is a deque of cells (head first), backed by an
+# occupancy grid for O(1) self-collision and a free-cell list for O(1) food
+# placement, so a tick costs the same on a huge board with a very long snake.
+
+# Direction name -> (column step, row step)
+DIRECTIONS = {
+    'RIGHT': (1, 0),
+    'LEFT': (-1, 0),
+    'UP': (0, 1),
+    'DOWN': (0, -1),
+}
+
+
+class SnakeBoard:
+    """Snake body, occupancy grid, free cells and food on a cols x rows board."""
+
+    def __init__(self, cols, rows, body, rng=None):
+        self.cols = cols
+        self.rows = rows
+        self.rng = rng or random.Random()
+        self.body = deque()
+        self.occupied = bytearray(cols * rows)
+        self.grow_pending = 0
+
+        # Free cells as an unordered list plus each cell's slot in it (-1 when occupied),
+        # so a cell is added or removed with one swap instead of a search
+        self.free = array('i', range(cols * rows))
+        self.free_slot = array('i', range(cols * rows))
+
+        for col, row in body:
+            cell = row * cols + col
+            self.body.append(cell)
+            self.occupy(cell)
+        self.food = None
+        self.place_food()
+
+    def __len__(self):
+        return len(self.body)
+
+    def cell_xy(self, cell):
+        """Return the (col, row) of a cell index."""
+        row, col = divmod(cell, self.cols)
+        return col, row
+
+    @property
+    def head(self):
+        return self.cell_xy(self.body[0])
+
+    @property
+    def tail(self):
+        return self.cell_xy(self.body[-1])
+
+    def is_free(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows and not self.occupied[row * self.cols + col]
+
+    def occupy(self, cell):
+        self.occupied[cell] = 1
+        slot = self.free_slot[cell]
+        last = self.free.pop()
+        if last != cell:
+            self.free[slot] = last
+            self.free_slot[last] = slot
+        self.free_slot[cell] = -1
+
+    def release(self, cell):
+        self.occupied[cell] = 0
+        self.free_slot[cell] = len(self.free)
+        self.free.append(cell)
+
+    def place_food(self):
+        """Drop food on a random free cell. Returns False if the board is full."""
+        if not self.free:
+            self.food = None
+            return False
+        self.food = self.free[self.rng.randrange(len(self.free))]
+        return True
+
+    def move(self, direction):
+        """Advance the snake one cell.
+
+        Returns 'dead' if it hit a wall or itself (the board is left unchanged),
+        'ate' if it reached the food, otherwise None.
+        """
+        dc, dr = DIRECTIONS[direction]
+        col, row = self.cell_xy(self.body[0])
+        col += dc
+        row += dr
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return 'dead'
+        new_head = row * self.cols + col
+
+        # The tail moves out of the way first, so chasing it is allowed
+        growing = self.grow_pending > 0
+        if self.occupied[new_head] and (growing or new_head != self.body[-1]):
+            return 'dead'
+        if growing:
+            self.grow_pending -= 1
+        else:
+            self.release(self.body.pop())
+
+        self.body.appendleft(new_head)
+        self.occupy(new_head)
+        if new_head == self.food:
+            self.grow_pending += 1
+            self.place_food()
+            return 'ate'
+        return None
@@ -0,0 +1,313 @@
+import random
+from collections import deque
+
+from kivy.app import App
+from kivy.core.window import Window
+from kivy.graphics import Color, InstructionGroup, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.widget import Widget
+
+from frame_stats import FrameStats, FrameStatsOverlay
+from lifecycle import Lifecycle
+from replay import InputRecorder, new_seed
+from snake_autopilot import Autopilot
+from snake_board import SnakeBoard
+from timestep import FixedTimestep, lerp
+
+# Snake. Loaded on demand through games.py.
+
+
+class SnakeGame(Widget):
+    # The snake moves one block per physics step; the canvas is redrawn at the
+    # display rate with the head and tail sliding between cells
+    physics_rate = 11.0
+    display_rate = 60.0
+
+    def __init__(self, seed=None, scores=None, autopilot=False, **kwargs):
+        super().__init__(**kwargs)
+        # Everything random comes from a seeded RNG, so a recorded session replays exactly
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.input_log = InputRecorder('snake', self.seed, Window.size)
+        # Clock events, window bindings and popups go through the lifecycle so they can't leak
+        self.lifecycle = Lifecycle(self)
+
+        # Initialize game variables
+        self.snake_direction = 'RIGHT'  # Initial direction
+        self.block_size = 20
+        self.wall_thickness = 20
+        self.board = self.new_board()  # Snake body, occupancy and food live on the board
+        # Attract mode: the autopilot steers and a lost game restarts at once. A toggles it
+        self.autopilot = Autopilot(self.board) if autopilot else None
+        self.input_log.recording = not autopilot  # Replays start without the autopilot; attract mode isn't kept
+
+        self.game_over = False
+
+        # Initialize score variables; finished games go to the score store (scores.ScoreStore) if there is one
+        self.scores = None if autopilot else scores
+        self.current_score = 0
+        self.high_score = scores.high_score('snake') if scores is not None else 0
+
+        # Create Labels for score display
+        self.score_label = Label(text=f"Score: {self.current_score}", font_size=20, pos=(0, Window.height - 40))
+        self.high_score_label = Label(text=f"High Score: {self.high_score}", font_size=20, pos=(Window.width - 150, Window.height - 40))
+        
+        self.add_widget(self.score_label)
+        self.add_widget(self.high_score_label)
+
+        # Retained canvas: one Rectangle per segment, moved rather than rebuilt each tick
+        self.snake_group = InstructionGroup()
+        self.segment_rects = deque()
+        self.food_group = InstructionGroup()
+        self.wall_group = InstructionGroup()
+        self.canvas.add(self.snake_group)
+        self.canvas.add(self.food_group)
+        self.canvas.add(self.wall_group)
+        self.build_walls()
+        self.build_snake()
+        self.food_group.add(Color(1, 0, 0))  # Food color
+        self.food_rect = Rectangle(pos=self.food_pos(), size=(self.block_size, self.block_size))
+        self.food_group.add(self.food_rect)
+
+        # Bind keyboard input
+        self.lifecycle.bind_window(on_key_down=self.on_key_down)
+
+        # Store initial touch position for detecting swipes
+        self.initial_touch_pos = None
+
+        # Frame timing, shown with F3
+        self.frame_stats = FrameStats('snake', self.display_rate, phases=('physics', 'render'))
+        self.stats_overlay = FrameStatsOverlay(self.frame_stats, size=(460, 140),
+                                               pos=(Window.width - 470, Window.height - 150))
+        self.add_widget(self.stats_overlay)
+        self.lifecycle.bind_window(on_key_down=self.stats_overlay.on_key_down)
+
+        # Schedule the update function
+        self.timestep = FixedTimestep(self.physics_step, self.physics_rate)
+        self.lifecycle.add_interval(self.update, 1.0 / self.display_rate)
+        self.lifecycle.start()
+
+    def on_touch_down(self, touch):
+        """Store the initial touch position when the player touches the screen."""
+        self.input_log.touch_down(touch)
+        self.initial_touch_pos = touch.pos
+
+    def on_touch_move(self, touch):
+        """Detect swipe direction based on touch movement."""
+        self.input_log.touch_move(touch)
+        if self.initial_touch_pos:
+            dx = touch.x - self.initial_touch_pos[0]  # Horizontal swipe distance
+            dy = touch.y - self.initial_touch_pos[1]  # Vertical swipe distance
+
+            # Check if the swipe is mostly horizontal or vertical
+            if abs(dx) > abs(dy):  # Horizontal swipe
+                if dx > 0 and self.snake_direction != 'LEFT':  # Swipe right
+                    self.snake_direction = 'RIGHT'
+                elif dx < 0 and self.snake_direction != 'RIGHT':  # Swipe left
+                    self.snake_direction = 'LEFT'
+            else:  # Vertical swipe
+                if dy > 0 and self.snake_direction != 'DOWN':  # Swipe up
+                    self.snake_direction = 'UP'
+                elif dy < 0 and self.snake_direction != 'UP':  # Swipe down
+                    self.snake_direction = 'DOWN'
+
+        return True  # Indicate the touch was handled
+
+    def on_touch_up(self, touch):
+        """Reset the initial touch position when the player lifts the finger."""
+        self.input_log.touch_up(touch)
+        self.initial_touch_pos = None
+
+    def on_key_down(self, window, keycode, scancode, text, modifiers):
+        """Handle keyboard input to change the direction of the snake."""
+        self.input_log.key_down(keycode, scancode)
+        if keycode == 275 and self.snake_direction != 'LEFT':  # Right arrow
+            self.snake_direction = 'RIGHT'
+        elif keycode == 276 and self.snake_direction != 'RIGHT':  # Left arrow
+            self.snake_direction = 'LEFT'
+        elif keycode == 273 and self.snake_direction != 'DOWN':  # Up arrow
+            self.snake_direction = 'UP'
+        elif keycode == 274 and self.snake_direction != 'UP':  # Down arrow
+            self.snake_direction = 'DOWN'
+        elif keycode == 97:  # A
+            self.toggle_autopilot()
+
+    def toggle_autopilot(self):
+        """Hand the snake to the autopilot, or take it back."""
+        if self.autopilot is None:
+            self.autopilot = Autopilot(self.board)
+            self.scores = None  # An assisted game doesn't count for the high scores
+        else:
+            self.autopilot = None
+
+    def new_board(self):
+        """Create a board covering the area inside the walls, with the starting snake."""
+        cols = int(Window.width - 2 * self.wall_thickness) // self.block_size
+        rows = int(Window.height - 2 * self.wall_thickness) // self.block_size
+        return SnakeBoard(cols, rows, body=[(4, 4), (3, 4), (2, 4)], rng=self.rng)
+
+    def cell_pos(self, cell):
+        """Screen position of a board cell."""
+        col, row = self.board.cell_xy(cell)
+        return (self.wall_thickness + col * self.block_size, self.wall_thickness + row * self.block_size)
+
+    def food_pos(self):
+        # A full board has no food; park it off screen
+        if self.board.food is None:
+            return (-self.block_size, -self.block_size)
+        return self.cell_pos(self.board.food)
+
+    def move_snake(self):
+        """Move the snake based on the current direction."""
+        result = self.board.move(self.snake_direction)
+        if result == 'dead':
+            self.game_over = True  # Hit a wall or itself
+        elif result == 'ate':
+            self.on_food_eaten()
+
+    def on_food_eaten(self):
+        """Score the food the snake just ate."""
+        # Increase current score
+        self.current_score += 1
+        self.score_label.text = f"Score: {self.current_score}"
+
+        # Update high score
+        if self.current_score > self.high_score:
+            self.high_score = self.current_score
+            self.high_score_label.text = f"High Score: {self.high_score}"
+
+    def update(self, dt):
+        """Update the game every frame."""
+        self.input_log.tick(dt)
+        stats = self.frame_stats
+        stats.begin_frame(dt)
+        alpha = self.timestep.advance(dt)
+        stats.mark('physics')
+        self.render(alpha)
+        stats.mark('render')
+        stats.end_frame()
+        self.stats_overlay.frame_done()
+        if self.game_over and self.autopilot is not None:
+            self.restart_game(None)
+        elif self.game_over:
+            self.lifecycle.pause()
+            if self.scores is not None:
+                self.scores.record('snake', self.current_score)
+            self.show_game_over_popup()
+
+    def physics_step(self, interval):
+        """Move the snake one block."""
+        if self.game_over:
+            return
+        self.previous_tail = self.board.body[-1]
+        if self.autopilot is not None:
+            self.snake_direction = self.autopilot.next_direction()
+        self.move_snake()
+        if not self.game_over:
+            self.draw()
+
+    def build_walls(self):
+        """Draw the four walls once; they never move."""
+        self.wall_group.clear()
+        self.wall_group.add(Color(0, 0, 1))  # Wall color
+        # Top, bottom, left and right walls
+        self.wall_group.add(Rectangle(pos=(0, Window.height - self.wall_thickness), size=(Window.width, self.wall_thickness)))
+        self.wall_group.add(Rectangle(pos=(0, 0), size=(Window.width, self.wall_thickness)))
+        self.wall_group.add(Rectangle(pos=(0, 0), size=(self.wall_thickness, Window.height)))
+        self.wall_group.add(Rectangle(pos=(Window.width - self.wall_thickness, 0), size=(self.wall_thickness, Window.height)))
+
+    def build_snake(self):
+        """Create one Rectangle per snake segment, dropping any from a previous game."""
+        self.snake_group.clear()
+        self.snake_group.add(Color(0, 1, 0))  # Snake color
+        self.segment_rects.clear()
+        # Extra rectangle that slides off the cell the tail just left
+        self.previous_tail = self.board.body[-1]
+        self.tail_rect = Rectangle(pos=self.cell_pos(self.previous_tail), size=(self.block_size, self.block_size))
+        self.snake_group.add(self.tail_rect)
+        for cell in self.board.body:
+            self.add_segment_rect(self.cell_pos(cell))
+
+    def add_segment_rect(self, pos):
+        rect = Rectangle(pos=pos, size=(self.block_size, self.block_size))
+        self.snake_group.add(rect)
+        self.segment_rects.append(rect)
+
+    def draw(self):
+        """Sync the canvas with one move of the snake.
+
+        Only the old tail rectangle is moved (to the new head), plus one new
+        rectangle when the snake grew, so the cost doesn't depend on its length.
+        """
+        body = self.board.body
+        self.segment_rects[0].pos = self.cell_pos(body[1])  # render() left the old head part way
+        rect = self.segment_rects.pop()
+        rect.pos = self.cell_pos(body[0])
+        self.segment_rects.appendleft(rect)
+        while len(self.segment_rects) < len(body):
+            self.add_segment_rect(self.cell_pos(body[len(self.segment_rects)]))
+
+        food = self.food_pos()
+        if tuple(self.food_rect.pos) != food:
+            self.food_rect.pos = food
+
+    def render(self, alpha):
+        """Place the head and the tail alpha of the way through the last move."""
+        body = self.board.body
+        (x0, y0), (x1, y1) = self.cell_pos(body[1]), self.cell_pos(body[0])
+        self.segment_rects[0].pos = (lerp(x0, x1, alpha), lerp(y0, y1, alpha))
+        (x0, y0), (x1, y1) = self.cell_pos(self.previous_tail), self.cell_pos(body[-1])
+        self.tail_rect.pos = (lerp(x0, x1, alpha), lerp(y0, y1, alpha))
+
+    def show_game_over_popup(self):
+        """Show a popup when the player loses, asking if they want to restart."""
+        self.lifecycle.popup('game_over', self.build_game_over_popup).open()
+
+    def build_game_over_popup(self):
+        layout = BoxLayout(orientation='vertical', padding=10)
+        label = Label(text="Game Over", font_size=24)
+        restart_button = Button(text="Restart", size_hint=(1, 0.2))
+        close_button = Button(text="Close", size_hint=(1, 0.2))
+
+        layout.add_widget(label)
+        layout.add_widget(restart_button)
+        layout.add_widget(close_button)
+
+        popup = Popup(title="Game Over", content=layout, size_hint=(0.6, 0.4))
+
+        # Bind buttons to restart and close functions
+        restart_button.bind(on_release=lambda *args: self.restart_game(popup))
+        close_button.bind(on_release=lambda *args: self.close_game(popup))
+        return popup
+
+    def restart_game(self, popup):
+        """Restart the game."""
+        self.input_log.restart()
+        # Reset the snake, direction, and game state
+        self.board = self.new_board()
+        self.snake_direction = 'RIGHT'
+        if self.autopilot is not None:
+            self.autopilot.reset(self.board)
+        self.current_score = 0
+        self.score_label.text = f"Score: {self.current_score}"
+        self.game_over = False
+        self.build_snake()
+        self.food_rect.pos = self.food_pos()
+        self.timestep.reset()
+
+        # Close the popup (a replay restarts without one)
+        if popup is not None:
+            popup.dismiss()
+
+        # Resume the game loop at its usual rate
+        self.lifecycle.resume()
+
+    def close_game(self, popup):
+        """Close the game and open the main menu."""
+        self.lifecycle.stop()  # Stop the game loop and release bindings and popups
+        self.input_log.save()
+        popup.dismiss()
+        App.get_running_app().show_menu()
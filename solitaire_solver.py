@@ -0,0 +1,324 @@
+import argparse
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cards import IS_RED, RANK_VALUE, SUIT_INDEX, can_stack
+
+# Headless Klondike (draw one) solver for the Solitaire model in solitairetest.py.
+#
+# The search works on a compact, hashable state tuple rather than on Card
+# objects, so states can be stored in a transposition table and shipped to
+# worker processes:
+#
+#   (tableau, down, foundation, stock, waste)
+#
+#   tableau    -- 7 tuples of card codes (see cards.py), bottom card first
+#   down       -- 7 ints, how many cards at the bottom of each pile are face down
+#   foundation -- 4 ints, the top rank (0 = empty) built up for each suit
+#   stock      -- tuple of card codes, the next card to draw is last
+#   waste      -- tuple of card codes, the playable card is last
+#
+# The solver sees the face-down cards, so "solved" means the deal can be won
+# with perfect play, which is what hints and deal filtering need. The default
+# search skips moves that rarely matter (see legal_moves), so only a complete
+# search can call a deal unsolvable.
+
+Move = namedtuple('Move', 'kind src dst count')
+SolveResult = namedtuple('SolveResult', 'status moves nodes')
+
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+UNKNOWN = 'unknown'
+
+
+def face_down_count(pile):
+    """How many cards at the bottom of a game pile the solver treats as face down.
+
+    That is every card up to the last face-down one: a face-up card under a
+    face-down card can't move until it is uncovered anyway. A face-down top
+    card doesn't count, since turning it over is free (the solver turns each
+    uncovered card over itself).
+    """
+    count = 0
+    for i, card in enumerate(pile[:-1]):
+        if not card.is_face_up:
+            count = i + 1
+    return count
+
+
+def from_game(game):
+    """Build a solver state from a Solitaire instance."""
+    tableau = tuple(tuple(card.code for card in pile) for pile in game.tableau)
+    down = tuple(face_down_count(pile) for pile in game.tableau)
+    foundation = [0, 0, 0, 0]
+    for pile in game.foundation:
+        if pile:
+            top = pile[-1].code
+            foundation[SUIT_INDEX[top]] = RANK_VALUE[top]
+    stock = tuple(card.code for card in game.deck.cards)
+    waste = tuple(card.code for card in game.waste_pile)
+    return tableau, down, tuple(foundation), stock, waste
+
+
+def deal_state(rng=None):
+    """Deal a random game the same way Solitaire.deal_initial_tableau does."""
+    cards = list(range(52))
+    (rng or random).shuffle(cards)
+    tableau = [[] for _ in range(7)]
+    for i in range(7):
+        for j in range(i, 7):
+            tableau[j].append(cards.pop())
+    return tuple(map(tuple, tableau)), tuple(range(7)), (0, 0, 0, 0), tuple(cards), ()
+
+
+def is_won(state):
+    return state[2] == (13, 13, 13, 13)
+
+
+def canonical_key(state):
+    """Hash key that treats states differing only in tableau pile order as equal."""
+    tableau, down, foundation, stock, waste = state
+    return foundation, stock, waste, tuple(sorted(zip(down, tableau)))
+
+
+def to_foundation_ok(card, foundation):
+    return foundation[SUIT_INDEX[card]] + 1 == RANK_VALUE[card]
+
+
+def safe_to_foundation(card, foundation):
+    """A foundation move no winning line ever needs to undo."""
+    rank = RANK_VALUE[card]
+    if rank <= 2:
+        return True
+    opposite = (2, 3) if IS_RED[card] else (0, 1)
+    return all(foundation[s] >= rank - 1 for s in opposite)
+
+
+def legal_moves(state, complete=False):
+    """Legal moves in search order.
+
+    The list is pruned unless complete is set: a safe foundation move is
+    returned on its own, and part of a run only moves if that frees a card for
+    the foundation. A search over pruned moves can find wins but can't prove
+    there are none.
+    """
+    tableau, down, foundation, stock, waste = state
+    to_foundation = []
+    reveals = []
+    others = []
+
+    if waste and to_foundation_ok(waste[-1], foundation):
+        move = Move('waste_to_foundation', None, None, 1)
+        if not complete and safe_to_foundation(waste[-1], foundation):
+            return [move]
+        to_foundation.append(move)
+
+    for src, pile in enumerate(tableau):
+        if not pile:
+            continue
+        top = pile[-1]
+        if to_foundation_ok(top, foundation):
+            move = Move('tableau_to_foundation', src, None, 1)
+            if not complete and safe_to_foundation(top, foundation):
+                return [move]
+            to_foundation.append(move)
+
+        # Runs of face-up cards that can move as a unit onto another pile
+        for start in range(down[src], len(pile)):
+            base = pile[start]
+            count = len(pile) - start
+            whole_run = start == down[src]
+            # A partial run is mostly only worth moving if it frees a card for the foundation
+            if not (whole_run or complete or to_foundation_ok(pile[start - 1], foundation)):
+                continue
+            for dst, target in enumerate(tableau):
+                if dst == src:
+                    continue
+                if target:
+                    if not can_stack(base, target[-1]):
+                        continue
+                elif RANK_VALUE[base] != 13 or start == 0:
+                    continue  # Only kings go to empty piles, and not from the bottom of a pile
+                move = Move('tableau_to_tableau', src, dst, count)
+                (reveals if whole_run and start > 0 else others).append(move)
+                if not target:
+                    break  # Every empty pile is equivalent
+
+    if waste:
+        card = waste[-1]
+        for dst, target in enumerate(tableau):
+            if (target and can_stack(card, target[-1])) or (not target and RANK_VALUE[card] == 13):
+                others.append(Move('waste_to_tableau', None, dst, 1))
+
+    for suit, rank in enumerate(foundation):
+        if rank >= 3:  # Nothing but an ace could go on a two, and aces go to the foundations
+            card = suit * 13 + rank - 1
+            for dst, target in enumerate(tableau):
+                if target and can_stack(card, target[-1]):
+                    others.append(Move('foundation_to_tableau', suit, dst, 1))
+
+    if stock:
+        others.append(Move('draw', None, None, 1))
+    elif waste:
+        others.append(Move('recycle', None, None, len(waste)))
+    return to_foundation + reveals + others
+
+
+def _take(tableau, down, src, count):
+    """Remove count cards from the top of pile src, flipping the next card if needed."""
+    pile = tableau[src]
+    moved = pile[len(pile) - count:]
+    rest = pile[:len(pile) - count]
+    tableau[src] = rest
+    if down[src] and len(rest) == down[src]:
+        down[src] -= 1
+    return moved
+
+
+def apply_move(state, move):
+    """Return the state after move; the input state is not modified."""
+    tableau, down, foundation, stock, waste = state
+    tableau = list(tableau)
+    down = list(down)
+    foundation = list(foundation)
+    kind = move.kind
+
+    if kind == 'draw':
+        waste = waste + stock[-1:]
+        stock = stock[:-1]
+    elif kind == 'recycle':
+        stock = waste[::-1]
+        waste = ()
+    elif kind == 'waste_to_foundation':
+        card = waste[-1]
+        waste = waste[:-1]
+        foundation[SUIT_INDEX[card]] += 1
+    elif kind == 'waste_to_tableau':
+        tableau[move.dst] = tableau[move.dst] + waste[-1:]
+        waste = waste[:-1]
+    elif kind == 'tableau_to_foundation':
+        card = _take(tableau, down, move.src, 1)[0]
+        foundation[SUIT_INDEX[card]] += 1
+    elif kind == 'tableau_to_tableau':
+        tableau[move.dst] = tableau[move.dst] + _take(tableau, down, move.src, move.count)
+    elif kind == 'foundation_to_tableau':
+        suit = move.src
+        tableau[move.dst] = tableau[move.dst] + (suit * 13 + foundation[suit] - 1,)
+        foundation[suit] -= 1
+    else:
+        raise ValueError(f"Unknown move kind: {kind}")
+    return tuple(tableau), tuple(down), tuple(foundation), stock, waste
+
+
+def solve(state, max_nodes=200000, time_limit=5.0, complete=False):
+    """Depth-first search for a winning line.
+
+    Returns SolveResult(status, moves, nodes). status is 'solved' (moves is the
+    winning sequence), 'unsolvable' (the whole tree of complete moves was
+    searched) or 'unknown' (the budget ran out first, or only pruned moves
+    were searched; moves is None). See legal_moves for complete.
+    """
+    if is_won(state):
+        return SolveResult(SOLVED, [], 0)
+    deadline = time.monotonic() + time_limit
+    seen = {canonical_key(state)}
+    stack = [iter(legal_moves(state, complete))]
+    states = [state]
+    path = []
+    nodes = 0
+    while stack:
+        for move in stack[-1]:
+            child = apply_move(states[-1], move)
+            key = canonical_key(child)
+            if key in seen:
+                continue
+            seen.add(key)
+            nodes += 1
+            path.append(move)
+            if is_won(child):
+                return SolveResult(SOLVED, path, nodes)
+            if nodes >= max_nodes or (nodes % 1024 == 0 and time.monotonic() > deadline):
+                return SolveResult(UNKNOWN, None, nodes)
+            states.append(child)
+            stack.append(iter(legal_moves(child, complete)))
+            break
+        else:
+            stack.pop()
+            states.pop()
+            if path:
+                path.pop()
+    return SolveResult(UNSOLVABLE if complete else UNKNOWN, None, nodes)
+
+
+def solve_parallel(state, workers=None, max_nodes=200000, time_limit=5.0, complete=False):
+    """Search each first move in its own process and return the first win found."""
+    moves = legal_moves(state, complete)
+    if is_won(state) or not moves:
+        return solve(state, max_nodes, time_limit, complete)
+
+    pool = ProcessPoolExecutor(workers)
+    try:
+        pending = {pool.submit(solve, apply_move(state, move), max_nodes, time_limit, complete): move
+                   for move in moves}
+        status = UNSOLVABLE
+        nodes = 0
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                move = pending.pop(future)
+                result = future.result()
+                nodes += result.nodes
+                if result.status == SOLVED:
+                    return SolveResult(SOLVED, [move] + result.moves, nodes)
+                if result.status == UNKNOWN:
+                    status = UNKNOWN
+        return SolveResult(status, None, nodes)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _solve_args(args):
+    return solve(*args)
+
+
+def solve_many(states, workers=None, max_nodes=200000, time_limit=5.0, complete=False):
+    """Solve many deals across a process pool; results come back in input order."""
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_solve_args, [(state, max_nodes, time_limit, complete) for state in states]))
+
+
+def hint(game, max_nodes=50000, time_limit=1.0):
+    """Return the first move of a winning line for a Solitaire game, or None."""
+    result = solve(from_game(game), max_nodes, time_limit)
+    if result.status == SOLVED and result.moves:
+        return result.moves[0]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve random Klondike deals.")
+    parser.add_argument('--deals', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-nodes', type=int, default=200000)
+    parser.add_argument('--time-limit', type=float, default=5.0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--complete', action='store_true',
+                        help="search every legal move, so deals can be proven unsolvable (slower)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    states = [deal_state(rng) for _ in range(args.deals)]
+    start = time.perf_counter()
+    results = solve_many(states, args.workers, args.max_nodes, args.time_limit, args.complete)
+    elapsed = time.perf_counter() - start
+
+    counts = {SOLVED: 0, UNSOLVABLE: 0, UNKNOWN: 0}
+    for result in results:
+        counts[result.status] += 1
+    print(f"{args.deals} deals in {elapsed:.1f}s: " + ", ".join(f"{n} {status}" for status, n in counts.items()))
+
+
+if __name__ == '__main__':
+    main()
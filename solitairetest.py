@@ -1,50 +1,12 @@
-import random
 from kivy.app import App
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle, Line
+from kivy.graphics import (ClearBuffers, ClearColor, Color, Fbo, InstructionGroup, Line, PopMatrix, PushMatrix,
+                           Rectangle, Translate)
+from kivy.core.text import Label as CoreLabel
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.core.window import Window
-
-class Card:
-    def __init__(self, rank, suit):
-        self.rank = rank
-        self.suit = suit
-        self.is_face_up = False
-
-    def flip(self):
-        self.is_face_up = not self.is_face_up
-
-    def is_red(self):
-        return self.suit in ['H', 'D']
-
-    def is_black(self):
-        return self.suit in ['C', 'S']
-
-    def rank_value(self):
-        if self.rank == 'A':
-            return 1
-        elif self.rank == 'J':
-            return 11
-        elif self.rank == 'Q':
-            return 12
-        elif self.rank == 'K':
-            return 13
-        return int(self.rank)
-
-class Deck:
-    suits = ['H', 'D', 'C', 'S']
-    ranks = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
-
-    def __init__(self):
-        self.cards = [Card(rank, suit) for suit in self.suits for rank in self.ranks]
-        self.shuffle()
-
-    def shuffle(self):
-        random.shuffle(self.cards)
-
-    def deal_card(self):
-        return self.cards.pop() if self.cards else None
+from cards import ACES, KINGS, STACKS_ON, Deck, IS_RED, RANK_NAME, RANK_VALUE, SUIT_INDEX, SUIT_NAME, can_stack, pack_piles
 
 class Solitaire:
     def __init__(self):
@@ -55,6 +17,16 @@ class Solitaire:
         self.moves = []
         self.score = 0
         self.undo_limit = 3  # Limit the number of undo moves
+
+        # Legal-move index, updated by every move rather than rebuilt from the board:
+        # for each card code, the tableau piles and the foundation it could go on now
+        self.tableau_wants = [set() for _ in range(52)]
+        self.foundation_wants = {}
+        self.top_pile = {}  # Face-up top card code -> its tableau pile
+        self.pile_top = [None] * 7  # The other way round: each pile's face-up top code, or None
+        self.pile_wants = [()] * 7  # Codes each tableau pile is listed under in tableau_wants
+        self.foundation_rank = [0] * 4  # Rank built up so far, by suit
+        self.face_down = 0  # Face-down cards left in the tableau
         self.deal_initial_tableau()
 
     def deal_initial_tableau(self):
@@ -65,10 +37,120 @@ class Solitaire:
                     self.tableau[j].append(card)
                     if j == i:
                         card.flip()
+                    else:
+                        self.face_down += 1
+        for i in range(7):
+            self.index_pile(i)
+        self.index_foundations()
+
+    def index_pile(self, i):
+        """Update the index after tableau pile i changed."""
+        for code in self.pile_wants[i]:
+            self.tableau_wants[code].discard(i)
+        pile = self.tableau[i]
+        old = self.pile_top[i]
+        if old is not None and self.top_pile[old] == i:  # The card may be another pile's top by now
+            del self.top_pile[old]
+        self.pile_top[i] = None
+        if not pile:
+            wants = KINGS  # Only kings can start an empty tableau pile
+        elif pile[-1].is_face_up:
+            wants = STACKS_ON[pile[-1].code]
+            self.top_pile[pile[-1].code] = i
+            self.pile_top[i] = pile[-1].code
+        else:
+            wants = ()
+        for code in wants:
+            self.tableau_wants[code].add(i)
+        self.pile_wants[i] = wants
+
+    def index_foundations(self):
+        """Update the index after a foundation changed; an ace goes on the first empty foundation."""
+        self.foundation_wants = {}
+        empty = None
+        for index, pile in enumerate(self.foundation):
+            if not pile:
+                if empty is None:
+                    empty = index
+                continue
+            top = pile[-1].code
+            self.foundation_rank[SUIT_INDEX[top]] = RANK_VALUE[top]
+            if RANK_VALUE[top] < 13:
+                self.foundation_wants[top + 1] = index
+        if empty is not None:
+            for code in ACES:
+                if self.foundation_rank[SUIT_INDEX[code]] == 0:
+                    self.foundation_wants[code] = empty
+
+    def tableau_targets(self, card):
+        """Tableau piles the card (and any cards on it) could move to."""
+        return self.tableau_wants[card.code]
+
+    def foundation_target(self, card):
+        """Foundation the card could move to if it is the top of its pile, or None."""
+        if card.code in self.top_pile:
+            return self.foundation_wants.get(card.code)
+        return None
+
+    def flip_card(self, card, pile_index):
+        """Turn a tableau card over."""
+        card.flip()
+        self.face_down += -1 if card.is_face_up else 1
+        self.index_pile(pile_index)
+
+    def move_run(self, source_index, depth, target_index):
+        """Move the cards of a tableau pile from depth up onto another pile; returns the cards moved."""
+        source = self.tableau[source_index]
+        cards = source[depth:]
+        del source[depth:]
+        self.tableau[target_index].extend(cards)
+        self.moves.append((source_index, target_index, cards))
+        self.score += 1
+        self.index_pile(source_index)
+        self.index_pile(target_index)
+        return cards
+
+    def is_safe_for_foundation(self, code):
+        """Whether no tableau card could still need to go on this one (the other colour is built up to just below it)."""
+        rank = RANK_VALUE[code]
+        return rank <= 2 or all(self.foundation_rank[suit] >= rank - 1
+                                for suit in range(4) if IS_RED[suit * 13] != IS_RED[code])
+
+    def auto_move_to_foundation(self, safe_only=True):
+        """Move tableau tops to the foundations while any can go, only safe ones unless safe_only is False.
+
+        Returns the moves made as (card, tableau pile, foundation) tuples.
+        """
+        done = []
+        while True:
+            # At most four cards are wanted by the foundations; see if one of them is a top
+            for code, foundation_index in self.foundation_wants.items():
+                pile_index = self.top_pile.get(code)
+                if pile_index is not None and (not safe_only or self.is_safe_for_foundation(code)):
+                    break
+            else:
+                return done
+            card = self.tableau[pile_index][-1]
+            self.move_to_foundation(card, foundation_index)
+            done.append((card, pile_index, foundation_index))
+
+    def can_auto_complete(self):
+        """Whether the game is as good as won: no stock or waste left and every tableau card face up."""
+        return not self.deck.cards and not self.waste_pile and self.face_down == 0
+
+    def auto_complete(self):
+        """Play every card to the foundations once can_auto_complete(); returns the moves made."""
+        if not self.can_auto_complete():
+            return []
+        return self.auto_move_to_foundation(safe_only=False)
 
     def check_win(self):
         return all(len(foundation) == 13 for foundation in self.foundation)
 
+    def state_key(self):
+        """Bytes that identify the whole layout, for hashing and comparing states."""
+        return pack_piles(self.tableau + self.foundation + [self.waste_pile, self.deck.cards])
+
     def undo_move(self):
         if self.moves and len(self.moves) < self.undo_limit:
             last_move = self.moves.pop()
@@ -77,164 +159,371 @@ class Solitaire:
             for card in cards:
                 self.tableau[target_index].remove(card)
             self.score -= 1
+            self.index_pile(source_index)
+            self.index_pile(target_index)
 
     def can_move_to_foundation(self, card, foundation_pile):
         if not foundation_pile:
-            return card.rank == 'A'  # Only Aces can start a foundation pile
-        top_card = foundation_pile[-1]
-        return card.suit == top_card.suit and card.rank_value() == top_card.rank_value() + 1
+            return RANK_VALUE[card.code] == 1  # Only Aces can start a foundation pile
+        top = foundation_pile[-1].code
+        return SUIT_INDEX[card.code] == SUIT_INDEX[top] and RANK_VALUE[card.code] == RANK_VALUE[top] + 1
 
     def move_to_foundation(self, card, foundation_index):
         if self.can_move_to_foundation(card, self.foundation[foundation_index]):
+            pile_index = self.top_pile.get(card.code)
+            if pile_index is not None:
+                self.tableau[pile_index].pop()
+                self.index_pile(pile_index)
             self.foundation[foundation_index].append(card)
+            self.index_foundations()
+            self.moves.clear()  # Undo only replays tableau moves, which this may have cut under
             self.score += 10  # Add points for moving to foundation
 
+class CardAtlas:
+    """All 52 card faces plus the card back, rendered once into a single texture.
+
+    Cards are drawn as textured quads using regions of the atlas, so no card
+    ever lays out a Label or rebuilds its canvas.
+    """
+    card_size = (100, 150)
+    back_index = 52
+
+    def __init__(self):
+        w, h = self.card_size
+        self.fbo = Fbo(size=(13 * w, 5 * h))
+        with self.fbo:
+            ClearColor(0, 0, 0, 0)
+            ClearBuffers()
+            for index in range(53):
+                x, y = self.cell_origin(index)
+                if index == self.back_index:
+                    Color(0, 0, 0.5, 1)  # Dark blue for face-down cards
+                    Rectangle(pos=(x, y), size=(w, h))
+                else:
+                    Color(1, 1, 1, 1)
+                    Rectangle(pos=(x, y), size=(w, h))
+                    label = CoreLabel(text=f"{RANK_NAME[index]}{SUIT_NAME[index]}", font_size=h * 0.15,
+                                      color=(1, 0, 0, 1) if IS_RED[index] else (0, 0, 0, 1))
+                    label.refresh()
+                    Color(1, 1, 1, 1)
+                    Rectangle(texture=label.texture, size=label.texture.size,
+                              pos=(x + 8, y + h - label.texture.height - 8))
+                Color(0, 0, 0, 1)
+                Line(rectangle=(x + 1, y + 1, w - 2, h - 2), width=2)
+        self.fbo.draw()
+        self.texture = self.fbo.texture
+        self.regions = [self.texture.get_region(*self.cell_origin(index), w, h) for index in range(53)]
+
+    def cell_origin(self, index):
+        w, h = self.card_size
+        row, col = divmod(index, 13)
+        return col * w, row * h
+
+    def texture_for(self, card):
+        return self.regions[card.code if card.is_face_up else self.back_index]
+
+
+_card_atlas = None
+
+
+def get_card_atlas():
+    """Shared CardAtlas, built the first time a card is drawn."""
+    global _card_atlas
+    if _card_atlas is None:
+        _card_atlas = CardAtlas()
+    return _card_atlas
+
+
 class CardWidget(Widget):
-    def __init__(self, card, tableau_index, game, **kwargs):
+    def __init__(self, card, tableau_index, game, depth=0, **kwargs):
         super().__init__(**kwargs)
         self.card = card
         self.tableau_index = tableau_index
+        self.foundation_index = None  # Set instead of tableau_index once the card is on a foundation
+        self.depth = depth  # Position of the card within its pile, kept up to date on moves
         self.game = game
         self.size_hint = (None, None)
         self.is_selected = False
-        self.bind(pos=self.update_position, size=self.update_position)
-        self.draw_card()
+
+        # One textured quad, created once and only moved or re-textured afterwards
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self.face = Rectangle(pos=self.pos, size=self.size, texture=get_card_atlas().texture_for(card))
+        self.bind(pos=self.sync_face, size=self.sync_face)
 
         self.dragging = False
-        self.original_pos = None
+        self.drag_offset = (0, 0)  # How far the card was dragged, set when it is let go
+        self.drop_target = None  # ('tableau' or 'foundation', pile index) chosen by is_valid_drop
 
     def on_touch_down(self, touch):
+        if self.foundation_index is not None:
+            return False  # Cards on the foundations stay there
         if self.collide_point(touch.x, touch.y):
             if self.card.is_face_up:
                 self.dragging = True
-                self.original_pos = self.pos
                 self.is_selected = True  # Mark this card as selected
+                self.parent.show_targets(self)
+                self.parent.begin_drag(self, touch)
                 return True
             else:
-                self.card.flip()  # Flip the card if it's face down
-                self.update_position()
-            return True
-        return False
-
-    def on_touch_move(self, touch):
-        if self.dragging:
-            self.pos = (touch.x - self.width / 2, touch.y - self.height / 2)
+                self.game.flip_card(self.card, self.tableau_index)  # Flip the card if it's face down
+                self.refresh_face()
+                self.parent.after_move()
             return True
         return False
 
     def on_touch_up(self, touch):
         if self.dragging:
             self.dragging = False
+            self.parent.clear_targets()
+            source_index = self.tableau_index
+            # The cards never left their slots while dragged, so an invalid drop needs no undoing
             if self.is_valid_drop():
-                self.snap_to_new_position()
-            else:
-                # Return card to its original position if drop is invalid
-                self.pos = self.original_pos
+                self.snap_to_new_position(source_index)
             self.is_selected = False  # Reset selection state
             return True
         return False
 
     def is_valid_drop(self):
-        """Check if the card can be dropped on a valid tableau stack."""
-        for pile_index, pile in enumerate(self.game.tableau):
-            if pile and pile[-1].is_face_up:
-                top_card = pile[-1]
-                if self.can_place_on(top_card):
-                    self.tableau_index = pile_index
-                    return True
-            elif not pile and self.card.rank == 'K':  # Only kings can start an empty tableau
-                self.tableau_index = pile_index
-                return True
-        return False
+        """Pick the legal target nearest the card as drop_target, if the card was dropped over one."""
+        width, height = self.size
+        x, y = self.x + self.drag_offset[0], self.y + self.drag_offset[1]
+        targets = [target for target in self.parent.target_slots(self)
+                   if abs(target[2][0] - x) < width and abs(target[2][1] - y) < height]
+        if not targets:
+            return False
+        self.drop_target = min(targets, key=lambda target: (target[2][0] - x) ** 2 + (target[2][1] - y) ** 2)[:2]
+        return True
 
     def can_place_on(self, target_card):
         """Check if the current card can be placed on the target card."""
-        return ((self.card.is_red() and target_card.is_black()) or
-                (self.card.is_black() and target_card.is_red())) and \
-            (self.card.rank_value() == target_card.rank_value() - 1)
-
-    def snap_to_new_position(self):
-        """Snap the card to its new tableau stack."""
-        self.game.tableau[self.tableau_index].append(self.card)
-        self.game.score += 1
-        self.update_position()  # Update position after moving
-        if self.game.check_win():
-            self.show_win_popup()
-
-    def update_position(self, *args):
-        if self.tableau_index is not None and self.parent:
-            y_offset = 0
-            for card in self.game.tableau[self.tableau_index]:
-                if card == self.card:
-                    self.pos = (self.x, self.parent.height - (y_offset * self.height * 0.25 + self.height))
-                    break
-                y_offset += 1
+        return can_stack(self.card.code, target_card.code)
+
+    def snap_to_new_position(self, source_index):
+        """Move the card, and the cards on it, to drop_target."""
+        kind, index = self.drop_target
+        if kind == 'foundation':
+            self.game.move_to_foundation(self.card, index)
+            self.parent.place_on_foundation(self.card, index)
         else:
-            self.pos = self.pos
-
-        self.clear_widgets()
-        self.canvas.clear()
-        self.draw_card()
-
-    def draw_card(self):
-        with self.canvas:
-            if self.card.is_face_up:
-                Color(1, 1, 1, 1)
-                Rectangle(pos=self.pos, size=self.size)
-                Color(0, 0, 0, 1)
-                Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
-
-                rank_suit = f"{self.card.rank}{self.card.suit}"
-                label = Label(text=rank_suit, color=(1, 0, 0, 1) if self.card.is_red() else (0, 0, 0, 1))
-                label.pos = (self.x - 30, self.y + self.height - 65)  # Move label higher
-                label.font_size = self.height * 0.15
-                self.add_widget(label)
-            else:
-                Color(0, 0, 0.5, 1)  # Lighter blue for face-down cards
-                Rectangle(pos=self.pos, size=self.size)
-                Color(0, 0, 0, 1)
-                Line(rectangle=(self.x, self.y, self.width, self.height), width=2)
+            cards = self.game.move_run(source_index, self.depth, index)
+            self.parent.place_run(cards, index)
+        self.parent.after_move()
 
-    def show_win_popup(self):
-        popup = Popup(title='Congratulations!', content=Label(text='You won the game!'), size_hint=(0.6, 0.6))
-        popup.open()
+    def update_position(self, *args):
+        """Move the card to its cached slot in the parent's layout."""
+        if not self.parent:
+            return
+        if self.foundation_index is not None:
+            self.pos = self.parent.foundation_pos(self.foundation_index)
+        elif self.tableau_index is not None:
+            self.pos = self.parent.slot_pos(self.tableau_index, self.depth)
+
+    def sync_face(self, *args):
+        self.face.pos = self.pos
+        self.face.size = self.size
+
+    def refresh_face(self):
+        """Show the face or the back, whichever matches the card."""
+        self.face.texture = get_card_atlas().texture_for(self.card)
 
 class SolitaireWidget(Widget):
     def __init__(self, **kwargs):
+        # Slot geometry, recomputed only when the widget is resized (on_size can fire during Widget init)
+        self.card_widgets = []
+        self.widget_of = {}  # Card code -> its CardWidget
+        self.dragged = None  # The CardWidget being dragged
+        self.pile_x = [0] * 7
+        self.card_size = (0, 0)
+        self.card_height_offset = 0
+        self.tableau_top = 0  # The tableau hangs from here, below the foundation row
+        self.score_label = Label(text='Score: 0', size_hint=(None, None), size=(200, 50))
+
         super().__init__(**kwargs)
         self.game = Solitaire()
-        self.bind(size=self.on_size)
+
+        # Outlines on the legal targets of the card being dragged, drawn over the cards
+        self.highlights = InstructionGroup()
+        self.canvas.after.add(self.highlights)
+
+        # A dragged run of cards is moved into this layer, and a drag frame only moves its Translate
+        self.drag_layer = Widget()
+        with self.drag_layer.canvas.before:
+            PushMatrix()
+            self.drag_translate = Translate(0, 0)
+        with self.drag_layer.canvas.after:
+            PopMatrix()
+        self.drag_start = (0, 0)
 
         # Initialize score label
-        self.score_label = Label(text=f'Score: {self.game.score}', size_hint=(None, None), size=(200, 50))
         self.score_label.pos = (10, self.height - 50)
-        self.add_widget(self.score_label)
 
         self.setup_tableau()
 
     def on_size(self, *args):
-        self.setup_tableau()
+        self.layout_cards()
         self.score_label.pos = (10, self.height - 50)
 
+    def slot_pos(self, pile_index, depth):
+        """Screen position of the card at depth in a tableau pile."""
+        return (self.pile_x[pile_index], self.tableau_top - (depth + 1) * self.card_height_offset - self.card_size[1])
+
+    def card_at(self, x, y):
+        """The tableau card drawn on top at (x, y), or None.
+
+        Worked out from the slot geometry: the column gives the pile and the
+        height the depth, so a touch never has to be offered to every card.
+        """
+        width, height = self.card_size
+        if not self.card_height_offset:
+            return None
+        pile_index = round(x / (self.width / 8)) - 1  # Piles are centred on the eighths of the width
+        if not (0 <= pile_index < 7 and self.pile_x[pile_index] <= x <= self.pile_x[pile_index] + width):
+            return None
+        pile = self.game.tableau[pile_index]
+        # The deepest card whose top edge is above y, if its bottom edge is below y
+        depth = min(len(pile) - 1, int((self.tableau_top - y) // self.card_height_offset) - 1)
+        if depth < 0 or y < self.slot_pos(pile_index, depth)[1]:
+            return None
+        return self.widget_of[pile[depth].code]
+
+    def on_touch_down(self, touch):
+        card_widget = self.card_at(touch.x, touch.y)
+        return card_widget is not None and card_widget.on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        if self.dragged is None:
+            return False
+        self.drag_translate.xy = (touch.x - self.drag_start[0], touch.y - self.drag_start[1])
+        return True
+
+    def on_touch_up(self, touch):
+        if self.dragged is None:
+            return False
+        card_widget = self.dragged
+        self.end_drag()
+        return card_widget.on_touch_up(touch)
+
+    def begin_drag(self, card_widget, touch):
+        """Lift the card and every card on it into the drag layer."""
+        self.dragged = card_widget
+        self.drag_start = touch.pos
+        self.drag_translate.xy = (0, 0)
+        self.raise_widget(self.drag_layer)
+        for card in self.game.tableau[card_widget.tableau_index][card_widget.depth:]:
+            run_widget = self.widget_of[card.code]
+            self.remove_widget(run_widget)
+            self.drag_layer.add_widget(run_widget)
+
+    def end_drag(self):
+        """Put the dragged cards back on the table, still in their slots, noting how far they went."""
+        card_widget, self.dragged = self.dragged, None
+        card_widget.drag_offset = tuple(self.drag_translate.xy)
+        self.drag_translate.xy = (0, 0)
+        for run_widget in self.drag_layer.children[::-1]:  # Bottom card first, so each lands on top
+            self.drag_layer.remove_widget(run_widget)
+            self.add_widget(run_widget)
+
+    def foundation_pos(self, foundation_index):
+        """Screen position of a foundation; they sit in a row along the top, over the last four piles."""
+        return (self.pile_x[3 + foundation_index], self.height - self.card_height_offset - self.card_size[1])
+
+    def target_slots(self, card_widget):
+        """Legal targets of a card as (kind, index, slot position), read from the game's move index."""
+        game = self.game
+        targets = []
+        for pile_index in game.tableau_targets(card_widget.card):
+            pile = game.tableau[pile_index]
+            targets.append(('tableau', pile_index, self.slot_pos(pile_index, max(len(pile) - 1, 0))))
+        foundation_index = game.foundation_target(card_widget.card)
+        if foundation_index is not None:
+            targets.append(('foundation', foundation_index, self.foundation_pos(foundation_index)))
+        return targets
+
+    def show_targets(self, card_widget):
+        """Outline every pile the card could be dropped on."""
+        self.highlights.clear()
+        self.highlights.add(Color(1, 0.85, 0, 1))
+        width, height = self.card_size
+        for _, _, (x, y) in self.target_slots(card_widget):
+            self.highlights.add(Line(rectangle=(x - 2, y - 2, width + 4, height + 4), width=2))
+
+    def clear_targets(self):
+        self.highlights.clear()
+
+    def raise_widget(self, card_widget):
+        """Draw the card above the others."""
+        self.remove_widget(card_widget)
+        self.add_widget(card_widget)
+
+    def place_run(self, cards, pile_index):
+        """Move the widgets of cards just put at the top of a tableau pile into their slots."""
+        depth = len(self.game.tableau[pile_index]) - len(cards)
+        for offset, card in enumerate(cards):
+            card_widget = self.widget_of[card.code]
+            card_widget.tableau_index = pile_index
+            card_widget.depth = depth + offset
+            self.raise_widget(card_widget)
+            card_widget.update_position()
+
+    def place_on_foundation(self, card, foundation_index):
+        card_widget = self.widget_of[card.code]
+        card_widget.tableau_index = None
+        card_widget.foundation_index = foundation_index
+        card_widget.depth = len(self.game.foundation[foundation_index]) - 1
+        self.raise_widget(card_widget)
+        card_widget.update_position()
+
+    def after_move(self):
+        """Play the moves that follow on their own, then update the score and check for a win."""
+        game = self.game
+        for card, _, foundation_index in game.auto_move_to_foundation() + game.auto_complete():
+            self.place_on_foundation(card, foundation_index)
+        self.score_label.text = f'Score: {game.score}'
+        if game.check_win():
+            self.show_win_popup()
+
+    def show_win_popup(self):
+        popup = Popup(title='Congratulations!', content=Label(text='You won the game!'), size_hint=(0.6, 0.6))
+        popup.open()
+
     def setup_tableau(self):
+        """Create one CardWidget per dealt card; they are reused for the rest of the game."""
         self.clear_widgets()
-        num_piles = 7
-        pile_width = self.width / (num_piles + 1)
-        card_width = pile_width * 0.8
-        card_height = card_width * 1.5
-        card_height_offset = card_height * 0.25
-
+        self.card_widgets = []
+        self.widget_of = {}
         for i, pile in enumerate(self.game.tableau):
-            x = (i + 1) * pile_width - card_width / 2
             for j, card in enumerate(pile):
-                y = self.height - (j + 1) * card_height_offset - card_height
-                card_widget = CardWidget(card, i, self.game, size=(card_width, card_height))
-                card_widget.pos = (x, y)
+                card_widget = CardWidget(card, i, self.game, depth=j)
+                self.card_widgets.append(card_widget)
+                self.widget_of[card.code] = card_widget
                 self.add_widget(card_widget)
 
         # Redraw the score label after adding all cards
         self.add_widget(self.score_label)
+        self.add_widget(self.drag_layer)
         self.score_label.text = f'Score: {self.game.score}'
+        self.layout_cards()
+        self.after_move()  # An ace may have been dealt face up
+
+    def layout_cards(self):
+        """Recompute the slot geometry and move every card widget into place."""
+        if self.dragged is not None:
+            self.dragged.dragging = False  # Resizing drops the cards being dragged where they were
+            self.end_drag()
+            self.clear_targets()
+        num_piles = 7
+        pile_width = self.width / (num_piles + 1)
+        card_width = pile_width * 0.8
+        card_height = card_width * 1.5
+        self.card_size = (card_width, card_height)
+        self.card_height_offset = card_height * 0.25
+        self.tableau_top = self.height - self.card_height_offset - card_height
+        self.pile_x = [(i + 1) * pile_width - card_width / 2 for i in range(num_piles)]
+
+        for card_widget in self.card_widgets:
+            card_widget.size = self.card_size
+            card_widget.update_position()
 
 class SolitaireApp(App):
     def build(self):
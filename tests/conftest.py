@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Run the tests headless, the same way benchmark.py runs the games, and from
+# any directory: the modules under test live at the top of the repository.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('KIVY_NO_ARGS', '1')
+os.environ.setdefault('SDL_VIDEODRIVER', 'offscreen')
+os.environ.setdefault('KIVY_GL_BACKEND', 'mock')
+os.environ.setdefault('KIVY_LOG_MODE', 'PYTHON')
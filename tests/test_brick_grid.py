@@ -0,0 +1,59 @@
+import pytest
+
+from brick_grid import BrickGrid
+from levelpack import cell
+
+
+def grid(cells=None):
+    """A 4 x 5 wall of 10 x 5 bricks whose top edge is at y = 100."""
+    return BrickGrid(4, 5, 10, 5, 100, cells=cells)
+
+
+@pytest.mark.parametrize('box, expected', [
+    ((12, 91, 5, 3), [(1, 1)]),                      # Inside one brick
+    ((10, 90, 10, 5), [(1, 1)]),                     # Exactly on that brick's edges
+    ((9, 90, 12, 5), [(1, 0), (1, 1), (1, 2)]),      # Just past them on either side
+    ((-50, 70, 80, 200), [(row, col) for row in range(4) for col in range(3)]),  # Past the left, top and bottom
+    ((45, 95, 100, 2), [(0, 4)]),                    # Past the right
+    ((50, 80, 10, 10), []),                          # Beside the wall
+    ((0, 100, 50, 10), []),                          # Resting on top of it
+])
+def test_cells_in_box(box, expected):
+    assert sorted(grid().cells_in_box(*box)) == expected
+
+
+def test_cells_in_box_skips_knocked_out_bricks():
+    wall = grid()
+    wall.remove(1, 1)
+    assert sorted(wall.cells_in_box(10, 90, 10, 5)) == []
+
+
+def test_a_multi_hit_brick_loses_hit_points_before_it_goes():
+    cells = bytes([cell(0, 1)] * 19 + [cell(2, 3)])
+    wall = grid(cells)
+    assert len(wall) == 20
+    assert not wall.hit(3, 4) and not wall.hit(3, 4)
+    assert wall.is_alive(3, 4) and wall.alive[19] == 1 and len(wall) == 20
+    assert wall.hit(3, 4)
+    assert not wall.is_alive(3, 4) and len(wall) == 19
+
+
+def test_remaining_counts_each_brick_once():
+    wall = grid(bytes([0, cell(1, 2)] * 10))
+    assert len(wall) == 10
+    assert wall.remove(0, 1) and not wall.remove(0, 1)
+    assert not wall.remove(0, 0)  # There was never a brick there
+    assert len(wall) == 9 == len(list(wall.live_cells()))
+    for row, col in list(wall.live_cells()):
+        while not wall.hit(row, col):
+            pass
+    assert len(wall) == 0 and list(wall.live_cells()) == []
+
+
+def test_hit_test_and_cell_at():
+    wall = grid()
+    assert wall.cell_at(15, 92) == (1, 1)
+    assert wall.cell_at(15, 101) is None and wall.cell_at(51, 92) is None
+    wall.remove(1, 1)
+    assert wall.hit_test(15, 92) is None
+    assert wall.brick_rect(1, 1) == (10, 90, 10, 5)
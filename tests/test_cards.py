@@ -0,0 +1,85 @@
+import itertools
+
+import pytest
+
+from cards import (ACES, FACE_DOWN, IS_RED, KINGS, PILE_END, RANK_NAME, RANK_VALUE, RANKS, STACKS_ON, SUIT_INDEX,
+                   SUIT_NAME, SUITS, Card, Deck, can_stack, card_code, pack_piles)
+
+
+@pytest.mark.parametrize('rank, suit, code, value, red', [
+    ('A', 'H', 0, 1, True),
+    ('K', 'H', 12, 13, True),
+    ('A', 'D', 13, 1, True),
+    ('7', 'D', 19, 7, True),
+    ('10', 'C', 35, 10, False),
+    ('A', 'S', 39, 1, False),
+    ('K', 'S', 51, 13, False),
+])
+def test_card_codes_index_every_table(rank, suit, code, value, red):
+    assert card_code(rank, suit) == code
+    assert (RANK_NAME[code], SUIT_NAME[code]) == (rank, suit)
+    assert RANK_VALUE[code] == value
+    assert SUITS[SUIT_INDEX[code]] == suit
+    assert IS_RED[code] is red
+
+
+def test_the_tables_agree_with_card_for_every_code():
+    for rank, suit in itertools.product(RANKS, SUITS):
+        card = Card(rank, suit)
+        assert (card.rank, card.suit) == (rank, suit)
+        assert card.rank_value() == RANKS.index(rank) + 1
+        assert card.is_red() == (suit in ('H', 'D')) != card.is_black()
+    assert sorted(card.code for card in Deck().cards) == list(range(52))
+
+
+@pytest.mark.parametrize('card, target, expected', [
+    (('Q', 'H'), ('K', 'S'), True),
+    (('Q', 'C'), ('K', 'D'), True),
+    (('Q', 'D'), ('K', 'H'), False),  # same colour
+    (('Q', 'S'), ('K', 'C'), False),
+    (('J', 'H'), ('K', 'S'), False),  # two ranks apart
+    (('K', 'S'), ('Q', 'H'), False),  # the wrong way round
+    (('A', 'D'), ('2', 'C'), True),
+    (('K', 'H'), ('A', 'S'), False),  # ranks don't wrap
+])
+def test_can_stack(card, target, expected):
+    assert can_stack(card_code(*card), card_code(*target)) is expected
+
+
+def test_stack_tables_follow_can_stack():
+    assert STACKS_ON[card_code('K', 'S')] == (card_code('Q', 'H'), card_code('Q', 'D'))
+    assert STACKS_ON[card_code('A', 'H')] == ()
+    assert all(can_stack(code, target) for target in range(52) for code in STACKS_ON[target])
+    assert [RANK_NAME[code] for code in KINGS] == ['K'] * 4
+    assert [RANK_NAME[code] for code in ACES] == ['A'] * 4
+
+
+def pile(*names, face_up=True):
+    cards = [Card(name[:-1], name[-1]) for name in names]
+    for card in cards:
+        card.is_face_up = face_up
+    return cards
+
+
+def test_pack_piles_writes_one_byte_per_card_and_ends_each_pile():
+    packed = pack_piles([pile('KS', 'QH'), [], pile('5C', face_up=False)])
+    assert packed == bytes([51, 11, PILE_END, PILE_END, 30 | FACE_DOWN, PILE_END])
+
+
+def test_pack_piles_keys_are_unique_and_ordered():
+    ace, two, three = pile('AH', '2C', '3D')
+    layouts = [
+        [[ace, two], [three]],
+        [[ace], [two, three]],
+        [[two, ace], [three]],  # same piles, cards in another order
+        [[three], [ace, two]],  # same piles in another order
+        [[ace, two, three], []],
+        [[], [ace, two, three]],
+    ]
+    keys = [pack_piles(layout) for layout in layouts]
+    assert len(set(keys)) == len(keys)
+
+    ace.is_face_up = False
+    assert pack_piles(layouts[0]) != keys[0]
+    ace.is_face_up = True
+    assert pack_piles(layouts[0]) == keys[0]
@@ -0,0 +1,23 @@
+from collision import move_ball, sweep_box, wall_boxes
+
+
+def test_a_fast_ball_stops_at_a_thin_paddle():
+    paddle = ((0, 100, 200, 5), 'paddle')
+    # One step would carry the ball from below the paddle to far above it
+    x, y, dx, dy, contacts = move_ball(50, 50, 10, 0, 300, lambda *args: [paddle])
+    assert [contact.tag for contact in contacts] == ['paddle']
+    assert dy < 0 and y < 100
+
+
+def test_sweep_box_reports_the_face_hit():
+    assert sweep_box(0, 0, 10, 10, 20, 0, (15, 0, 10, 10)) == (0.25, -1, 0)
+    assert sweep_box(0, 0, 10, 10, 0, 20, (15, 0, 10, 10)) is None
+    assert sweep_box(0, 0, 10, 10, 5, 0, (5, 0, 10, 10)) is None  # Already overlapping
+
+
+def test_the_ball_stays_inside_the_walls():
+    walls = wall_boxes(100, 100)
+    x, y, dx, dy = 50.0, 50.0, 37.0, -23.0
+    for _ in range(500):
+        x, y, dx, dy, _ = move_ball(x, y, 10, dx, dy, lambda *args: walls)
+        assert 0 <= x <= 90 and 0 <= y <= 90
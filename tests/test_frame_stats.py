@@ -0,0 +1,30 @@
+import csv
+import json
+
+from frame_stats import KEY_F4, FrameStats, FrameStatsOverlay
+
+
+def test_the_ring_buffer_keeps_the_last_frames_in_order():
+    stats = FrameStats('test', 60, capacity=4)
+    for i in range(6):
+        stats.begin_frame(i / 1000)
+        stats.mark('physics')
+        stats.end_frame()
+    assert stats.count == 6
+    assert stats.column('dt') == [2.0, 3.0, 4.0, 5.0]
+
+
+def test_f4_exports_json_and_csv(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stats = FrameStats('test', 60, capacity=8)
+    for _ in range(3):
+        stats.begin_frame(1 / 60)
+        stats.end_frame()
+    FrameStatsOverlay(stats).on_key_down(None, KEY_F4, 0, None, [])
+
+    with open('frame_stats_test.csv', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(stats.columns)
+    assert len(rows) == 4
+    with open('frame_stats_test.json') as f:
+        assert json.load(f)['summary']['frames'] == 3
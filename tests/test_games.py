@@ -0,0 +1,17 @@
+import games
+
+SETTINGS = {'difficulty': 7, 'peer': '10.0.0.2:5000'}
+
+
+def test_each_game_takes_only_its_own_options(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert games.options('pong', SETTINGS) == {'ai_difficulty': 7}
+    assert games.options('pong_net', SETTINGS) == {'peer': '10.0.0.2:5000'}
+    assert games.options('brick_break', SETTINGS) == {}
+    assert games.options('snake', SETTINGS) == {}
+
+
+def test_brick_break_plays_the_level_pack_when_there_is_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / games.BRICK_LEVEL_PACK).write_bytes(b'')
+    assert games.options('brick_break', SETTINGS) == {'level_pack': games.BRICK_LEVEL_PACK}
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from levelpack import LevelPack, cell, random_level, write_pack
+
+
+def test_levels_read_back_as_written(tmp_path):
+    path = str(tmp_path / 'levels.pplp')
+    plain = (2, 9, bytes([1, 0, 1, 1, 0, 0, 1, 0, 1] * 2))  # Stored one bit per cell
+    mixed = (1, 3, bytes([cell(2, 3), 0, cell(15, 1)]))
+    rng = random.Random(1)
+    levels = [plain, mixed] + [random_level(rng, 8, 12) for _ in range(5)]
+    write_pack(path, levels)
+    with LevelPack(path) as pack:
+        assert len(pack) == len(levels)
+        for number, (rows, cols, cells) in enumerate(levels):
+            assert tuple(pack.level(number)) == (rows, cols, bytes(cells))
+        with pytest.raises(IndexError):
+            pack.level(len(levels))
+
+
+def test_a_level_must_fill_its_grid(tmp_path):
+    with pytest.raises(ValueError):
+        write_pack(str(tmp_path / 'bad.pplp'), [(2, 2, b'\x01\x01\x01')])
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'not_a_pack.pplp'
+    path.write_bytes(b'PPRL' + bytes(20))
+    with pytest.raises(ValueError):
+        LevelPack(str(path))
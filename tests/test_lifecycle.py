@@ -0,0 +1,92 @@
+import lifecycle
+from lifecycle import Lifecycle
+
+
+class FakeWindow:
+    """Records bindings the way kivy's Window keeps them: several callbacks per event."""
+
+    def __init__(self):
+        self.bound = {}
+
+    def bind(self, **bindings):
+        for event, callback in bindings.items():
+            self.bound.setdefault(event, []).append(callback)
+
+    def unbind(self, **bindings):
+        for event, callback in bindings.items():
+            self.bound[event].remove(callback)
+
+    def dispatch(self, event, *args):
+        for callback in list(self.bound.get(event, ())):
+            callback(*args)
+
+
+class Owner:
+    def clear_widgets(self):
+        pass
+
+
+def make(monkeypatch):
+    window = FakeWindow()
+    monkeypatch.setattr(lifecycle, 'Window', window)
+    return window, Lifecycle(Owner())
+
+
+def test_two_bindings_for_one_event_both_fire_and_are_released(monkeypatch):
+    window, life = make(monkeypatch)
+    calls = []
+    life.bind_window(on_key_down=lambda *args: calls.append('game'))
+    life.bind_window(on_key_down=lambda *args: calls.append('overlay'))
+    life.start()
+    window.dispatch('on_key_down', 275)
+    assert calls == ['game', 'overlay']
+
+    life.stop()
+    window.dispatch('on_key_down', 275)
+    assert calls == ['game', 'overlay']
+    assert window.bound['on_key_down'] == []
+
+
+def test_binding_while_running_is_released_by_pause(monkeypatch):
+    window, life = make(monkeypatch)
+    calls = []
+    life.bind_window(on_key_down=lambda *args: calls.append('game'))
+    life.start()
+    life.bind_window(on_key_down=lambda *args: calls.append('overlay'), on_key_up=lambda *args: calls.append('up'))
+    window.dispatch('on_key_down', 275)
+    window.dispatch('on_key_up', 275)
+    assert calls == ['game', 'overlay', 'up']
+
+    life.pause()
+    assert window.bound == {'on_key_down': [], 'on_key_up': []}
+    life.resume()
+    window.dispatch('on_key_down', 275)
+    assert calls == ['game', 'overlay', 'up', 'game', 'overlay']
+    life.stop()
+    assert window.bound == {'on_key_down': [], 'on_key_up': []}
+
+
+def test_return_to_menu_from_the_game_over_popup_runs_once(monkeypatch):
+    import types
+
+    import benchmark
+    from kivy.app import App
+    from kivy.clock import Clock
+    benchmark.install_window(benchmark.HeadlessWindow(800, 600))
+    import pong_game
+
+    menus = []
+    app = types.SimpleNamespace(scores=None, show_menu=lambda: menus.append(1))
+    monkeypatch.setattr(App, 'get_running_app', staticmethod(lambda: app))
+    game = pong_game.PongGame(seed=1)
+    game.input_log.recording = False
+    callbacks = [event.get_callback() for event in game.lifecycle.clock_events]
+    assert callbacks
+    game.lifecycle.resume()
+    game.show_popup("You Win!")
+    game.lifecycle.popups['game_over'].dismiss()  # What Return to Menu does
+    Clock.tick()
+
+    assert menus == [1]
+    assert game.lifecycle.clock_events == [] and game.lifecycle.popups == {}
+    assert not [event for event in Clock.get_events() if event.get_callback() in callbacks]
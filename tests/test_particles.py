@@ -0,0 +1,75 @@
+import numpy as np
+
+import benchmark
+from particles import Balls, Particles
+
+benchmark.install_window(benchmark.HeadlessWindow(800, 600))
+
+from brick_game import BrickBreakGame  # noqa: E402  (after the headless window is in place)
+
+
+def test_spawning_past_capacity_fills_the_pool_and_drops_the_rest():
+    particles = Particles(capacity=50, seed=1)
+    particles.spawn(0, 0, 10, 10, 30, u=0.1)
+    particles.spawn(0, 0, 10, 10, 30, u=0.2)
+    assert len(particles) == particles.count == 50
+    assert np.all(particles.u[:30] == np.float32(0.1)) and np.all(particles.u[30:] == np.float32(0.2))
+    particles.spawn(0, 0, 10, 10, 5, u=0.3)
+    assert particles.count == 50
+
+
+def test_dead_particles_are_compacted_out_keeping_the_live_ones_in_order():
+    particles = Particles(capacity=50, seed=1)
+    particles.spawn(0, 0, 10, 10, 40, u=0.5, lifetime=(1.0, 1.0))
+    particles.life[:40:3] = 0.05  # every third particle is about to die
+    survivors = np.delete(np.arange(40), np.arange(0, 40, 3))
+    x = particles.x[survivors] + particles.dx[survivors] * 0.1
+
+    particles.step(0.1)
+    assert particles.count == len(survivors) == 26
+    assert np.all(particles.life[:26] > 0)
+    np.testing.assert_allclose(particles.x[:26], x)
+    assert len(particles.vertices()) == 26 * 16
+
+    particles.step(1.0)
+    assert particles.count == 0
+    particles.spawn(0, 0, 10, 10, 3, u=0.5)
+    assert particles.count == 3
+
+
+def test_dropping_a_lost_ball_keeps_the_others_and_their_state():
+    balls = Balls(20)
+    for i in range(3):
+        balls.add(100.0 * i, 50.0, i + 1, 5.0)
+    balls.start_bounce(2)
+    balls.snapshot()
+    balls.x += balls.dx
+
+    balls.keep(np.array([True, False, True]))
+    assert len(balls) == 2
+    assert list(balls.x) == [1.0, 203.0] and list(balls.prev_x) == [0.0, 200.0]
+    assert list(balls.dx) == [1.0, 3.0]
+    assert list(balls.bounce) == [0.0, Balls.bounce_time]
+    assert len(balls.vertices(1.0, 0.0)) == 2 * 16
+
+
+def test_a_ball_out_of_play_is_dropped_and_only_the_last_one_costs_a_life():
+    game = BrickBreakGame(seed=1)
+    game.balls.add(300.0, 5.0, 0.0, -5.0)
+    game.physics_step(1 / 60)
+    assert len(game.balls) == 1 and game.lives == 3
+    game.balls.y[:] = 5.0
+    game.balls.dy[:] = -5.0
+    game.physics_step(1 / 60)
+    assert len(game.balls) == 1 and game.lives == 2
+
+
+def test_the_arena_walls_follow_the_window():
+    game = BrickBreakGame(seed=1)
+    assert game.walls
+    game.on_window_resize(None, 400, 300)
+    game.balls.x[:] = 375.0
+    game.balls.dx[:] = 5.0
+    game.physics_step(1 / 60)
+    assert game.balls.x[0] <= 400 - game.ball_size
+    assert game.balls.dx[0] < 0
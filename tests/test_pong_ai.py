@@ -0,0 +1,80 @@
+import random
+
+import numpy as np
+import pytest
+
+from pong_ai import Difficulty, difficulty_for, intercept_x
+from pong_sim import PongSim
+
+
+def bounce_x(ball_x, ball_y, dx, dy, target_y, span):
+    """intercept_x worked out the long way, flying from wall to wall; returns (x, bounces)."""
+    time_left = (target_y - ball_y) / dy
+    x = ball_x
+    bounces = 0
+    while True:
+        wall = span if dx > 0 else 0
+        to_wall = (wall - x) / dx
+        if to_wall >= time_left:
+            return x + dx * time_left, bounces
+        x, dx = wall, -dx
+        time_left -= to_wall
+        bounces += 1
+
+
+@pytest.mark.parametrize('ball_x, dx, folds', [
+    (100, 2, 0),     # Reaches the line before either wall
+    (100, 8, 1),     # Off the right wall once
+    (100, -6, 1),    # Off the left wall once
+    (100, 40, 5),    # Back and forth several times
+    (0, -5, 1),      # Starting against the left wall, moving into it
+    (380, 5, 1),     # Against the right wall
+    (0, 5, 0),       # Against a wall, moving away from it
+])
+def test_intercept_x_folds_wall_bounces(ball_x, dx, folds):
+    span, ball_y, dy, target_y = 380, 50, 4, 250
+    expected, bounces = bounce_x(ball_x, ball_y, dx, dy, target_y, span)
+    assert bounces == folds
+    assert intercept_x(ball_x, ball_y, dx, dy, target_y, span) == pytest.approx(expected)
+
+
+def test_intercept_x_works_on_arrays():
+    rng = random.Random(1)
+    cases = [(rng.uniform(0, 380), rng.uniform(-30, 30), rng.uniform(1, 10)) for _ in range(100)]
+    xs, dxs, dys = map(np.array, zip(*cases))
+    result = intercept_x(xs, 0.0, dxs, dys, 500.0, 380.0)
+    assert result == pytest.approx([bounce_x(x, 0, dx, dy, 500, 380)[0] for x, dx, dy in cases])
+
+
+def test_the_ai_plans_only_when_the_trajectory_changes():
+    sim = PongSim(400, 300, ai_difficulty=10, rng=random.Random(2))
+    ai = sim.ai
+    ai.step()
+    assert ai.plans == 1
+    for _ in range(5):
+        ai.step()
+    assert ai.plans == 1
+    sim.trajectory += 1  # A paddle hit or a serve
+    ai.step()
+    assert ai.plans == 2
+
+
+def test_difficulty_ranges():
+    easiest, hardest = difficulty_for(1), difficulty_for(10)
+    assert (easiest.reaction_steps, easiest.aim_error, easiest.max_speed) == (12, 60, 1)
+    assert (hardest.reaction_steps, hardest.aim_error, hardest.max_speed) == (0, 0, 10)
+    levels = [difficulty_for(level) for level in range(1, 11)]
+    for easier, harder in zip(levels, levels[1:]):
+        assert harder.reaction_steps <= easier.reaction_steps
+        assert harder.aim_error < easier.aim_error
+        assert harder.max_speed > easier.max_speed
+
+
+def test_an_ai_with_no_delay_error_or_speed_limit_returns_the_ball():
+    sim = PongSim(400, 300, rng=random.Random(3))
+    sim.ai.difficulty = Difficulty(reaction_steps=0, aim_error=0, max_speed=float('inf'))
+    # Misses only start once the ball covers most of the arena in one step
+    while abs(sim.ball_dy) < sim.height / 2:
+        sim.move_player_to(sim.ball_x + sim.ball_size / 2)  # The player never misses either
+        assert sim.step() is None
+    assert sim.trajectory > 20  # Many returns
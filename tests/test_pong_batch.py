@@ -0,0 +1,62 @@
+import random
+
+import numpy as np
+import pytest
+
+from pong_batch import PongBatch, calibrate
+from pong_sim import PongSim
+
+
+def scripted_player(sim, speed=10):
+    # PongBatch's scripted player, applied to a PongSim before it steps
+    offset = sim.ball_x - (sim.player_x + sim.paddle_width / 2)
+    sim.player_x = min(max(sim.player_x + min(max(offset, -speed), speed), 0), sim.width - sim.paddle_width)
+
+
+@pytest.mark.parametrize('level', [1, 5, 10])
+@pytest.mark.parametrize('seed', [1, 4, 5])
+def test_a_batch_of_one_plays_the_same_points_as_pong_sim(level, seed):
+    batch = PongBatch(1, ai_difficulty=level, win_score=3, seed=seed)
+    sim = PongSim(800, 600, ai_difficulty=level, win_score=3, rng=random.Random(seed))
+    # The two draw serves and aim errors from different generators, so take
+    # aim out of it and hand the batch's serves to the sim
+    batch.ai_aim_error[:] = 0
+    sim.ai.difficulty = sim.ai.difficulty._replace(aim_error=0)
+    sim.ball_dx, sim.ball_dy = batch.ball_dx[0], batch.ball_dy[0]
+
+    hits = 0
+    while sim.winner() is None:
+        scripted_player(sim)
+        scored = sim.step()
+        batch.step()
+        if any(contact.tag != 'wall' and contact.nx for contact in sim.contacts):
+            break  # The ball clipped the side of a paddle, which the batch leaves out
+        hits += sum(contact.tag != 'wall' for contact in sim.contacts)
+        if scored:
+            sim.ball_dx, sim.ball_dy = batch.ball_dx[0], batch.ball_dy[0]
+        assert (batch.player_score[0], batch.ai_score[0]) == (sim.player_score, sim.ai_score)
+        assert (batch.ball_x[0], batch.ball_y[0], batch.player_x[0], batch.ai_x[0]) == pytest.approx(
+            (sim.ball_x, sim.ball_y, sim.player_x, sim.ai_x))
+        assert batch.paddle_hits[0] == hits
+    else:
+        assert not batch.active[0]
+    assert sim.player_score + sim.ai_score > 0
+
+
+def test_finished_matches_stop_while_the_rest_play_on():
+    batch = PongBatch(50, ai_difficulty=np.resize(np.arange(1, 11), 50), win_score=2, seed=0)
+    batch.run()
+    assert not batch.active.any()
+    assert np.all(np.maximum(batch.player_score, batch.ai_score) == 2)
+    frames = batch.frames.copy()
+    batch.step()
+    assert np.array_equal(batch.frames, frames)
+    assert np.all(batch.ball_dx == 0) and np.all(batch.ball_dy == 0)
+
+
+def test_the_ai_wins_more_often_as_the_level_rises():
+    results = calibrate((1, 4, 7, 10), matches=50, win_score=3)
+    rates = [row['ai_win_rate'] for row in results]
+    assert rates == sorted(set(rates))
+    assert rates[0] < 0.1 and rates[-1] > 0.9
+    assert all(row['unfinished'] == 0 for row in results)
@@ -0,0 +1,97 @@
+import random
+import threading
+
+import pytest
+
+import pong_net
+from pong_net import BOTTOM, TOP, NetPongSim, RollbackSession, follow_ball
+
+
+def play(latency, loss, seed=7, win_score=3, ticks=5000):
+    """Two sessions exchanging packets in memory, each delayed by latency ticks and dropped at rate loss."""
+    rng = random.Random(seed)
+    sessions = [RollbackSession(NetPongSim(400, 300, seed, win_score=win_score), side) for side in (BOTTOM, TOP)]
+    players = [(random.Random(1), 20), (random.Random(2), 120)]
+    for session in sessions:
+        session.track_checksums = True
+    in_flight = [[], []]  # Packets on their way to each session: (arrival tick, data)
+    for tick in range(ticks):
+        if all(session.finished for session in sessions):
+            break
+        for i, session in enumerate(sessions):
+            for arrival, data in [p for p in in_flight[i] if p[0] <= tick]:
+                session.receive(data)
+            in_flight[i] = [p for p in in_flight[i] if p[0] > tick]
+            player_rng, noise = players[i]
+            session.advance(follow_ball(session.sim, player_rng, noise))
+            if rng.random() >= loss:
+                in_flight[1 - i].append((tick + latency, session.packet()))
+    return sessions
+
+
+@pytest.mark.parametrize('latency, loss', [(0, 0.0), (1, 0.0), (2, 0.1), (4, 0.3)])
+def test_both_sides_finish_with_the_same_result(latency, loss):
+    a, b = play(latency, loss)
+    assert a.finished and b.finished
+    assert a.result == b.result
+    assert a.result[1] in ('player', 'ai')
+    assert a.sim.snapshot() == b.sim.snapshot()
+    common = set(a.checksums) & set(b.checksums)
+    assert common and all(a.checksums[f] == b.checksums[f] for f in common)
+
+
+def test_the_match_ends_on_the_frame_the_winning_point_is_scored():
+    a, _ = play(2, 0.1)
+    frame, winner = a.result
+    assert a.sim.winner() == winner
+    assert max(a.sim.player_score, a.sim.ai_score) == 3
+    assert not a.advance(0)  # Nothing is simulated past the result
+
+
+def test_a_prediction_cannot_end_the_match():
+    sim = NetPongSim(400, 300, 1, win_score=1)
+    session = RollbackSession(sim, BOTTOM)
+    for _ in range(200):  # The peer is never heard from, so no frame is confirmed
+        session.advance(follow_ball(sim, random.Random(3), 200))
+    assert session.result is None
+
+
+def test_self_test_plays_a_match_over_localhost():
+    report = pong_net.self_test(frames=3000, rate=300.0, latency=0.01, jitter=0.005, loss=0.05,
+                                port=pong_net.DEFAULT_PORT + 200)
+    assert report['finished']
+    assert report['results'][0] == report['results'][1]
+    assert report['mismatches'] == 0
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('192.168.1.5', ('192.168.1.5', pong_net.DEFAULT_PORT)),
+    ('1.2.3.4:9000', ('1.2.3.4', 9000)),
+    ('host:', ('host', pong_net.DEFAULT_PORT)),
+    (':9000', ('127.0.0.1', 9000)),
+    (' example.org ', ('example.org', pong_net.DEFAULT_PORT)),
+])
+def test_address(text, expected):
+    assert pong_net.address(text) == expected
+
+
+@pytest.mark.parametrize('text', ['host:port', 'host:0', 'host:70000'])
+def test_address_rejects_bad_ports(text):
+    with pytest.raises(ValueError):
+        pong_net.address(text)
+
+
+def test_a_taken_port_raises_and_leaves_no_thread():
+    port = pong_net.DEFAULT_PORT + 300
+    first = pong_net.NetLink(port=port)
+    try:
+        with pytest.raises(OSError):
+            pong_net.NetLink(port=port)
+        assert [t.name for t in threading.enumerate()].count('netplay') == 1
+    finally:
+        first.close()
+
+
+def test_joining_an_unknown_host_raises():
+    with pytest.raises(OSError):
+        pong_net.NetLink(peer=('no-such-host.invalid', pong_net.DEFAULT_PORT))
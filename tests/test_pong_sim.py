@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from pong_sim import PongSim
+
+
+def state(sim):
+    return (sim.ball_x, sim.ball_y, sim.ball_dx, sim.ball_dy, sim.player_x, sim.ai_x,
+            sim.player_score, sim.ai_score)
+
+
+def play(seed, steps=3000):
+    sim = PongSim(400, 300, rng=random.Random(seed))
+    inputs = random.Random(99)
+    for _ in range(steps):
+        sim.step(move_left=inputs.random() < 0.3, move_right=inputs.random() < 0.3)
+    return sim
+
+
+def test_a_seeded_match_plays_the_same_every_time():
+    assert state(play(5)) == state(play(5))
+    assert state(play(5)) != state(play(6))
+    assert play(5).player_score + play(5).ai_score > 0
+
+
+def test_a_serve_starts_from_the_centre_toward_the_ai():
+    sim = PongSim(400, 300, rng=random.Random(1))
+    for _ in range(20):
+        trajectory = sim.trajectory
+        sim.reset_ball()
+        assert (sim.ball_x, sim.ball_y) == (200, 150)
+        assert sim.ball_dx / 1.1 in range(1, 6) and sim.ball_dy / 1.1 in range(1, 6)
+        assert sim.trajectory == trajectory + 1
+
+
+@pytest.mark.parametrize('ball_y, scorer', [(-1, 'ai'), (301, 'player')])
+def test_a_ball_out_of_the_arena_scores_and_reserves(ball_y, scorer):
+    sim = PongSim(400, 300, win_score=2, rng=random.Random(1))
+    for points in (1, 2):
+        sim.ball_y = ball_y
+        assert sim.score_point() == scorer
+        assert (sim.player_score if scorer == 'player' else sim.ai_score) == points
+        assert (sim.ball_x, sim.ball_y) == (200, 150)
+    assert sim.winner() == scorer
+
+
+def test_the_player_paddle_stays_in_the_arena():
+    sim = PongSim(400, 300, rng=random.Random(1))
+    for _ in range(100):
+        sim.step(move_left=True)
+    assert sim.player_x == 0
+    sim.move_player_to(10000)
+    assert sim.player_x == 300
+
+
+def test_resize_keeps_the_paddles_inside_and_replans_the_ai():
+    sim = PongSim(800, 600, rng=random.Random(1))
+    sim.move_player_to(790)
+    sim.ai_x = 700
+    trajectory = sim.trajectory
+    sim.resize(300, 200)
+    assert (sim.width, sim.height) == (300, 200)
+    assert sim.player_x == sim.ai_x == 200
+    assert sim.ai_paddle_y == 200 - sim.paddle_height - sim.paddle_margin
+    assert sim.trajectory == trajectory + 1
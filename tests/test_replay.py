@@ -0,0 +1,84 @@
+import os
+
+import benchmark
+from replay import RECORD, TICK, InputRecorder, Replay
+
+benchmark.install_window(benchmark.HeadlessWindow(800, 600))
+
+
+def test_a_saved_session_loads_back(tmp_path):
+    recorder = InputRecorder('snake', 1234, (800, 600), directory=str(tmp_path))
+    recorder.tick(1 / 60)
+    recorder.key_down(273, 82)
+    path = recorder.save()
+    replay = Replay(path)
+    assert (replay.game, replay.seed, replay.window_size) == ('snake', 1234, (800, 600))
+    assert [record[0] for record in replay.records] == [TICK, 1]
+    assert replay.ticks == 1
+
+
+def test_the_buffer_stops_at_max_records(tmp_path):
+    recorder = InputRecorder('snake', 1, (800, 600), directory=str(tmp_path), max_records=10)
+    for _ in range(50):
+        recorder.tick(1 / 60)
+    assert len(recorder.data) == 10 * RECORD.size
+    assert Replay(recorder.save()).ticks == 10
+
+
+def test_only_the_newest_replays_are_kept(tmp_path):
+    for i in range(5):
+        old = tmp_path / f"snake-{i}.pprl"
+        old.write_bytes(b'')
+        os.utime(old, (i, i))
+    (tmp_path / 'notes.txt').write_text('not a replay')
+    recorder = InputRecorder('snake', 1, (800, 600), directory=str(tmp_path), keep=3)
+    path = recorder.save()
+    assert sorted(os.listdir(tmp_path)) == sorted([os.path.basename(path), 'notes.txt', 'snake-3.pprl', 'snake-4.pprl'])
+
+
+def test_a_replay_repeats_the_game(tmp_path):
+    import games
+    SnakeGame = games.load('snake')
+    game = SnakeGame(seed=99)
+    game.input_log.directory = str(tmp_path)
+    game.lifecycle.pause()
+    for i in range(160):
+        if i % 20 == 0:  # Up, right, down, right...
+            game.on_key_down(None, (273, 275, 274, 275)[i // 20 % 4], 0, None, [])
+        game.update(1 / 30)
+    assert not game.game_over
+    replay = Replay(game.input_log.save())
+
+    copy = replay.play(SnakeGame(seed=replay.seed))
+    assert list(copy.board.body) == list(game.board.body)
+    assert copy.current_score == game.current_score
+    game.lifecycle.stop()
+    copy.lifecycle.stop()
+
+
+def test_attract_mode_is_not_recorded():
+    import games
+    game = games.load('snake')(seed=1, autopilot=True)
+    game.lifecycle.stop()
+    assert not game.input_log.recording
+
+
+def test_a_pong_replay_repeats_the_game(tmp_path):
+    import games
+    from replay import ReplayTouch
+    PongGame = games.load('pong')
+    game = PongGame(seed=7)
+    game.size, game.pos = (760, 560), (20, 20)  # Laid out in the menu, unlike the replayed game
+    game.input_log.directory = str(tmp_path)
+    game.lifecycle.pause()
+    for i in range(300):
+        if i % 25 == 0:
+            game.on_touch_move(ReplayTouch(100 + (i * 37) % 600, 200))
+        game.update(1 / 60)
+    replay = Replay(game.input_log.save())
+
+    copy = replay.play(PongGame(seed=replay.seed))
+    state = lambda sim: (sim.ball_x, sim.ball_y, sim.player_x, sim.ai_x, sim.player_score, sim.ai_score)
+    assert state(copy.sim) == state(game.sim)
+    game.lifecycle.stop()
+    copy.lifecycle.stop()
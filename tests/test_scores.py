@@ -0,0 +1,58 @@
+import pytest
+
+from scores import _STOP, ScoreStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'scores.db')
+
+
+def test_scores_are_committed_and_ranked(path):
+    store = ScoreStore(path, flush_interval=0.01)
+    for score in (5, 30, 10):
+        store.record('snake', score)
+    store.record('pong', 3)
+    assert store.high_score('snake') == 30  # Known before the worker writes anything
+    assert store.flush(timeout=5)
+    assert [s.score for s in store.top('snake')] == [30, 10, 5]
+    assert [s.score for s in store.top('pong')] == [3]
+    store.close()
+
+
+def test_best_scores_are_read_back_at_startup(path):
+    store = ScoreStore(path)
+    store.record('snake', 42)
+    store.close()
+
+    store = ScoreStore(path)
+    assert store.loaded.wait(5)
+    assert store.high_score('snake') == 42
+    assert store.high_score('brick_break') == 0
+    store.record('snake', 7)
+    assert store.high_score('snake') == 42
+    store.close()
+
+
+def test_flush_gives_up_on_a_dead_worker(path):
+    store = ScoreStore(path)
+    store.queue.put(_STOP)  # The worker ends as if it had crashed...
+    store.worker.join(5)
+    store.queue.put(('snake', 1, '', 0.0))  # ...with a score still to write
+    assert not store.flush(timeout=5)
+    store.close()
+
+
+def test_flush_times_out(path):
+    store = ScoreStore(path, flush_interval=5)
+    store.record('snake', 1)
+    assert not store.flush(timeout=0.05)  # Still waiting on the batch
+    store.close()
+
+
+def test_record_after_close_is_rejected(path):
+    store = ScoreStore(path)
+    store.close()
+    store.close()
+    with pytest.raises(ValueError):
+        store.record('snake', 1)
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from snake_autopilot import Autopilot, hamiltonian_cycle
+from snake_board import SnakeBoard
+
+
+def play(board, pilot, moves):
+    """Let the autopilot play; returns the last move's result."""
+    result = None
+    for _ in range(moves):
+        result = board.move(pilot.next_direction())
+        if result == 'dead' or board.food is None:
+            break
+    return result
+
+
+@pytest.mark.parametrize('cols, rows', [(2, 2), (4, 3), (3, 4), (6, 6), (3, 3), (5, 7), (39, 29)])
+def test_cycle_visits_every_cell_once(cols, rows):
+    cycle = hamiltonian_cycle(cols, rows)
+    cells = set(range(cols * rows))
+    if cols % 2 and rows % 2:
+        cells.discard(cols * rows - 1)  # The top right corner is left out
+    assert sorted(cycle) == sorted(cells)
+    for a, b in zip(cycle, cycle[1:] + cycle[:1]):
+        (ac, ar), (bc, br) = divmod(a, cols)[::-1], divmod(b, cols)[::-1]
+        assert abs(ac - bc) + abs(ar - br) == 1
+
+
+@pytest.mark.parametrize('cols, rows', [(6, 6), (8, 8), (10, 10), (9, 12), (12, 9), (10, 12), (14, 10)])
+def test_fills_small_even_boards(cols, rows):
+    for seed in range(10):
+        board = SnakeBoard(cols, rows, body=[(4, 4), (3, 4), (2, 4)], rng=random.Random(seed))
+        pilot = Autopilot(board)
+        assert play(board, pilot, 100 * cols * rows) != 'dead', seed
+        assert board.food is None and pilot.on_cycle
+
+
+@pytest.mark.parametrize('cols, rows', [(7, 7), (9, 9), (15, 9)])
+def test_fills_odd_boards_but_the_last_cells(cols, rows):
+    # The corner left off the cycle makes the last food or two unsafe; nothing before that is
+    for seed in range(10):
+        board = SnakeBoard(cols, rows, body=[(4, 4), (3, 4), (2, 4)], rng=random.Random(seed))
+        pilot = Autopilot(board)
+        for _ in range(100 * cols * rows):
+            if board.move(pilot.next_direction()) == 'dead':
+                break
+        assert len(board) + board.grow_pending >= cols * rows - 2, seed
+
+
+def test_gets_back_into_cycle_order_after_a_player_steers():
+    rng = random.Random(3)
+    for seed in range(10):
+        board = SnakeBoard(20, 20, body=[(4, 4), (3, 4), (2, 4)], rng=random.Random(seed))
+        pilot = Autopilot(board)
+        for _ in range(40):  # A player wanders off the cycle, eating what they meet
+            col, row = board.head
+            free = [name for name, (dc, dr) in (('UP', (0, 1)), ('RIGHT', (1, 0)), ('LEFT', (-1, 0)),
+                                                 ('DOWN', (0, -1))) if board.is_free(col + dc, row + dr)]
+            board.move(rng.choice(free))
+        assert play(board, pilot, 3000) != 'dead', seed
+        assert pilot.on_cycle, seed
+
+
+def test_searches_stay_within_their_budget():
+    board = SnakeBoard(39, 29, body=[(4, 4), (3, 4), (2, 4)], rng=random.Random(1))
+    pilot = Autopilot(board)
+    board.move('UP')  # Out of cycle order, so the time-aware searches run
+    worst = 0
+    for _ in range(3000):
+        nodes = pilot.nodes
+        if board.move(pilot.next_direction()) == 'dead':
+            break
+        worst = max(worst, pilot.nodes - nodes)
+    # Each move: the time-aware budget, or one cycle-order search
+    assert worst <= max(pilot.free_budget, pilot.budget)
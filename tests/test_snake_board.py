@@ -0,0 +1,80 @@
+import random
+
+from snake_board import DIRECTIONS, SnakeBoard
+
+START = [(4, 4), (3, 4), (2, 4)]
+
+
+def check(board):
+    """The body, occupancy grid, free list and slot index all agree."""
+    cells = board.cols * board.rows
+    assert sorted(list(board.free) + list(board.body)) == list(range(cells))
+    assert all(board.free_slot[cell] == slot for slot, cell in enumerate(board.free))
+    assert all(board.free_slot[cell] == -1 for cell in board.body)
+    assert [cell for cell in range(cells) if board.occupied[cell]] == sorted(board.body)
+    assert board.food is None or not board.occupied[board.food]
+
+
+def wander(board, rng, moves):
+    """Random moves that steer for the food and avoid dying; returns how many times it ate."""
+    eaten = 0
+    for _ in range(moves):
+        col, row = board.head
+        safe = [name for name, (dc, dr) in DIRECTIONS.items()
+                if board.is_free(col + dc, row + dr) or board.cell_xy(board.body[-1]) == (col + dc, row + dr)]
+        if not safe:
+            break
+        if board.food is not None and rng.random() < 0.7:
+            fc, fr = board.cell_xy(board.food)
+            safe.sort(key=lambda name: abs(col + DIRECTIONS[name][0] - fc) + abs(row + DIRECTIONS[name][1] - fr))
+            direction = safe[0]
+        else:
+            direction = rng.choice(safe)
+        result = board.move(direction)
+        eaten += result == 'ate'
+        if result != 'dead':
+            check(board)
+    return eaten
+
+
+def test_the_free_list_and_occupancy_stay_consistent():
+    eaten = 0
+    for seed in range(10):
+        rng = random.Random(seed)
+        board = SnakeBoard(12, 9, START, rng=random.Random(seed))
+        check(board)
+        eaten += wander(board, rng, 2000)
+        board = SnakeBoard(12, 9, START, rng=random.Random(seed))  # What a restart does
+        check(board)
+        wander(board, rng, 200)
+    assert eaten > 50
+
+
+def test_pending_growth_holds_the_tail_in_place():
+    board = SnakeBoard(10, 10, START, rng=random.Random(1))
+    board.grow_pending = 2
+    tail = board.tail
+    board.move('RIGHT')
+    board.move('RIGHT')
+    assert board.tail == tail and len(board) == 5 and board.grow_pending == 0
+    board.move('RIGHT')
+    assert board.tail != tail and len(board) == 5
+    check(board)
+
+
+def test_the_head_may_follow_the_tail_but_not_while_growing():
+    board = SnakeBoard(10, 10, [(4, 4), (4, 5), (3, 5), (3, 4)], rng=random.Random(1))
+    assert board.move('LEFT') is None  # Into the cell the tail is leaving
+    board = SnakeBoard(10, 10, [(4, 4), (4, 5), (3, 5), (3, 4)], rng=random.Random(1))
+    board.grow_pending = 1
+    assert board.move('LEFT') == 'dead'
+    check(board)
+
+
+def test_food_is_gone_once_the_board_is_full():
+    board = SnakeBoard(2, 2, [(0, 0), (1, 0), (1, 1)], rng=random.Random(1))
+    assert board.food == 2  # The one free cell, (0, 1)
+    board.grow_pending = 1  # So the tail stays put
+    assert board.move('UP') == 'ate'
+    assert board.food is None and not board.free
+    check(board)
@@ -0,0 +1,149 @@
+import random
+
+import benchmark
+from cards import RANK_VALUE, SUIT_INDEX, can_stack
+
+benchmark.install_window(benchmark.HeadlessWindow(800, 600))
+
+from solitairetest import Solitaire, SolitaireWidget  # noqa: E402  (needs the window above)
+
+
+def brute_force_targets(game, card):
+    """The move index's answers, worked out from the board."""
+    tableau = {i for i, pile in enumerate(game.tableau)
+               if (pile and pile[-1].is_face_up and can_stack(card.code, pile[-1].code))
+               or (not pile and RANK_VALUE[card.code] == 13)}
+    on_top = any(pile and pile[-1] is card and card.is_face_up for pile in game.tableau)
+    foundation = None
+    if on_top:
+        for i, pile in enumerate(game.foundation):
+            if game.can_move_to_foundation(card, pile):
+                if pile or all(f and SUIT_INDEX[f[-1].code] != SUIT_INDEX[card.code] for f in game.foundation[:i]):
+                    foundation = i
+                    break
+    return tableau, foundation
+
+
+def test_the_move_index_matches_the_board():
+    rng = random.Random(5)
+    for seed in range(20):
+        random.seed(seed)
+        game = Solitaire()
+        for _ in range(200):
+            for pile in game.tableau:
+                for card in pile:
+                    assert (set(game.tableau_targets(card)), game.foundation_target(card)) \
+                        == brute_force_targets(game, card)
+            moves = [(i, depth, target) for i, pile in enumerate(game.tableau)
+                     for depth, card in enumerate(pile) if card.is_face_up
+                     for target in game.tableau_targets(card)]
+            tops = [(pile[-1], i) for i, pile in enumerate(game.tableau) if pile and not pile[-1].is_face_up]
+            if tops and rng.random() < 0.3:
+                game.flip_card(*tops[0])
+            elif game.auto_move_to_foundation():
+                pass
+            elif moves:
+                game.move_run(*rng.choice(moves))
+            else:
+                break
+
+
+def make_table():
+    random.seed(2)
+    return SolitaireWidget(size=(800, 600))
+
+
+def test_foundations_have_their_own_row():
+    table = make_table()
+    width, height = table.card_size
+    for index in range(4):
+        x, y = table.foundation_pos(index)
+        assert y + height <= table.height
+        for pile in range(7):
+            assert y >= table.slot_pos(pile, 0)[1] + height or x + width <= table.pile_x[pile] \
+                or x >= table.pile_x[pile] + width
+
+
+def drop(table, card_widget, dx, dy):
+    card_widget.drag_offset = (dx, dy)
+    return card_widget.is_valid_drop()
+
+
+def movable_card(table):
+    """A face-up card with a tableau target, and that target's pile."""
+    for card_widget in table.card_widgets:
+        targets = table.game.tableau_targets(card_widget.card)
+        if card_widget.card.is_face_up and card_widget.tableau_index is not None and targets:
+            return card_widget, min(targets)
+    return None, None
+
+
+def test_a_drop_has_to_land_on_its_target():
+    for seed in range(20):
+        random.seed(seed)
+        table = SolitaireWidget(size=(800, 600))
+        card_widget, target = movable_card(table)
+        if card_widget is None:
+            continue
+        pile = table.game.tableau[target]
+        tx, ty = table.slot_pos(target, max(len(pile) - 1, 0))
+        dx, dy = tx - card_widget.x, ty - card_widget.y
+        assert drop(table, card_widget, dx + 10, dy - 20)
+        assert card_widget.drop_target == ('tableau', target)
+        assert not drop(table, card_widget, 0, 0)  # Let go where it started
+        assert not drop(table, card_widget, dx, dy + 2 * table.card_size[1])  # Well above the pile
+        return
+    raise AssertionError("no deal had a tableau move")
+
+
+def test_card_at_picks_the_top_card_of_a_fanned_pile():
+    table = make_table()
+    width, height = table.card_size
+    offset = table.card_height_offset
+    pile = table.game.tableau[6]
+    x = table.pile_x[6] + width / 2
+    top_x, top_y = table.slot_pos(6, len(pile) - 1)
+
+    # Where the top card overlaps the one under it, the top card wins
+    assert table.card_at(x, top_y + height - 1) is table.widget_of[pile[-1].code]
+    assert table.card_at(x, top_y + 1) is table.widget_of[pile[-1].code]
+    # The strip of a buried card still showing above the next one
+    assert table.card_at(x, table.slot_pos(6, 2)[1] + height - offset / 2) is table.widget_of[pile[2].code]
+    # Below the pile, between two piles and off the end of the table
+    assert table.card_at(x, top_y - 1) is None
+    assert table.card_at(table.pile_x[0] + width + 1, top_y + 1) is None
+    assert table.card_at(table.width - 1, top_y + 1) is None
+
+
+def test_a_face_down_card_is_not_dragged():
+    table = make_table()
+    width, height = table.card_size
+    card = table.game.tableau[6][2]
+    touch = benchmark.ScriptedTouch(table.pile_x[6] + width / 2, table.slot_pos(6, 2)[1] + height - 1)
+    assert not card.is_face_up
+    assert table.on_touch_down(touch)
+    assert table.dragged is None
+    assert not table.drag_layer.children
+
+
+def test_dragging_a_card_carries_the_run_on_it():
+    table = make_table()
+    width, height = table.card_size
+    pile = table.game.tableau[6]
+    for card in pile[4:-1]:
+        table.game.flip_card(card, 6)
+    run = [table.widget_of[card.code] for card in pile[4:]]
+
+    touch = benchmark.ScriptedTouch(table.pile_x[6] + width / 2, table.slot_pos(6, 4)[1] + height - 1)
+    assert table.on_touch_down(touch)
+    assert table.dragged is run[0]
+    assert table.drag_layer.children[::-1] == run
+    assert not any(card_widget.parent is table for card_widget in run)
+    assert table.on_touch_move(benchmark.ScriptedTouch(touch.x + 30, touch.y - 40))
+    assert tuple(table.drag_translate.xy) == (30, -40)
+
+    # Let go over nothing: the run goes back on the table, still in pile 6, top card last
+    assert table.on_touch_up(benchmark.ScriptedTouch(touch.x + 30, touch.y - 40))
+    assert table.dragged is None and not table.drag_layer.children
+    assert table.children[:len(run)] == run[::-1]
+    assert pile[4:] == [card_widget.card for card_widget in run]
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from cards import Card, card_code
+from solitaire_solver import (SOLVED, UNKNOWN, UNSOLVABLE, apply_move, canonical_key, deal_state,
+                              from_game, is_won, legal_moves, solve)
+from solitairetest import Solitaire
+
+C = card_code
+
+
+def blocked_state():
+    """Only the black J, Q and K of clubs are left, and the queen sits on the jack it needs."""
+    tableau = ((C('J', 'C'), C('Q', 'C')), (C('K', 'C'),), (), (), (), (), ())
+    return tableau, (1, 0, 0, 0, 0, 0, 0), (13, 13, 10, 13), (), ()
+
+
+def test_a_solved_line_wins():
+    for seed in range(5):
+        state = deal_state(random.Random(seed))
+        result = solve(state, max_nodes=20000, time_limit=60)
+        if result.status != SOLVED:
+            continue
+        for move in result.moves:
+            assert move in legal_moves(state, complete=True)
+            state = apply_move(state, move)
+        assert is_won(state)
+
+
+def test_only_a_complete_search_proves_a_deal_unsolvable():
+    assert solve(blocked_state()).status == UNKNOWN
+    assert solve(blocked_state(), complete=True).status == UNSOLVABLE
+
+
+def test_pruned_moves_are_legal_moves():
+    state = deal_state(random.Random(1))
+    for _ in range(200):
+        moves = legal_moves(state)
+        assert set(moves) <= set(legal_moves(state, complete=True))
+        if not moves:
+            break
+        state = apply_move(state, moves[0])
+
+
+def test_canonical_key_ignores_pile_order():
+    tableau, down, foundation, stock, waste = deal_state(random.Random(2))
+    order = [6, 0, 5, 1, 4, 2, 3]
+    shuffled = tuple(tableau[i] for i in order), tuple(down[i] for i in order), foundation, stock, waste
+    assert canonical_key(shuffled) == canonical_key((tableau, down, foundation, stock, waste))
+
+
+def pile(*layout):
+    """Game cards from (rank, suit, face_up) triples, bottom card first."""
+    cards = []
+    for rank, suit, face_up in layout:
+        card = Card(rank, suit)
+        card.is_face_up = face_up
+        cards.append(card)
+    return cards
+
+
+@pytest.mark.parametrize('layout, down', [
+    ([('K', 'S', False), ('Q', 'H', True)], 1),
+    ([('K', 'S', False), ('Q', 'H', False)], 1),  # The top card is still to be turned over
+    ([('K', 'S', True), ('Q', 'H', False), ('J', 'C', False)], 2),  # A face-up card under face-down ones
+    ([('Q', 'H', False)], 0),
+    ([], 0),
+])
+def test_from_game_reads_each_card(layout, down):
+    game = Solitaire()
+    game.tableau[0] = pile(*layout)
+    state = from_game(game)
+    assert state[1][0] == down
+    assert state[0][0] == tuple(card.code for card in game.tableau[0])
@@ -0,0 +1,23 @@
+import pytest
+
+from timestep import FixedTimestep
+
+# Times are multiples of 1/16, so the sums come out exact
+
+
+def test_steps_run_at_the_fixed_rate_and_the_remainder_carries_over():
+    steps = []
+    timestep = FixedTimestep(steps.append, rate=8)
+    assert timestep.advance(0.3125) == 0.5
+    assert steps == [0.125, 0.125]
+    timestep.advance(0.0625)
+    assert len(steps) == 3
+
+
+def test_a_long_stall_only_catches_up_max_steps():
+    steps = []
+    timestep = FixedTimestep(steps.append, rate=8, max_steps=3)
+    timestep.advance(1.0625)
+    assert len(steps) == 3
+    assert timestep.dropped_time == pytest.approx(0.625)
+    assert timestep.accumulator == pytest.approx(0.0625)
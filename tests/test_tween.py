@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from tween import OUT_QUAD, Tweens
+
+
+def test_a_tween_runs_from_start_to_end_and_frees_its_slot():
+    tweens = Tweens(capacity=4)
+    slot = tweens.start(10.0, 20.0, 1.0)
+    tweens.step(0.25)
+    assert tweens.value[slot] == pytest.approx(12.5)
+    tweens.step(1.0)
+    assert tweens.value[slot] == pytest.approx(20.0)
+    assert len(tweens) == 0 and list(tweens.running()) == []
+
+
+def test_easing_and_yoyo():
+    tweens = Tweens(capacity=4)
+    quad = tweens.start(0.0, 1.0, 1.0, easing=OUT_QUAD)
+    yoyo = tweens.start(0.0, 1.0, 1.0, yoyo=True)
+    tweens.step(0.5)
+    assert tweens.value[quad] == pytest.approx(0.75)
+    assert tweens.value[yoyo] == pytest.approx(1.0)
+    tweens.step(0.5)
+    assert tweens.value[yoyo] == pytest.approx(0.0)
+
+
+def test_step_writes_in_place_and_leaves_idle_slots_alone():
+    tweens = Tweens(capacity=4, fields=('x',))
+    value = tweens.value
+    done = tweens.start(5.0, 6.0, 0.1, x=3.0)
+    running = tweens.start(0.0, 1.0, 1.0)
+    tweens.step(0.25)  # done finishes and keeps its end value
+    tweens.step(0.25)
+    assert tweens.value is value
+    assert value[done] == pytest.approx(6.0)
+    assert value[running] == pytest.approx(0.5)
+    assert tweens.x[done] == 3.0
+    assert np.all(value[2:] == 0.0)
+
+
+def test_a_full_pool_refuses_new_tweens():
+    tweens = Tweens(capacity=2)
+    assert tweens.start(0, 1, 1) == 0
+    assert tweens.start(0, 1, 1) == 1
+    assert tweens.start(0, 1, 1) is None
+    tweens.cancel(0)
+    assert tweens.start(0, 1, 1) == 0
+    tweens.clear()
+    assert len(tweens) == 0
@@ -0,0 +1,44 @@
+# Fixed-timestep game loop. The display callback hands the real frame time to
+# FixedTimestep.advance(), which runs the physics step as many times as that
+# time covers at a fixed rate and keeps the remainder for the next frame. The
+# returned fraction says how far the display is between the last two physics
+# states, so drawn positions can be interpolated with lerp().
+
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+
+class FixedTimestep:
+    """Runs step(interval) at a fixed rate from variable frame times."""
+
+    def __init__(self, step, rate, max_steps=8):
+        self.step = step
+        self.interval = 1.0 / rate
+        # After a long stall only this many steps are caught up; the rest of the time is dropped
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.steps = 0
+        self.dropped_time = 0.0
+
+    @property
+    def rate(self):
+        return 1.0 / self.interval
+
+    def advance(self, dt):
+        """Run the steps that dt covers and return the interpolation fraction (0 to 1)."""
+        self.accumulator += dt
+        steps = 0
+        while self.accumulator >= self.interval:
+            if steps == self.max_steps:
+                self.dropped_time += self.accumulator - self.accumulator % self.interval
+                self.accumulator %= self.interval
+                break
+            self.step(self.interval)
+            self.accumulator -= self.interval
+            steps += 1
+        self.steps += steps
+        return self.accumulator / self.interval
+
+    def reset(self):
+        self.accumulator = 0.0
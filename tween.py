@@ -0,0 +1,82 @@
+import numpy as np
+
+# Pooled tweens stepped from a game's own tick. Every tween is a slot in
+# arrays allocated up front: start() takes a free slot, step(dt) advances all
+# running tweens in one vectorised pass and hands finished slots back. No
+# Animation objects, no Clock callbacks and nothing to unbind afterwards --
+# when the game stops ticking, its tweens stop with it.
+
+LINEAR = 0
+OUT_QUAD = 1
+
+
+class Tweens:
+    """A fixed pool of tweens from a start value to an end value.
+
+    value holds every slot's current value. Extra per-slot fields (a position
+    to draw at, a colour) can be named in fields; they become arrays on the
+    pool and are filled by start()'s keyword arguments.
+    """
+
+    def __init__(self, capacity=1024, fields=()):
+        self.capacity = capacity
+        self.start_value = np.zeros(capacity)
+        self.end_value = np.zeros(capacity)
+        self.elapsed = np.zeros(capacity)
+        self.duration = np.ones(capacity)
+        self.easing = np.zeros(capacity, dtype=np.int8)
+        self.yoyo = np.zeros(capacity, dtype=bool)  # Go to end_value and back in one duration
+        self.active = np.zeros(capacity, dtype=bool)
+        self.value = np.zeros(capacity)
+        self.fields = fields
+        for name in fields:
+            setattr(self, name, np.zeros(capacity))
+        self.free = list(range(capacity - 1, -1, -1))  # Free slots, lowest on top
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def start(self, start, end, duration, easing=LINEAR, yoyo=False, **fields):
+        """Start a tween and return its slot, or None when the pool is full."""
+        if not self.free:
+            return None
+        slot = self.free.pop()
+        self.start_value[slot] = self.value[slot] = start
+        self.end_value[slot] = end
+        self.elapsed[slot] = 0.0
+        self.duration[slot] = duration
+        self.easing[slot] = easing
+        self.yoyo[slot] = yoyo
+        self.active[slot] = True
+        for name, value in fields.items():
+            getattr(self, name)[slot] = value
+        return slot
+
+    def step(self, dt):
+        """Advance every running tween by dt; finished tweens free their slots."""
+        if len(self.free) == self.capacity:
+            return
+        active = self.active
+        np.add(self.elapsed, dt, out=self.elapsed, where=active)
+        t = np.minimum(self.elapsed / self.duration, 1.0)
+        t = np.where(self.yoyo, 1 - np.abs(1 - 2 * t), t)
+        t = np.where(self.easing == OUT_QUAD, t * (2 - t), t)
+        # In place, so value stays the same array for anyone holding it
+        np.copyto(self.value, self.start_value + (self.end_value - self.start_value) * t, where=active)
+        done = active & (self.elapsed >= self.duration)
+        if done.any():
+            active[done] = False
+            self.free.extend(np.flatnonzero(done)[::-1].tolist())
+
+    def cancel(self, slot):
+        if self.active[slot]:
+            self.active[slot] = False
+            self.free.append(slot)
+
+    def clear(self):
+        self.active[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def running(self):
+        """Indices of the slots with a running tween."""
+        return np.flatnonzero(self.active)